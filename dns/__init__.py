@@ -36,6 +36,7 @@ __all__ = [
     "message",
     "name",
     "namedict",
+    "nametrie",
     "node",
     "opcode",
     "query",
@@ -47,6 +48,7 @@ __all__ = [
     "rdatatype",
     "renderer",
     "resolver",
+    "responsecache",
     "reversename",
     "rrset",
     "serial",
@@ -63,6 +63,12 @@ class StreamSocket(Socket):  # pragma: no cover
     async def recv(self, size, timeout):
         raise NotImplementedError
 
+    def is_idle(self):
+        """Is the connection still open, with nothing unexpected to read?
+        Connection pools check this before reusing an idle connection.
+        """
+        return True
+
 
 class NullTransport:
     async def connect_tcp(self, host, port, timeout, local_address):
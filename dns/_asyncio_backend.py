@@ -113,6 +113,13 @@ class StreamSocket(dns._asyncbackend.StreamSocket):
     async def close(self):
         self.writer.close()
 
+    def is_idle(self):
+        return not (
+            self.writer.is_closing()
+            or self.reader.at_eof()
+            or self.reader.exception() is not None
+        )
+
     async def getpeername(self):
         return self.writer.get_extra_info("peername")
 
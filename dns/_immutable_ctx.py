@@ -6,9 +6,12 @@
 
 import contextvars
 import inspect
+from typing import Any, Callable, TypeVar
 
 _in__init__ = contextvars.ContextVar("_immutable_in__init__", default=False)
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
 
 class _Immutable:
     """Immutable mixin class"""
@@ -34,6 +37,11 @@ class _Immutable:
 
 def _immutable_init(f):
     def nf(*args, **kwargs):
+        if _in__init__.get() is args[0]:
+            # We're being called by an __init__ of a subclass, which has
+            # already allowed assignment.
+            f(*args, **kwargs)
+            return
         previous = _in__init__.set(args[0])
         try:
             # call the actual __init__
@@ -42,14 +50,37 @@ def _immutable_init(f):
             _in__init__.reset(previous)
 
     nf.__signature__ = inspect.signature(f)
+    nf._immutable_guarded = True  # type: ignore
     return nf
 
 
+def unguarded_init(f: _F) -> _F:
+    """Mark *f*, the ``__init__`` method of an immutable class, as not needing
+    the guard which allows attribute assignment while it runs.
+
+    The guard costs a context variable update for each ``__init__`` call and a
+    check for each attribute assignment, which matters for classes made in
+    great numbers, like rdata.  An unguarded ``__init__`` must instead set
+    attributes with ``object.__setattr__()``.  Instances are as immutable as
+    those of any other immutable class once constructed.
+    """
+    f._immutable_unguarded = True  # type: ignore
+    return f
+
+
+def _needs_guard(f):
+    return not (
+        getattr(f, "_immutable_guarded", False)
+        or getattr(f, "_immutable_unguarded", False)
+    )
+
+
 def immutable(cls):
     if _Immutable in cls.__mro__:
         # Some ancestor already has the mixin, so just make sure we keep
         # following the __init__ protocol.
-        cls.__init__ = _immutable_init(cls.__init__)
+        if _needs_guard(cls.__init__):
+            cls.__init__ = _immutable_init(cls.__init__)
         if hasattr(cls, "__setstate__"):
             cls.__setstate__ = _immutable_init(cls.__setstate__)
         ncls = cls
@@ -59,9 +90,11 @@ def immutable(cls):
             # We have to do the __slots__ declaration here too!
             __slots__ = ()
 
-            @_immutable_init
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
+            if _needs_guard(cls.__init__):
+
+                @_immutable_init
+                def __init__(self, *args, **kwargs):
+                    super().__init__(*args, **kwargs)
 
             if hasattr(cls, "__setstate__"):
 
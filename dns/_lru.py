@@ -0,0 +1,86 @@
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+#
+# The bounded least-recently-used store shared by dnspython's caches and pools
+
+import collections
+import threading
+from typing import Generic, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUStore(Generic[K, V]):
+    """Thread-safe, bounded, least-recently-used store with hit and miss
+    statistics.
+
+    Subclasses provide the lookup methods appropriate to what they keep, and
+    implement them with ``_lookup()`` and ``_store()`` while holding
+    ``self.lock``.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.lock = threading.Lock()
+        self.data: "collections.OrderedDict[K, V]" = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.set_max_size(max_size)
+
+    def set_max_size(self, max_size: int) -> None:
+        """Set the maximum number of entries to keep, removing the
+        least-recently used ones if there are more.  A *max_size* less than 1
+        is treated as 1.
+        """
+        if max_size < 1:
+            max_size = 1
+        with self.lock:
+            self.max_size = max_size
+            while len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+
+    def _lookup(self, key: K, count: bool = True) -> Optional[V]:
+        # Return the value for key, marking it most-recently used, or None.
+        # The caller must hold the lock.  If count is True, the hit or miss
+        # is counted.
+        value = self.data.get(key)
+        if value is None:
+            if count:
+                self._misses += 1
+        else:
+            self.data.move_to_end(key)
+            if count:
+                self._hits += 1
+        return value
+
+    def _store(self, key: K, value: V) -> None:
+        # Set the value for key, removing the least-recently used entry if
+        # there is no space for it.  The caller must hold the lock.
+        if key not in self.data and len(self.data) >= self.max_size:
+            self.data.popitem(last=False)
+        self.data[key] = value
+        self.data.move_to_end(key)
+
+    def hits(self) -> int:
+        """How many hits has the cache had?"""
+        with self.lock:
+            return self._hits
+
+    def misses(self) -> int:
+        """How many misses has the cache had?"""
+        with self.lock:
+            return self._misses
+
+    def reset_statistics(self) -> None:
+        """Reset all statistics to zero."""
+        with self.lock:
+            self._hits = 0
+            self._misses = 0
+
+    def flush(self) -> None:
+        """Remove all entries."""
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.data)
@@ -2,6 +2,7 @@
 
 """trio async I/O library query support"""
 
+import selectors
 import socket
 
 import trio
@@ -78,6 +79,20 @@ class StreamSocket(dns._asyncbackend.StreamSocket):
     async def close(self):
         await self.stream.aclose()
 
+    def is_idle(self):
+        if self.tls:
+            sock = self.stream.transport_stream.socket
+        else:
+            sock = self.stream.socket
+        # An idle connection with something to read has been closed by the
+        # server, or has unexpected data.
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(sock.fileno(), selectors.EVENT_READ)
+                return not selector.select(0)
+        except (OSError, ValueError):
+            return False
+
     async def getpeername(self):
         if self.tls:
             return self.stream.transport_stream.socket.getpeername()
@@ -24,13 +24,14 @@ import socket
 import struct
 import time
 import urllib.parse
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import dns.asyncbackend
 import dns.exception
 import dns.inet
 import dns.message
 import dns.name
+import dns.query
 import dns.quic
 import dns.rcode
 import dns.rdataclass
@@ -42,11 +43,14 @@ from dns.query import (
     NoDOH,
     NoDOQ,
     HTTPVersion,
+    TLSSessionCache,
     UDPMode,
     _check_status,
+    _BaseConnectionPool,
     _compute_times,
-    _make_dot_ssl_context,
     _matches_destination,
+    _pipeline_ids,
+    _pipeline_response,
     _remaining,
     have_doh,
     ssl,
@@ -378,6 +382,113 @@ async def receive_tcp(
     return (r, received_time)
 
 
+class ConnectionPool(_BaseConnectionPool):
+    """A pool of open TCP and TLS connections which
+    ``dns.asyncquery.tcp()`` and ``dns.asyncquery.tls()`` can reuse for later
+    queries to the same server.
+
+    A pool should only be used with one backend and event loop.  An idle
+    connection which the server has closed is discarded rather than reused,
+    and if a connection from the pool fails when a query is sent on it, the
+    query is retried once on a new connection.
+
+    See :py:class:`dns.query.ConnectionPool` for the documentation of the
+    parameters.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def close(self) -> None:
+        """Close the pool's idle connections.  Connections in use are closed
+        when their queries finish.
+        """
+        for sock in self._take_all():
+            await _close_quietly(sock)
+
+    async def _take_or_wait(
+        self,
+        key: Tuple,
+        expiration: Optional[float],
+        backend: dns.asyncbackend.Backend,
+    ) -> Optional[dns.asyncbackend.StreamSocket]:
+        while True:
+            (s, stale, taken) = self._take(key)
+            for sock in stale:
+                await _close_quietly(sock)
+            if taken:
+                return s
+            # The pool's lock can't be waited on here, so poll.
+            timeout = _remaining(expiration)
+            await backend.sleep(0.05 if timeout is None else min(timeout, 0.05))
+
+    async def _discard(self, key: Tuple, s: dns.asyncbackend.StreamSocket) -> None:
+        self._release(key)
+        await _close_quietly(s)
+
+    async def _query(
+        self,
+        key: Tuple,
+        connect: Callable[[], Awaitable[dns.asyncbackend.StreamSocket]],
+        q: dns.message.Message,
+        wire: bytes,
+        expiration: Optional[float],
+        one_rr_per_rrset: bool,
+        ignore_trailing: bool,
+        backend: dns.asyncbackend.Backend,
+    ) -> Tuple[dns.message.Message, float]:
+        while True:
+            s = await self._take_or_wait(key, expiration, backend)
+            if s is not None and not s.is_idle():
+                await self._discard(key, s)
+                continue
+            reused = s is not None
+            if s is None:
+                try:
+                    s = await connect()
+                except BaseException:
+                    self._release(key)
+                    raise
+            try:
+                await send_tcp(s, wire, expiration)
+                (r, received_time) = await receive_tcp(
+                    s, expiration, one_rr_per_rrset, q.keyring, q.mac, ignore_trailing
+                )
+            except dns.exception.DNSException:
+                # A timeout, or a bad response, which leaves the connection
+                # in an unknown state.
+                await self._discard(key, s)
+                raise
+            except Exception:
+                await self._discard(key, s)
+                if reused:
+                    # The server probably closed the connection after we
+                    # checked it, so try again on a new one.
+                    continue
+                raise
+            except BaseException:
+                await self._discard(key, s)
+                raise
+            if not q.is_response(r):
+                await self._discard(key, s)
+                raise BadResponse
+            for sock in self._give(key, s):
+                await _close_quietly(sock)
+            return (r, received_time)
+
+
+async def _close_quietly(sock: dns.asyncbackend.StreamSocket) -> None:
+    # Close a pooled connection, which may already be broken.
+    try:
+        await sock.close()
+    except Exception:
+        pass
+
+
 async def tcp(
     q: dns.message.Message,
     where: str,
@@ -389,23 +500,54 @@ async def tcp(
     ignore_trailing: bool = False,
     sock: Optional[dns.asyncbackend.StreamSocket] = None,
     backend: Optional[dns.asyncbackend.Backend] = None,
+    pool: Optional[ConnectionPool] = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TCP.
 
     *sock*, a ``dns.asyncbacket.StreamSocket``, or ``None``, the
     socket to use for the query.  If ``None``, the default, a socket
     is created.  Note that if a socket is provided
-    *where*, *port*, *source*, *source_port*, and *backend* are ignored.
+    *where*, *port*, *source*, *source_port*, *backend*, and *pool* are
+    ignored.
 
     *backend*, a ``dns.asyncbackend.Backend``, or ``None``.  If ``None``,
     the default, then dnspython will use the default backend.
 
+    *pool*, a ``dns.asyncquery.ConnectionPool`` or ``None``.  If not ``None``,
+    an open connection from the pool is used if there is one, and the
+    connection is returned to the pool afterwards.
+
     See :py:func:`dns.query.tcp()` for the documentation of the other
     parameters, exceptions, and return type of this method.
     """
 
     wire = q.to_wire()
     (begin_time, expiration) = _compute_times(timeout)
+    if pool is not None and not sock:
+        af = dns.inet.af_for_address(where)
+        stuple = _source_tuple(af, source, source_port)
+        dtuple = (where, port)
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+
+        async def connect():
+            assert backend is not None
+            return await backend.make_socket(
+                af, socket.SOCK_STREAM, 0, stuple, dtuple, _timeout(expiration)
+            )
+
+        (r, received_time) = await pool._query(
+            ("tcp", dtuple, stuple),
+            connect,
+            q,
+            wire,
+            expiration,
+            one_rr_per_rrset,
+            ignore_trailing,
+            backend,
+        )
+        r.time = received_time - begin_time
+        return r
     if sock:
         # Verify that the socket is connected, as if it's not connected,
         # it's not writable, and the polling in send_tcp() will time out or
@@ -434,6 +576,78 @@ async def tcp(
         return r
 
 
+async def pipelined_tcp(
+    queries: List[dns.message.Message],
+    where: str,
+    timeout: Optional[float] = None,
+    port: int = 53,
+    source: Optional[str] = None,
+    source_port: int = 0,
+    one_rr_per_rrset: bool = False,
+    ignore_trailing: bool = False,
+    sock: Optional[dns.asyncbackend.StreamSocket] = None,
+    window: int = 32,
+    backend: Optional[dns.asyncbackend.Backend] = None,
+) -> List[dns.message.Message]:
+    """Return the responses obtained after sending queries via one TCP
+    connection, without waiting for each response before sending the next
+    query.
+
+    *sock*, a ``dns.asyncbacket.StreamSocket``, or ``None``, the
+    socket to use for the queries.  If ``None``, the default, a socket
+    is created.  Note that if a socket is provided
+    *where*, *port*, *source*, *source_port*, and *backend* are ignored.
+
+    *backend*, a ``dns.asyncbackend.Backend``, or ``None``.  If ``None``,
+    the default, then dnspython will use the default backend.
+
+    See :py:func:`dns.query.pipelined_tcp()` for the documentation of the
+    other parameters, exceptions, and return type of this method.
+    """
+
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    queries = list(queries)
+    ids = _pipeline_ids(queries)
+    wires = [q.to_wire(prepend_length=True) for q in queries]
+    responses: List[Any] = [None] * len(queries)
+    (begin_time, expiration) = _compute_times(timeout)
+    if sock:
+        await sock.getpeername()
+        cm: contextlib.AbstractAsyncContextManager = NullContext(sock)
+    else:
+        af = dns.inet.af_for_address(where)
+        stuple = _source_tuple(af, source, source_port)
+        dtuple = (where, port)
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+        cm = await backend.make_socket(
+            af, socket.SOCK_STREAM, 0, stuple, dtuple, timeout
+        )
+    async with cm as s:
+        sent = min(window, len(wires))
+        await s.sendall(b"".join(wires[:sent]), _timeout(expiration))
+        for _ in range(len(wires)):
+            ldata = await _read_exactly(s, 2, expiration)
+            (l,) = struct.unpack("!H", ldata)
+            wire = await _read_exactly(s, l, expiration)
+            received_time = time.time()
+            (i, r) = _pipeline_response(
+                queries,
+                ids,
+                wire,
+                received_time,
+                begin_time,
+                one_rr_per_rrset,
+                ignore_trailing,
+            )
+            responses[i] = r
+            if sent < len(wires):
+                await s.sendall(wires[sent], _timeout(expiration))
+                sent += 1
+    return responses
+
+
 async def tls(
     q: dns.message.Message,
     where: str,
@@ -448,6 +662,8 @@ async def tls(
     ssl_context: Optional[ssl.SSLContext] = None,
     server_hostname: Optional[str] = None,
     verify: Union[bool, str] = True,
+    pool: Optional[ConnectionPool] = None,
+    session_cache: Optional[TLSSessionCache] = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TLS.
 
@@ -461,15 +677,74 @@ async def tls(
     *backend*, a ``dns.asyncbackend.Backend``, or ``None``.  If ``None``,
     the default, then dnspython will use the default backend.
 
+    *pool*, a ``dns.asyncquery.ConnectionPool`` or ``None``.  If not ``None``,
+    and *sock* is ``None``, an open connection from the pool is used if there
+    is one, and the connection is returned to the pool afterwards.
+
+    *session_cache*, a ``dns.query.TLSSessionCache`` or ``None``, the cache
+    whose SSL context for the server is used, or made and cached.  If
+    ``None``, the pool's session cache is used if *pool* is not ``None``, and
+    otherwise ``dns.query.default_tls_session_cache``.  The asynchronous
+    backends cannot resume TLS sessions, so only the context is reused, and
+    each new connection is counted as a miss.
+
     See :py:func:`dns.query.tls()` for the documentation of the other
     parameters, exceptions, and return type of this method.
     """
     (begin_time, expiration) = _compute_times(timeout)
+    if session_cache is None:
+        if pool is not None:
+            session_cache = pool.session_cache
+        else:
+            session_cache = dns.query.default_tls_session_cache
+    cache = session_cache
+    # Connections made with a caller's context may differ from those made
+    # with a default one, so the context is part of the keys.
+    context_key = ssl_context if ssl_context is not None else verify
+    if not sock:
+        (ssl_context, _) = cache._get(
+            ((where, port), server_hostname, context_key),
+            ssl_context,
+            server_hostname,
+            verify,
+        )
+    if pool is not None and not sock:
+        af = dns.inet.af_for_address(where)
+        stuple = _source_tuple(af, source, source_port)
+        dtuple = (where, port)
+        if not backend:
+            backend = dns.asyncbackend.get_default_backend()
+
+        async def connect():
+            assert backend is not None
+            s = await backend.make_socket(
+                af,
+                socket.SOCK_STREAM,
+                0,
+                stuple,
+                dtuple,
+                _timeout(expiration),
+                ssl_context,
+                server_hostname,
+            )
+            cache._count_handshake(False)
+            return s
+
+        (r, received_time) = await pool._query(
+            ("tls", dtuple, stuple, server_hostname, context_key),
+            connect,
+            q,
+            q.to_wire(),
+            expiration,
+            one_rr_per_rrset,
+            ignore_trailing,
+            backend,
+        )
+        r.time = received_time - begin_time
+        return r
     if sock:
         cm: contextlib.AbstractAsyncContextManager = NullContext(sock)
     else:
-        if ssl_context is None:
-            ssl_context = _make_dot_ssl_context(server_hostname, verify)
         af = dns.inet.af_for_address(where)
         stuple = _source_tuple(af, source, source_port)
         dtuple = (where, port)
@@ -485,6 +760,7 @@ async def tls(
             ssl_context,
             server_hostname,
         )
+        cache._count_handshake(False)
     async with cm as s:
         timeout = _timeout(expiration)
         response = await tcp(
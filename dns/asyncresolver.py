@@ -42,6 +42,14 @@ _tcp = dns.asyncquery.tcp
 class Resolver(dns.resolver.BaseResolver):
     """Asynchronous DNS stub resolver."""
 
+    connection_pool: Optional[dns.asyncquery.ConnectionPool]
+
+    def reset(self) -> None:
+        """Reset all resolver configuration to the defaults."""
+
+        super().reset()
+        self.connection_pool = None
+
     async def resolve(
         self,
         qname: Union[dns.name.Name, str],
@@ -87,6 +95,12 @@ class Resolver(dns.resolver.BaseResolver):
                 if backoff:
                     await backend.sleep(backoff)
                 timeout = self._compute_timeout(start, lifetime, resolution.errors)
+                kwargs: Dict[str, Any] = {}
+                if (
+                    self.connection_pool is not None
+                    and nameserver.uses_connection_pool()
+                ):
+                    kwargs["connection_pool"] = self.connection_pool
                 try:
                     response = await nameserver.async_query(
                         request,
@@ -95,6 +109,7 @@ class Resolver(dns.resolver.BaseResolver):
                         source_port=source_port,
                         max_size=tcp,
                         backend=backend,
+                        **kwargs,
                     )
                 except Exception as ex:
                     (_, done) = resolution.query_result(None, ex)
@@ -231,6 +231,7 @@ def make_ds(
         check = policy.ok_to_create_ds
     if not check(algorithm):
         raise DeniedByPolicy
+    key = dns.rdata.decode(key)
     if not isinstance(key, (DNSKEY, CDNSKEY)):
         raise ValueError("key is not a DNSKEY/CDNSKEY")
     if algorithm == DSDigest.SHA1:
@@ -463,6 +464,7 @@ def _validate(
         raise ValidationFailure("owner names do not match")
 
     for rrsig in rrsigrdataset:
+        rrsig = dns.rdata.decode(rrsig)
         if not isinstance(rrsig, RRSIG):
             raise ValidationFailure("expected an RRSIG")
         try:
@@ -1144,7 +1146,7 @@ def _sign_zone_nsec(
     delegation = None
     last_secure = None
 
-    for name in sorted(txn.iterate_names()):
+    for name in sorted(txn.iterate_names(), key=dns.name.Name.canonical_key):
         if delegation and name.is_subdomain(delegation):
             # names below delegations are not secure
             continue
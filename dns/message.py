@@ -17,10 +17,25 @@
 
 """DNS Messages"""
 
+import collections
+import concurrent.futures
 import contextlib
 import io
+import os
+import struct
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import dns.edns
 import dns.entropy
@@ -148,7 +163,10 @@ class Message:
         else:
             self.id = id
         self.flags = 0
-        self.sections: List[List[dns.rrset.RRset]] = [[], [], [], []]
+        self._sections: List[List[dns.rrset.RRset]] = [[], [], [], []]
+        # The wire reader for sections whose decoding has been deferred
+        # (see from_wire()'s *lazy* parameter), if any.
+        self._deferred: Optional["_WireReader"] = None
         self.opt: Optional[dns.rrset.RRset] = None
         self.request_payload = 0
         self.pad = 0
@@ -163,41 +181,64 @@ class Message:
         self.time = 0.0
         self.wire: Optional[bytes] = None
 
+    @property
+    def sections(self) -> List[List[dns.rrset.RRset]]:
+        """The list of all sections."""
+        if self._deferred is not None:
+            self._deferred.read_deferred()
+        return self._sections
+
+    @sections.setter
+    def sections(self, v):
+        self._deferred = None
+        self._sections = v
+
+    def _get_section(self, number: int) -> List[dns.rrset.RRset]:
+        # Return section *number*, decoding it first if it was deferred.
+        if self._deferred is not None:
+            self._deferred.read_deferred(number)
+        return self._sections[number]
+
+    def _set_section(self, number: int, v: List[dns.rrset.RRset]) -> None:
+        if self._deferred is not None:
+            self._deferred.discard_deferred(number)
+        self._sections[number] = v
+
     @property
     def question(self) -> List[dns.rrset.RRset]:
         """The question section."""
-        return self.sections[0]
+        return self._get_section(0)
 
     @question.setter
     def question(self, v):
-        self.sections[0] = v
+        self._set_section(0, v)
 
     @property
     def answer(self) -> List[dns.rrset.RRset]:
         """The answer section."""
-        return self.sections[1]
+        return self._get_section(1)
 
     @answer.setter
     def answer(self, v):
-        self.sections[1] = v
+        self._set_section(1, v)
 
     @property
     def authority(self) -> List[dns.rrset.RRset]:
         """The authority section."""
-        return self.sections[2]
+        return self._get_section(2)
 
     @authority.setter
     def authority(self, v):
-        self.sections[2] = v
+        self._set_section(2, v)
 
     @property
     def additional(self) -> List[dns.rrset.RRset]:
         """The additional data section."""
-        return self.sections[3]
+        return self._get_section(3)
 
     @additional.setter
     def additional(self, v):
-        self.sections[3] = v
+        self._set_section(3, v)
 
     def __repr__(self):
         return "<DNS message, ID " + repr(self.id) + ">"
@@ -318,7 +359,9 @@ class Message:
         Returns an ``int``.
         """
 
-        for i, our_section in enumerate(self.sections):
+        # We don't use self.sections, as identifying a section does not
+        # require decoding any deferred sections.
+        for i, our_section in enumerate(self._sections):
             if section is our_section:
                 return self._section_enum(i)
         raise ValueError("unknown section")
@@ -336,7 +379,7 @@ class Message:
         """
 
         section = self._section_enum.make(number)
-        return self.sections[section]
+        return self._get_section(section)
 
     def find_rrset(
         self,
@@ -550,48 +593,22 @@ class Message:
         self.tsig.to_wire(f)
         return len(f.getvalue())
 
-    def to_wire(
+    def _render(
         self,
-        origin: Optional[dns.name.Name] = None,
-        max_size: int = 0,
-        multi: bool = False,
-        tsig_ctx: Optional[Any] = None,
-        prepend_length: bool = False,
-        prefer_truncation: bool = False,
+        origin: Optional[dns.name.Name],
+        max_size: int,
+        multi: bool,
+        tsig_ctx: Optional[Any],
+        prefer_truncation: bool,
+        limit: int,
+        sign: bool = True,
+        pack_additional: bool = False,
         **kw: Dict[str, Any],
-    ) -> bytes:
-        """Return a string containing the message in DNS compressed wire
-        format.
-
-        Additional keyword arguments are passed to the RRset ``to_wire()``
-        method.
-
-        *origin*, a ``dns.name.Name`` or ``None``, the origin to be appended
-        to any relative names.  If ``None``, and the message has an origin
-        attribute that is not ``None``, then it will be used.
-
-        *max_size*, an ``int``, the maximum size of the wire format
-        output; default is 0, which means "the message's request
-        payload, if nonzero, or 65535".
-
-        *multi*, a ``bool``, should be set to ``True`` if this message is
-        part of a multiple message sequence.
-
-        *tsig_ctx*, a ``dns.tsig.HMACTSig`` or ``dns.tsig.GSSTSig`` object, the
-        ongoing TSIG context, used when signing zone transfers.
-
-        *prepend_length*, a ``bool``, should be set to ``True`` if the caller
-        wants the message length prepended to the message itself.  This is
-        useful for messages sent over TCP, TLS (DoT), or QUIC (DoQ).
-
-        *prefer_truncation*, a ``bool``, should be set to ``True`` if the caller
-        wants the message to be truncated if it would otherwise exceed the
-        maximum length.  If the truncation occurs before the additional section,
-        the TC bit will be set.
-
-        Raises ``dns.exception.TooBig`` if *max_size* was exceeded.
-
-        Returns a ``bytes``.
+    ) -> dns.renderer.Renderer:
+        """Render the message, returning the renderer.  The arguments are
+        those of ``to_wire()``, *limit* further limits the maximum size, and
+        if *sign* is ``False``, space is left for the TSIG but it is not
+        added.
         """
 
         if origin is None and self.origin is not None:
@@ -605,6 +622,7 @@ class Message:
             max_size = 512
         elif max_size > 65535:
             max_size = 65535
+        max_size = min(max_size, limit)
         r = dns.renderer.Renderer(self.id, self.flags, max_size, origin)
         opt_reserve = self._compute_opt_reserve()
         r.reserve(opt_reserve)
@@ -617,10 +635,13 @@ class Message:
                 r.add_rrset(dns.renderer.ANSWER, rrset, **kw)
             for rrset in self.authority:
                 r.add_rrset(dns.renderer.AUTHORITY, rrset, **kw)
-            for rrset in self.additional:
-                r.add_rrset(dns.renderer.ADDITIONAL, rrset, **kw)
+            if pack_additional:
+                self._pack_additional(r, **kw)
+            else:
+                for rrset in self.additional:
+                    r.add_rrset(dns.renderer.ADDITIONAL, rrset, **kw)
         except dns.exception.TooBig:
-            if prefer_truncation:
+            if prefer_truncation or pack_additional:
                 if r.section < dns.renderer.ADDITIONAL:
                     r.flags |= dns.flags.TC
             else:
@@ -629,7 +650,7 @@ class Message:
         if self.opt is not None:
             r.add_opt(self.opt, self.pad, opt_reserve, tsig_reserve)
         r.write_header()
-        if self.tsig is not None:
+        if self.tsig is not None and sign:
             (new_tsig, ctx) = dns.tsig.sign(
                 r.get_wire(),
                 self.keyring,
@@ -645,12 +666,180 @@ class Message:
             r.write_header()
             if multi:
                 self.tsig_ctx = ctx
+        return r
+
+    def _glue_targets(self) -> Dict[dns.name.Name, bool]:
+        """Return the nameserver names of the NS RRsets in the answer and
+        authority sections, mapped to whether their addresses are required
+        glue, i.e. the name is at or below a delegation in the authority
+        section (RFC 9471).
+        """
+        targets: Dict[dns.name.Name, bool] = {}
+        for section in (self.answer, self.authority):
+            for rrset in section:
+                if rrset.rdtype != dns.rdatatype.NS:
+                    continue
+                for rd in rrset:
+                    required = section is self.authority and rd.target.is_subdomain(
+                        rrset.name
+                    )
+                    targets[rd.target] = targets.get(rd.target, False) or required
+        return targets
+
+    def _pack_additional(self, r: dns.renderer.Renderer, **kw: Any) -> None:
+        """Render as many of the additional section's RRsets as fit, with
+        the addresses of nameservers first.  The TC flag is set if required
+        glue does not fit.
+        """
+        targets = self._glue_targets()
+        glue = []
+        others = []
+        for rrset in self.additional:
+            if (
+                rrset.rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA)
+                and rrset.name in targets
+            ):
+                glue.append((rrset, targets[rrset.name]))
+            else:
+                others.append((rrset, False))
+        for rrset, required in glue + others:
+            # Every RR takes at least 11 bytes (a root owner name and the
+            # fixed fields), so RRsets which cannot possibly fit are skipped
+            # without rendering them.
+            if r.max_size - r.output.tell() >= 11 * len(rrset):
+                try:
+                    r.add_rrset(dns.renderer.ADDITIONAL, rrset, **kw)
+                    continue
+                except dns.exception.TooBig:
+                    pass
+            if required:
+                r.flags |= dns.flags.TC
+
+    def to_wire(
+        self,
+        origin: Optional[dns.name.Name] = None,
+        max_size: int = 0,
+        multi: bool = False,
+        tsig_ctx: Optional[Any] = None,
+        prepend_length: bool = False,
+        prefer_truncation: bool = False,
+        pack_additional: bool = False,
+        **kw: Dict[str, Any],
+    ) -> bytes:
+        """Return a string containing the message in DNS compressed wire
+        format.
+
+        Additional keyword arguments are passed to the RRset ``to_wire()``
+        method.
+
+        *origin*, a ``dns.name.Name`` or ``None``, the origin to be appended
+        to any relative names.  If ``None``, and the message has an origin
+        attribute that is not ``None``, then it will be used.
+
+        *max_size*, an ``int``, the maximum size of the wire format
+        output; default is 0, which means "the message's request
+        payload, if nonzero, or 65535".
+
+        *multi*, a ``bool``, should be set to ``True`` if this message is
+        part of a multiple message sequence.
+
+        *tsig_ctx*, a ``dns.tsig.HMACTSig`` or ``dns.tsig.GSSTSig`` object, the
+        ongoing TSIG context, used when signing zone transfers.
+
+        *prepend_length*, a ``bool``, should be set to ``True`` if the caller
+        wants the message length prepended to the message itself.  This is
+        useful for messages sent over TCP, TLS (DoT), or QUIC (DoQ).
+
+        *prefer_truncation*, a ``bool``, should be set to ``True`` if the caller
+        wants the message to be truncated if it would otherwise exceed the
+        maximum length.  If the truncation occurs before the additional section,
+        the TC bit will be set.
+
+        *pack_additional*, a ``bool``, should be set to ``True`` if the caller
+        wants as much of the additional section as possible when the message
+        would otherwise exceed the maximum length.  The addresses of the
+        nameservers in NS RRsets in the answer and authority sections are
+        rendered first, and then any other RRsets which still fit, skipping
+        those which do not.  The TC bit is set if the answer or authority
+        section is truncated, or if glue for a delegation in the authority
+        section does not fit (RFC 9471).  This implies *prefer_truncation*.
+
+        Raises ``dns.exception.TooBig`` if *max_size* was exceeded.
+
+        Returns a ``bytes``.
+        """
+
+        r = self._render(
+            origin,
+            max_size,
+            multi,
+            tsig_ctx,
+            prefer_truncation,
+            65535,
+            True,
+            pack_additional,
+            **kw,
+        )
         wire = r.get_wire()
         self.wire = wire
         if prepend_length:
             wire = len(wire).to_bytes(2, "big") + wire
         return wire
 
+    def to_wire_into(
+        self,
+        buffer: Any,
+        origin: Optional[dns.name.Name] = None,
+        max_size: int = 0,
+        multi: bool = False,
+        tsig_ctx: Optional[Any] = None,
+        prepend_length: bool = False,
+        prefer_truncation: bool = False,
+        pack_additional: bool = False,
+        **kw: Dict[str, Any],
+    ) -> int:
+        """Render the message in DNS compressed wire format into *buffer*.
+
+        This is like ``to_wire()``, but rather than returning a new ``bytes``,
+        it writes into a caller-supplied buffer which may be reused for many
+        messages, e.g. a server may render each response into the same
+        ``bytearray`` and send it with
+        ``sock.sendto(memoryview(buffer)[:length], peer)``.  Unlike
+        ``to_wire()``, it does not record the wire format in the message's
+        ``wire`` attribute, which is left unchanged.
+
+        *buffer*, a writable buffer such as a ``bytearray`` or
+        ``memoryview``, where the wire format is written, starting at its
+        beginning.
+
+        The other arguments are as for ``to_wire()``.  If *prepend_length* is
+        ``True``, the returned length includes the two byte length prefix.
+
+        Raises ``dns.exception.TooBig`` if *max_size* was exceeded, or if the
+        message does not fit in *buffer*.
+
+        Returns an ``int``, the number of bytes written to *buffer*.
+        """
+
+        view = memoryview(buffer).cast("B")
+        offset = 2 if prepend_length else 0
+        r = self._render(
+            origin,
+            max_size,
+            multi,
+            tsig_ctx,
+            prefer_truncation,
+            max(len(view) - offset, 0),
+            True,
+            pack_additional,
+            **kw,
+        )
+        length = r.get_wire_into(view, offset)
+        if prepend_length:
+            view[0:2] = length.to_bytes(2, "big")
+            length += 2
+        return length
+
     @staticmethod
     def _make_tsig(
         keyname, algorithm, time_signed, fudge, mac, original_id, error, other
@@ -1110,6 +1299,11 @@ class _WireReader:
     continue_on_error: try to extract as much information as possible from
     the message, accumulating MessageErrors in the *errors* attribute instead of
     raising them.
+    name_pool: the dns.name.NamePool to intern names in, if any.
+    lazy: Defer decoding the answer, authority, and additional sections?
+    lazy_rdata: Read rdata as dns.rdata.LazyRdata where possible?
+    deferred: A dict mapping the number of each section whose decoding has been
+    deferred to the offset of its first record and its record count.
     """
 
     def __init__(
@@ -1122,8 +1316,12 @@ class _WireReader:
         keyring=None,
         multi=False,
         continue_on_error=False,
+        name_pool=None,
+        lazy=False,
+        lazy_rdata=False,
     ):
-        self.parser = dns.wire.Parser(wire)
+        self.parser = dns.wire.Parser(wire, name_pool=name_pool)
+        self.wire = None
         self.message = None
         self.initialize_message = initialize_message
         self.question_only = question_only
@@ -1133,13 +1331,16 @@ class _WireReader:
         self.multi = multi
         self.continue_on_error = continue_on_error
         self.errors = []
+        self.lazy = lazy
+        self.lazy_rdata = lazy_rdata
+        self.deferred = {}
 
     def _get_question(self, section_number, qcount):
         """Read the next *qcount* records from the wire data and add them to
         the question section.
         """
         assert self.message is not None
-        section = self.message.sections[section_number]
+        section = self.message._sections[section_number]
         for _ in range(qcount):
             qname = self.parser.get_name(self.message.origin)
             (rdtype, rdclass) = self.parser.get_struct("!HH")
@@ -1153,25 +1354,106 @@ class _WireReader:
     def _add_error(self, e):
         self.errors.append(MessageError(e, self.parser.current))
 
-    def _get_section(self, section_number, count):
+    def _scan_section(self, section_number, count):
+        """Skip the next I{count} records in the wire data, remembering where
+        they are so that the section can be decoded when it is first used.
+
+        OPT and TSIG records are read immediately, as they affect the whole
+        message.
+
+        section_number: the section of the message to which to add records
+        count: the number of records to read
+        """
+        start = self.parser.current
+        scanned = 0
+        try:
+            for i in range(count):
+                rr_start = self.parser.current
+                self.parser.skip_name()
+                (rdtype, _, _, rdlen) = self.parser.get_struct("!HHIH")
+                if rdtype in (dns.rdatatype.OPT, dns.rdatatype.TSIG):
+                    self.parser.rewind(rr_start)
+                    self._get_section(section_number, count, i)
+                else:
+                    self.parser.seek(self.parser.current + rdlen)
+                scanned += 1
+        finally:
+            if scanned > 0:
+                self.deferred[section_number] = (start, scanned)
+                self.message._deferred = self
+
+    def read_deferred(self, section_number=None):
+        """Decode the specified section if its decoding was deferred, or all
+        deferred sections if *section_number* is ``None``.
+        """
+        assert self.message is not None
+        if section_number is None:
+            section_numbers = sorted(self.deferred.keys())
+        else:
+            section_numbers = [section_number]
+        # A section may be used while we are still reading the wire, e.g. by
+        # a keyring callable, so put the parser back where we found it.
+        (current, furthest) = (self.parser.current, self.parser.furthest)
+        try:
+            for section_number in section_numbers:
+                deferred = self.deferred.pop(section_number, None)
+                if deferred is None:
+                    continue
+                (start, count) = deferred
+                self.parser.rewind(start)
+                try:
+                    self._get_section(section_number, count, deferred=True)
+                except Exception as e:
+                    if self.continue_on_error:
+                        self._add_error(e)
+                    else:
+                        raise
+        finally:
+            self.parser.seek(current)
+            self.parser.furthest = furthest
+            if not self.deferred:
+                self.message._deferred = None
+
+    def discard_deferred(self, section_number):
+        """Forget about the specified section if its decoding was deferred."""
+        assert self.message is not None
+        self.deferred.pop(section_number, None)
+        if not self.deferred:
+            self.message._deferred = None
+
+    def _get_section(self, section_number, count, only=None, deferred=False):
         """Read the next I{count} records from the wire data and add them to
         the specified section.
 
         section_number: the section of the message to which to add records
-        count: the number of records to read
+        count: the number of records in the section
+        only: if not ``None``, read just the record with this index, which is the
+        next record in the wire data
+        deferred: is this the deferred read of a section which has been scanned?
+        If so, the OPT and TSIG records in it have already been read and are
+        skipped.
         """
         assert self.message is not None
-        section = self.message.sections[section_number]
+        section = self.message._sections[section_number]
         force_unique = self.one_rr_per_rrset
-        for i in range(count):
+        if only is None:
+            indices = range(count)
+        else:
+            indices = range(only, only + 1)
+        for i in indices:
             rr_start = self.parser.current
             absolute_name = self.parser.get_name()
             if self.message.origin is not None:
-                name = absolute_name.relativize(self.message.origin)
+                name = self.parser.intern_name(
+                    absolute_name.relativize(self.message.origin)
+                )
             else:
                 name = absolute_name
             (rdtype, rdclass, ttl, rdlen) = self.parser.get_struct("!HHIH")
             if rdtype in (dns.rdatatype.OPT, dns.rdatatype.TSIG):
+                if deferred:
+                    self.parser.seek(self.parser.current + rdlen)
+                    continue
                 (
                     rdclass,
                     rdtype,
@@ -1194,7 +1476,11 @@ class _WireReader:
                 else:
                     with self.parser.restrict_to(rdlen):
                         rd = dns.rdata.from_wire_parser(
-                            rdclass, rdtype, self.parser, self.message.origin
+                            rdclass,
+                            rdtype,
+                            self.parser,
+                            self.message.origin,
+                            self.lazy_rdata,
                         )
                     covers = rd.covers()
                 if self.message.xfr and rdtype == dns.rdatatype.SOA:
@@ -1217,7 +1503,7 @@ class _WireReader:
                     if key:
                         self.message.keyring = key
                         self.message.tsig_ctx = dns.tsig.validate(
-                            self.parser.wire,
+                            self.message.wire,
                             key,
                             absolute_name,
                             rd,
@@ -1262,7 +1548,18 @@ class _WireReader:
         factory = _message_factory_from_opcode(dns.opcode.from_flags(flags))
         self.message = factory(id=id)
         self.message.flags = dns.flags.Flag(flags)
-        self.message.wire = self.parser.wire
+        # This is a no-op for bytes, and otherwise ensures the message does
+        # not refer to the caller's buffer, which might be reused.
+        self.wire = bytes(self.parser.wire)
+        self.message.wire = self.wire
+        if self.lazy and self.parser.wire is not self.wire:
+            # Deferred sections are decoded after we return, so they must be
+            # read from our copy and not from the caller's buffer.
+            parser = dns.wire.Parser(
+                self.wire, self.parser.current, name_pool=self.parser.name_pool
+            )
+            parser.name_suffixes = self.parser.name_suffixes
+            self.parser = parser
         self.initialize_message(self.message)
         self.one_rr_per_rrset = self.message._get_one_rr_per_rrset(
             self.one_rr_per_rrset
@@ -1271,13 +1568,17 @@ class _WireReader:
             self._get_question(MessageSection.QUESTION, qcount)
             if self.question_only:
                 return self.message
-            self._get_section(MessageSection.ANSWER, ancount)
-            self._get_section(MessageSection.AUTHORITY, aucount)
-            self._get_section(MessageSection.ADDITIONAL, adcount)
+            if self.lazy:
+                get_section = self._scan_section
+            else:
+                get_section = self._get_section
+            get_section(MessageSection.ANSWER, ancount)
+            get_section(MessageSection.AUTHORITY, aucount)
+            get_section(MessageSection.ADDITIONAL, adcount)
             if not self.ignore_trailing and self.parser.remaining() != 0:
                 raise TrailingJunk
             if self.multi and self.message.tsig_ctx and not self.message.had_tsig:
-                self.message.tsig_ctx.update(self.parser.wire)
+                self.message.tsig_ctx.update(self.message.wire)
         except Exception as e:
             if self.continue_on_error:
                 self._add_error(e)
@@ -1287,7 +1588,7 @@ class _WireReader:
 
 
 def from_wire(
-    wire: bytes,
+    wire: dns.wire.WireType,
     keyring: Optional[Any] = None,
     request_mac: Optional[bytes] = b"",
     xfr: bool = False,
@@ -1299,9 +1600,17 @@ def from_wire(
     ignore_trailing: bool = False,
     raise_on_truncation: bool = False,
     continue_on_error: bool = False,
+    name_pool: Optional[dns.name.NamePool] = None,
+    lazy: bool = False,
+    lazy_rdata: bool = False,
 ) -> Message:
     """Convert a DNS wire format message into a message object.
 
+    *wire*, a ``bytes`` or other object supporting the buffer protocol, e.g. a
+    ``bytearray``, ``memoryview``, or ``mmap.mmap``, the wire format message.
+    Other buffers than ``bytes`` are parsed in place without copying each field,
+    and the message's ``wire`` attribute is set to a ``bytes`` copy.
+
     *keyring*, a ``dns.tsig.Key``, ``dict``, ``bool``, or ``None``, the key or keyring
     to use if the message is signed.  If ``None`` or ``True``, then trying to decode
     a message with a TSIG will fail as it cannot be validated.  If ``False``, then
@@ -1340,6 +1649,26 @@ def from_wire(
     recommended only for DNS analysis tools, or for use in a server as part of an error
     handling path.  The default is ``False``.
 
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, names read
+    from the message are interned in the pool.
+
+    *lazy*, a ``bool``.  If ``True``, the header and question section are decoded
+    immediately, but the records of the answer, authority, and additional sections
+    are only located, and each of these sections is decoded when it is first used,
+    e.g. by accessing the message's ``answer`` attribute or by calling
+    ``find_rrset()`` on it.  OPT and TSIG records are always processed immediately,
+    so EDNS and TSIG handling is the same as when *lazy* is ``False``.  Errors in
+    a deferred section are raised when the section is decoded, or, if
+    *continue_on_error* is ``True``, are added to the message's ``errors``
+    attribute at that time.  The default is ``False``.
+
+    *lazy_rdata*, a ``bool``.  If ``True``, rdata of types whose wire format can be
+    used without decoding it, e.g. DNSKEY, DS, RRSIG, and TXT, are read as
+    ``dns.rdata.LazyRdata``, which are only decoded when their fields are used.
+    Errors in such rdata are raised when they are decoded.  A ``LazyRdata`` is
+    not an instance of its type's class, so use ``dns.rdata.decode()`` before
+    checking the class of such rdata.  The default is ``False``.
+
     Raises ``dns.message.ShortHeader`` if the message is less than 12 octets long.
 
     Raises ``dns.message.TrailingJunk`` if there were octets in the message past the end
@@ -1376,6 +1705,9 @@ def from_wire(
         keyring,
         multi,
         continue_on_error,
+        name_pool,
+        lazy,
+        lazy_rdata,
     )
     try:
         m = reader.read()
@@ -1398,6 +1730,208 @@ def from_wire(
     return m
 
 
+def _from_wire_chunk(
+    wires: List[dns.wire.WireType],
+    function: Optional[Callable[[Message], Any]],
+    kwargs: Dict[str, Any],
+) -> List[Any]:
+    results: List[Any] = []
+    for wire in wires:
+        try:
+            m = from_wire(wire, **kwargs)
+        except Exception as e:
+            results.append(e)
+            continue
+        results.append(m if function is None else function(m))
+    return results
+
+
+def from_wire_many(
+    wires: Iterable[dns.wire.WireType],
+    workers: Optional[int] = None,
+    function: Optional[Callable[[Message], Any]] = None,
+    chunksize: int = 256,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Convert many DNS wire format messages into message objects, using a
+    pool of worker processes.
+
+    *wires*, an iterable of ``bytes`` or other picklable objects supporting the
+    buffer protocol, the wire format messages.  It is consumed incrementally,
+    so it may be a generator over a very large capture.
+
+    *workers*, an ``int`` or ``None``, the number of worker processes.  If
+    ``None``, the number of CPUs is used.  If 1 or less, the messages are
+    decoded in the calling process.
+
+    *function*, a callable or ``None``.  If not ``None``, it is called with
+    each message in the worker process, and its result is returned instead
+    of the message.  It must be picklable, e.g. a module-level function, and
+    to gain from the pool it should return something small.  If ``None``,
+    the messages are decoded in the calling process, whatever *workers* is,
+    as sending a message back from a worker costs more than decoding it.
+
+    *chunksize*, an ``int``, the number of messages sent to a worker at a time.
+
+    Other keyword arguments are passed to ``dns.message.from_wire()``, and
+    must be picklable, except that *name_pool* is ignored when a pool of
+    worker processes is used, as a ``dns.name.NamePool`` cannot be shared
+    between processes.
+
+    Returns an iterator yielding, in the order of *wires*, the message (or
+    the result of *function*) for each wire format message, or the exception
+    raised by ``dns.message.from_wire()`` if it could not be decoded.
+    Exceptions raised by *function* are not caught.
+    """
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def chunks() -> Iterator[List[dns.wire.WireType]]:
+        chunk = []
+        for wire in wires:
+            chunk.append(wire)
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    if workers <= 1 or function is None:
+        for chunk in chunks():
+            yield from _from_wire_chunk(chunk, function, kwargs)
+        return
+    kwargs = kwargs.copy()
+    kwargs.pop("name_pool", None)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        # Keep a bounded number of chunks in flight, so that neither the
+        # input nor the results are held in memory all at once.
+        pending: collections.deque = collections.deque()
+        for chunk in chunks():
+            pending.append(executor.submit(_from_wire_chunk, chunk, function, kwargs))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_records(
+    wire: dns.wire.WireType,
+    ignore_trailing: bool = False,
+    name_pool: Optional[dns.name.NamePool] = None,
+) -> Iterator[Tuple[MessageSection, dns.name.Name, int, int, int, int, int]]:
+    """Iterate over the records in a DNS wire format message without building
+    a message object.
+
+    For each record in the question, answer, authority, and additional sections,
+    in that order, a ``(section, name, rdtype, rdclass, ttl, rdata_offset, rdlen)``
+    tuple is yielded, where *section* is a ``dns.message.MessageSection``, *name* a
+    ``dns.name.Name``, and the rest are ``int`` values.  *rdata_offset* is the
+    offset of the record's rdata in *wire*, and *rdlen* is its length, so the rdata
+    may be decoded if needed with ``dns.rdata.from_wire()``.  For question records,
+    *ttl* and *rdlen* are 0, and *rdata_offset* is the offset of the end of the
+    record.  OPT and TSIG records are yielded like any other record.
+
+    *wire*, a ``bytes`` or other object supporting the buffer protocol, the wire
+    format message.
+
+    *ignore_trailing*, a ``bool``.  If ``True``, ignore trailing junk at end of the
+    message.
+
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, names read
+    from the message are interned in the pool.
+
+    Raises ``dns.message.ShortHeader`` if the message is less than 12 octets long.
+
+    Raises ``dns.message.TrailingJunk`` if there were octets in the message past the end
+    of the proper DNS message, and *ignore_trailing* is ``False``.
+
+    Raises ``dns.exception.FormError`` if the message is malformed.  As records are
+    yielded while the message is read, this may happen after some records have
+    been yielded.
+    """
+
+    parser = dns.wire.Parser(wire, name_pool=name_pool)
+    if parser.remaining() < 12:
+        raise ShortHeader
+    counts = parser.get_struct("!HHHHHH")[2:]
+    for section, count in zip(MessageSection, counts):
+        if section == MessageSection.QUESTION:
+            for _ in range(count):
+                name = parser.get_name()
+                (rdtype, rdclass) = parser.get_struct("!HH")
+                yield (section, name, rdtype, rdclass, 0, parser.current, 0)
+        else:
+            for _ in range(count):
+                name = parser.get_name()
+                (rdtype, rdclass, ttl, rdlen) = parser.get_struct("!HHIH")
+                rdata_offset = parser.current
+                parser.seek(rdata_offset + rdlen)
+                yield (section, name, rdtype, rdclass, ttl, rdata_offset, rdlen)
+    if not ignore_trailing and parser.remaining() != 0:
+        raise TrailingJunk
+
+
+def peek(
+    wire: dns.wire.WireType, name_pool: Optional[dns.name.NamePool] = None
+) -> Tuple[
+    int,
+    int,
+    int,
+    int,
+    Tuple[int, int, int, int],
+    Optional[Tuple[dns.name.Name, int, int]],
+]:
+    """Read the header and first question of a DNS wire format message without
+    building a message object.
+
+    This is intended for applications like load balancers which route or rate
+    limit messages based on their header or question, and must do so quickly.
+    Nothing past the first question is read, so the rest of the message is not
+    checked for errors.
+
+    Returns an ``(id, flags, opcode, rcode, counts, question)`` tuple.  *id*,
+    *flags*, *opcode*, and *rcode* are ``int`` values.  Note that *rcode* is
+    only the part of the rcode in the header, as an extended rcode requires
+    reading the OPT record.  *counts* is a tuple of the record counts of the
+    question, answer, authority, and additional sections.  *question* is a
+    ``(qname, qtype, qclass)`` tuple, where *qname* is a ``dns.name.Name``
+    and the others are ``int`` values, or ``None`` if the message has no
+    question.
+
+    *wire*, a ``bytes`` or other object supporting the buffer protocol, the wire
+    format message.
+
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, the
+    qname is interned in the pool.
+
+    Raises ``dns.message.ShortHeader`` if the message is less than 12 octets long.
+
+    Raises ``dns.exception.FormError`` if the first question is malformed.
+    """
+
+    parser = dns.wire.Parser(wire, name_pool=name_pool)
+    if parser.remaining() < 12:
+        raise ShortHeader
+    (id, flags, qcount, ancount, aucount, adcount) = parser.get_struct("!HHHHHH")
+    if qcount > 0:
+        qname = parser.get_name()
+        (qtype, qclass) = parser.get_struct("!HH")
+        question: Optional[Tuple[dns.name.Name, int, int]] = (qname, qtype, qclass)
+    else:
+        question = None
+    return (
+        id,
+        flags,
+        (flags & 0x7800) >> 11,
+        flags & 0x000F,
+        (qcount, ancount, aucount, adcount),
+        question,
+    )
+
+
 class _TextReader:
     """Text format reader.
 
@@ -1825,6 +2359,146 @@ def make_query(
     return m
 
 
+class QueryTemplate:
+    """A query rendered once, from which wire format queries differing only
+    in their id, and optionally the case of their query name, can be made
+    cheaply.
+
+    Rendering a query, including its EDNS options, costs much more than
+    copying it, so code which sends the same question many times, e.g. to
+    many servers, can make a template once and then call ``to_wire()`` or
+    ``to_wire_into()`` for each query sent.
+
+    If the query uses TSIG, each query made is signed when it is made, and
+    the request MAC needed to validate the response can be obtained with
+    ``get_mac()``.
+
+    *query*, a ``dns.message.Message``, the query.  Its id is not used.
+
+    *origin*, a ``dns.name.Name`` or ``None``, the origin to be appended to
+    any relative names, as for ``dns.message.Message.to_wire()``.
+    """
+
+    def __init__(self, query: Message, origin: Optional[dns.name.Name] = None) -> None:
+        if len(query.question) == 0:
+            raise ValueError("the query must have a question")
+        r = query._render(origin, 0, False, None, False, 65535, False)
+        #: The rendered query, without any TSIG record.
+        self.wire = r.get_wire()
+        # The query name is the first name in the message, so it is never
+        # compressed.
+        qname = query.question[0].name
+        if origin is None:
+            origin = query.origin
+        self._qname_end = 12 + len(qname.to_digestable(origin))
+        self._arcount = int.from_bytes(self.wire[10:12], "big")
+        self._key = query.keyring
+        self._tsig = query.tsig
+        if self._tsig is not None:
+            tsig = self._tsig[0]
+            # A TSIG's original id is normally the query's id, so it is
+            # changed along with it.
+            self._original_id_is_id = tsig.original_id == query.id
+            self._tsig_header = self._tsig.name.to_digestable() + struct.pack(
+                "!HHI", dns.rdatatype.TSIG, dns.rdataclass.ANY, 0
+            )
+            self._mac_offset = (
+                len(self.wire)
+                + len(self._tsig_header)
+                + 2
+                + len(tsig.algorithm.to_digestable())
+                + 10
+            )
+
+    def _patch(self, wire: Any, id: Optional[int], randomize_case: bool) -> None:
+        if id is None:
+            id = dns.entropy.random_16()
+        wire[0:2] = id.to_bytes(2, "big")
+        if randomize_case:
+            # Label lengths are at most 63, so are never letters and can be
+            # left alone.
+            # Random bits are drawn a byte at a time, as the entropy pool
+            # used when SystemRandom is unavailable cannot make large numbers.
+            bits = 0
+            for i in range(12, self._qname_end):
+                if (i - 12) % 8 == 0:
+                    bits = dns.entropy.between(0, 255)
+                c = wire[i]
+                if bits & 1 and (0x41 <= c <= 0x5A or 0x61 <= c <= 0x7A):
+                    wire[i] = c ^ 0x20
+                bits >>= 1
+
+    def _sign(self, wire: bytes) -> bytes:
+        # Return the TSIG record for the query in wire.
+        assert self._tsig is not None
+        tsig = self._tsig[0]
+        if self._original_id_is_id:
+            tsig = tsig.replace(original_id=int.from_bytes(wire[0:2], "big"))
+        (tsig, _) = dns.tsig.sign(wire, self._key, tsig, int(time.time()), b"")
+        rdata = tsig.to_wire()
+        return self._tsig_header + len(rdata).to_bytes(2, "big") + rdata
+
+    def to_wire(self, id: Optional[int] = None, randomize_case: bool = False) -> bytes:
+        """Make a query from the template.
+
+        *id*, an ``int`` or ``None``, the query id.  If ``None``, the
+        default, a random id is chosen.
+
+        *randomize_case*, a ``bool``.  If ``True``, the case of each letter
+        of the query name is chosen randomly, as described in
+        draft-vixie-dnsext-dns0x20.  The default is ``False``.
+
+        Returns a ``bytes``.
+        """
+        wire = bytearray(self.wire)
+        self._patch(wire, id, randomize_case)
+        if self._tsig is not None:
+            wire += self._sign(bytes(wire))
+            wire[10:12] = (self._arcount + 1).to_bytes(2, "big")
+        return bytes(wire)
+
+    def to_wire_into(
+        self, buffer: Any, id: Optional[int] = None, randomize_case: bool = False
+    ) -> int:
+        """Make a query from the template in *buffer*, a writable buffer such
+        as a ``bytearray`` or ``memoryview``, starting at its beginning.
+
+        The other arguments are as for ``to_wire()``.
+
+        Raises ``dns.exception.TooBig`` if the query does not fit in *buffer*.
+
+        Returns an ``int``, the length of the query.
+        """
+        view = memoryview(buffer).cast("B")
+        length = len(self.wire)
+        if length > len(view):
+            raise dns.exception.TooBig
+        view[0:length] = self.wire
+        self._patch(view, id, randomize_case)
+        if self._tsig is not None:
+            record = self._sign(view[0:length].tobytes())
+            end = length + len(record)
+            if end > len(view):
+                raise dns.exception.TooBig
+            view[length:end] = record
+            view[10:12] = (self._arcount + 1).to_bytes(2, "big")
+            length = end
+        return length
+
+    def get_mac(self, wire: bytes) -> bytes:
+        """Return the TSIG MAC of *wire*, a query made by this template.  It
+        is the request MAC needed to validate the response to the query,
+        e.g. the *request_mac* of ``dns.message.from_wire()``.
+
+        Returns a ``bytes``, which is empty if the query does not use TSIG.
+        """
+        if self._tsig is None:
+            return b""
+        offset = self._mac_offset
+        size = int.from_bytes(wire[offset - 2 : offset], "big")
+        return bytes(wire[offset : offset + size])
+
+
 def make_response(
     query: Message,
     recursion_available: bool = False,
@@ -22,9 +22,10 @@ import copy
 import encodings.idna  # type: ignore
 import functools
 import struct
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
 
 import dns._features
+import dns._lru
 import dns.enum
 import dns.exception
 import dns.immutable
@@ -37,7 +38,23 @@ if dns._features.have("idna"):
 else:  # pragma: no cover
     have_idna_2008 = False
 
-CompressType = Dict["Name", int]
+# Compression tables map name suffixes to the offset where they were
+# rendered.  Tables made by callers are keyed by dns.name.Name; see
+# WireCompressTable for the faster kind the renderer uses.
+CompressType = Dict[Any, int]
+
+
+class WireCompressTable(dict):
+    """A compression table keyed by the canonical (i.e. lowercased)
+    uncompressed wire format of each name suffix rather than by
+    ``dns.name.Name``.
+
+    ``Name.to_wire()`` need not make a name object for each suffix of a
+    name to probe such a table, so it is faster than a ``dict`` keyed by
+    name.  ``dns.renderer.Renderer`` uses one.
+    """
+
+    __slots__ = ()
 
 
 class NameRelation(dns.enum.IntEnum):
@@ -168,10 +185,83 @@ def _escapify(label: Union[bytes, str]) -> str:
 
 
 class IDNACodec:
-    """Abstract base class for IDNA encoder/decoders."""
+    """Abstract base class for IDNA encoder/decoders.
+
+    A codec can optionally cache the labels it encodes and decodes when names
+    are converted with ``dns.name.from_unicode()``, ``dns.name.from_text()``,
+    and ``dns.name.Name.to_unicode()``.  Caching is off by default, and is
+    configured per codec with ``set_cache_size()``.  Calling ``encode()`` and
+    ``decode()`` directly never uses the cache.
+    """
+
+    # The cache is a class attribute by default so that subclasses which do
+    # not call our __init__() still work.
+    _cache: Optional["_LabelCache"] = None
 
     def __init__(self):
-        pass
+        self._cache = None
+
+    def set_cache_size(self, max_size: int) -> None:
+        """Set the maximum number of labels to cache.
+
+        *max_size*, an ``int``, the maximum number of encoded and decoded
+        labels to keep.  When the cache is full, the least-recently used
+        label is removed to make space for a new one.  If 0, caching is
+        disabled and the cache and its statistics are discarded.
+        """
+        if max_size < 1:
+            self._cache = None
+        elif self._cache is None:
+            self._cache = _LabelCache(max_size)
+        else:
+            self._cache.set_max_size(max_size)
+
+    def cache_size(self) -> int:
+        """How many labels are cached?"""
+        cache = self._cache
+        return len(cache) if cache is not None else 0
+
+    def cache_hits(self) -> int:
+        """How many hits has the cache had?"""
+        cache = self._cache
+        return cache.hits() if cache is not None else 0
+
+    def cache_misses(self) -> int:
+        """How many misses has the cache had?"""
+        cache = self._cache
+        return cache.misses() if cache is not None else 0
+
+    def reset_cache_statistics(self) -> None:
+        """Reset all cache statistics to zero."""
+        cache = self._cache
+        if cache is not None:
+            cache.reset_statistics()
+
+    def flush_cache(self) -> None:
+        """Remove all labels from the cache."""
+        cache = self._cache
+        if cache is not None:
+            cache.flush()
+
+    def _encode_label(self, label: str) -> bytes:
+        cache = self._cache
+        if cache is None:
+            return self.encode(label)
+        encoded = cache.get(label)
+        if encoded is None:
+            encoded = self.encode(label)
+            cache.put(label, encoded)
+        return encoded
+
+    def _decode_label(self, label: bytes) -> str:
+        cache = self._cache
+        if cache is None:
+            return self.decode(label)
+        decoded = cache.get(label)
+        if decoded is None:
+            decoded = self.decode(label)
+            cache.put(label, decoded)
+        return decoded
 
     def is_idna(self, label: bytes) -> bool:
         return label.lower().startswith(b"xn--")
@@ -301,6 +391,23 @@ class IDNA2008Codec(IDNACodec):
             raise IDNAException(idna_exception=e)
 
 
+class _LabelCache(dns._lru.LRUStore[Union[str, bytes], Any]):
+    """Thread-safe, bounded, least-recently-used cache of encoded and
+    decoded labels, keyed by the ``str`` or ``bytes`` label given to the
+    codec.
+    """
+
+    def get(self, key: Union[str, bytes]) -> Any:
+        with self.lock:
+            return self._lookup(key)
+
+    def put(self, key: Union[str, bytes], value: Any) -> None:
+        # The value is computed without holding the lock, so another thread
+        # may have added it already.
+        with self.lock:
+            self._store(key, value)
+
+
 IDNA_2003_Practical = IDNA2003Codec(False)
 IDNA_2003_Strict = IDNA2003Codec(True)
 IDNA_2003 = IDNA_2003_Practical
@@ -363,14 +470,21 @@ class Name:
     of the class are immutable.
     """
 
-    __slots__ = ["labels"]
+    __slots__ = ["labels", "_hash", "_canonical_key"]
+
+    labels: Tuple[bytes, ...]
+    _hash: Optional[int]
+    _canonical_key: Optional[bytes]
 
+    @dns.immutable.unguarded_init
     def __init__(self, labels: Iterable[Union[bytes, str]]):
         """*labels* is any iterable whose values are ``str`` or ``bytes``."""
 
-        blabels = [_maybe_convert_to_binary(x) for x in labels]
-        self.labels = tuple(blabels)
-        _validate_labels(self.labels)
+        blabels = tuple(_maybe_convert_to_binary(x) for x in labels)
+        _validate_labels(blabels)
+        object.__setattr__(self, "labels", blabels)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_canonical_key", None)
 
     def __copy__(self):
         return Name(self.labels)
@@ -384,6 +498,8 @@ class Name:
 
     def __setstate__(self, state):
         super().__setattr__("labels", state["labels"])
+        super().__setattr__("_hash", None)
+        super().__setattr__("_canonical_key", None)
         _validate_labels(self.labels)
 
     def is_absolute(self) -> bool:
@@ -408,11 +524,54 @@ class Name:
         Returns an ``int``.
         """
 
-        h = 0
-        for label in self.labels:
-            for c in label.lower():
-                h += (h << 3) + c
-        return h
+        # The hash is computed on first use and then cached, as names
+        # are immutable and are very frequently used as dictionary keys.
+        # We cache hash(h) rather than h as h can be a large integer for
+        # long names, and hash() would reduce it this way anyway.
+        cached = self._hash
+        if cached is None:
+            h = 0
+            for label in self.labels:
+                for c in label.lower():
+                    h += (h << 3) + c
+            cached = hash(h)
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def canonical_key(self) -> bytes:
+        """Return a key which sorts names in DNSSEC canonical order.
+
+        The key is a ``bytes`` made from the lowercased labels of the name
+        in reverse order, as in RFC 4034 section 6.1, such that comparing
+        the keys of two names gives the same result as comparing the names.
+        It is much cheaper to compare than the names themselves, so sorting
+        many names is fastest with ``sorted(names, key=Name.canonical_key)``.
+
+        Relative names sort before absolute names.
+
+        Returns a ``bytes``.
+        """
+
+        cached = self._canonical_key
+        if cached is None:
+            labels = self.labels
+            if len(labels) > 0 and labels[-1] == b"":
+                prefix = b"\x01"
+                labels = labels[:-1]
+            else:
+                prefix = b"\x00"
+            # Labels are separated by 0, which must sort before any label
+            # octet, so 0 and 1 octets within labels are escaped as 1 1 and
+            # 1 2 respectively.  This rarely happens.
+            key = b"\x00".join(reversed(labels))
+            if b"\x01" in key or key.count(b"\x00") > max(len(labels) - 1, 0):
+                key = b"\x00".join(
+                    label.replace(b"\x01", b"\x01\x02").replace(b"\x00", b"\x01\x01")
+                    for label in reversed(labels)
+                )
+            cached = prefix + key.lower()
+            object.__setattr__(self, "_canonical_key", cached)
+        return cached
 
     def fullcompare(self, other: "Name") -> Tuple[NameRelation, int, int]:
         """Compare two names, returning a 3-tuple
@@ -618,7 +777,7 @@ class Name:
             l = self.labels
         if idna_codec is None:
             idna_codec = IDNA_2003_Practical
-        return ".".join([idna_codec.decode(x) for x in l])
+        return ".".join([idna_codec._decode_label(x) for x in l])
 
     def to_digestable(self, origin: Optional["Name"] = None) -> bytes:
         """Convert name to a format suitable for digesting in hashes.
@@ -658,7 +817,9 @@ class Name:
         ``None`` (the default), names will not be compressed.  Note that
         the compression code assumes that compression offset 0 is the
         start of *file*, and thus compression will not be correct
-        if this is not the case.
+        if this is not the case.  A ``dict`` is keyed by
+        ``dns.name.Name``; a ``dns.name.WireCompressTable`` is keyed by
+        the wire format of each name suffix, and is faster.
 
         *origin* is a ``dns.name.Name`` or ``None``.  If the name is
         relative and origin is not ``None``, then *origin* will be appended
@@ -701,32 +862,69 @@ class Name:
             labels.extend(list(origin.labels))
         else:
             labels = self.labels
-        i = 0
+        if compress is None:
+            out = bytearray()
+            for label in labels:
+                out.append(len(label))
+                if canonicalize:
+                    out += label.lower()
+                else:
+                    out += label
+            file.write(out)
+            return None
+        if not isinstance(compress, WireCompressTable):
+            self._to_wire_name_keyed(file, compress, labels, canonicalize)
+            return None
+        # The compression table is keyed by the canonical wire format of
+        # each suffix, which is just a slice of the canonical wire format
+        # of the whole name.
+        lowered = [label.lower() for label in labels]
+        if canonicalize:
+            labels = lowered
+        key = b"".join(len(label).to_bytes(1, "big") + label for label in lowered)
+        start = file.tell()
+        out = bytearray()
+        where = 0
         for label in labels:
+            l = len(label)
+            if l == 0:
+                # The root name is never compressed.
+                out.append(0)
+                break
+            suffix = key[where:]
+            pos = compress.get(suffix)
+            if pos is not None:
+                out += struct.pack("!H", 0xC000 + pos)
+                break
+            pos = start + len(out)
+            if pos <= 0x3FFF:
+                compress[suffix] = pos
+            out.append(l)
+            out += label
+            where += l + 1
+        file.write(out)
+        return None
+
+    @staticmethod
+    def _to_wire_name_keyed(
+        file: Any, compress: CompressType, labels: Sequence[bytes], canonicalize: bool
+    ) -> None:
+        # Render labels with a compression table keyed by dns.name.Name.
+        for i, label in enumerate(labels):
             n = Name(labels[i:])
-            i += 1
-            if compress is not None:
-                pos = compress.get(n)
-            else:
-                pos = None
+            pos = compress.get(n)
             if pos is not None:
-                value = 0xC000 + pos
-                s = struct.pack("!H", value)
-                file.write(s)
+                file.write(struct.pack("!H", 0xC000 + pos))
                 break
+            if len(n) > 1:
+                pos = file.tell()
+                if pos <= 0x3FFF:
+                    compress[n] = pos
+            file.write(struct.pack("!B", len(label)))
+            if canonicalize:
+                file.write(label.lower())
             else:
-                if compress is not None and len(n) > 1:
-                    pos = file.tell()
-                    if pos <= 0x3FFF:
-                        compress[n] = pos
-                l = len(label)
-                file.write(struct.pack("!B", l))
-                if l > 0:
-                    if canonicalize:
-                        file.write(label.lower())
-                    else:
-                        file.write(label)
-        return None
+                file.write(label)
 
     def __len__(self) -> int:
         """The length of the name (in labels).
@@ -892,8 +1090,48 @@ root = Name([b""])
 empty = Name([])
 
 
+class NamePool(dns._lru.LRUStore[Tuple[bytes, ...], Name]):
+    """Thread-safe, bounded, least-recently-used pool of interned names.
+
+    Parsing a message or a zone file makes a new ``dns.name.Name`` for
+    every name read, even though many of them are equal to each other.
+    Passing a pool to the parsing functions that accept one makes them
+    return a shared ``dns.name.Name`` object for each distinct name instead,
+    which reduces memory usage when many equal names are kept around.
+
+    Names are interned case-sensitively, so interning never changes the
+    case of a name.  When the pool is full, the least-recently used name
+    is removed to make space for a new one.
+    """
+
+    def __init__(self, max_size: int = 100000) -> None:
+        """*max_size*, an ``int``, is the maximum number of names to keep;
+        it must be greater than 0.
+        """
+
+        super().__init__(max_size)
+
+    def intern(self, name: Name) -> Name:
+        """Return the pooled name equal to *name*, adding *name* to the pool
+        if there is no such name.
+
+        Returns a ``dns.name.Name``.
+        """
+
+        key = name.labels
+        with self.lock:
+            pooled = self._lookup(key)
+            if pooled is None:
+                self._store(key, name)
+                return name
+            return pooled
+
+
 def from_unicode(
-    text: str, origin: Optional[Name] = root, idna_codec: Optional[IDNACodec] = None
+    text: str,
+    origin: Optional[Name] = root,
+    idna_codec: Optional[IDNACodec] = None,
+    name_pool: Optional[NamePool] = None,
 ) -> Name:
     """Convert unicode text into a Name object.
 
@@ -909,6 +1147,9 @@ def from_unicode(
     encoder/decoder.  If ``None``, the default IDNA 2003 encoder/decoder
     is used.
 
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, the
+    resulting name is interned in the pool.
+
     Returns a ``dns.name.Name``.
     """
 
@@ -927,7 +1168,8 @@ def from_unicode(
         text = ""
     if text:
         if text in [".", "\u3002", "\uff0e", "\uff61"]:
-            return Name([b""])  # no Unicode "u" on this constant!
+            # no Unicode "u" on this constant!
+            return _maybe_intern(Name([b""]), name_pool)
         for c in text:
             if escaping:
                 if edigits == 0:
@@ -949,7 +1191,7 @@ def from_unicode(
             elif c in [".", "\u3002", "\uff0e", "\uff61"]:
                 if len(label) == 0:
                     raise EmptyLabel
-                labels.append(idna_codec.encode(label))
+                labels.append(idna_codec._encode_label(label))
                 label = ""
             elif c == "\\":
                 escaping = True
@@ -960,13 +1202,19 @@ def from_unicode(
         if escaping:
             raise BadEscape
         if len(label) > 0:
-            labels.append(idna_codec.encode(label))
+            labels.append(idna_codec._encode_label(label))
         else:
             labels.append(b"")
 
     if (len(labels) == 0 or labels[-1] != b"") and origin is not None:
         labels.extend(list(origin.labels))
-    return Name(labels)
+    return _maybe_intern(Name(labels), name_pool)
+
+
+def _maybe_intern(name: Name, name_pool: Optional[NamePool]) -> Name:
+    if name_pool is None:
+        return name
+    return name_pool.intern(name)
 
 
 def is_all_ascii(text: str) -> bool:
@@ -980,6 +1228,7 @@ def from_text(
     text: Union[bytes, str],
     origin: Optional[Name] = root,
     idna_codec: Optional[IDNACodec] = None,
+    name_pool: Optional[NamePool] = None,
 ) -> Name:
     """Convert text into a Name object.
 
@@ -992,13 +1241,16 @@ def from_text(
     encoder/decoder.  If ``None``, the default IDNA 2003 encoder/decoder
     is used.
 
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, the
+    resulting name is interned in the pool.
+
     Returns a ``dns.name.Name``.
     """
 
     if isinstance(text, str):
         if not is_all_ascii(text):
             # Some codepoint in the input text is > 127, so IDNA applies.
-            return from_unicode(text, origin, idna_codec)
+            return from_unicode(text, origin, idna_codec, name_pool)
         # The input is all ASCII, so treat this like an ordinary non-IDNA
         # domain name.  Note that "all ASCII" is about the input text,
         # not the codepoints in the domain name.  E.g. if text has value
@@ -1021,7 +1273,7 @@ def from_text(
         text = b""
     if text:
         if text == b".":
-            return Name([b""])
+            return _maybe_intern(Name([b""]), name_pool)
         for c in text:
             byte_ = struct.pack("!B", c)
             if escaping:
@@ -1060,7 +1312,7 @@ def from_text(
             labels.append(b"")
     if (len(labels) == 0 or labels[-1] != b"") and origin is not None:
         labels.extend(list(origin.labels))
-    return Name(labels)
+    return _maybe_intern(Name(labels), name_pool)
 
 
 # we need 'dns.wire.Parser' quoted as dns.name and dns.wire depend on each other.
@@ -1079,23 +1331,55 @@ def from_wire_parser(parser: "dns.wire.Parser") -> Name:
     Returns a ``dns.name.Name``
     """
 
+    # This reads the parser's buffer directly rather than with get_uint8() and
+    # get_bytes(), as names are the bulk of most messages.
     labels = []
-    biggest_pointer = parser.current
-    with parser.restore_furthest():
-        count = parser.get_uint8()
-        while count != 0:
-            if count < 64:
-                labels.append(parser.get_bytes(count))
-            elif count >= 192:
-                current = (count & 0x3F) * 256 + parser.get_uint8()
-                if current >= biggest_pointer:
-                    raise BadPointer
-                biggest_pointer = current
-                parser.seek(current)
-            else:
-                raise BadLabelType
-            count = parser.get_uint8()
-        labels.append(b"")
+    starts = []
+    suffixes = parser.name_suffixes
+    buffer = parser.buffer
+    end = parser.end
+    current = parser.current
+    biggest_pointer = current
+    # Where the name ends, i.e. where the first compression pointer is.
+    name_end = None
+    while True:
+        if current >= end:
+            raise dns.exception.FormError
+        count = buffer[current]
+        if count == 0:
+            current += 1
+            labels.append(b"")
+            break
+        elif count < 64:
+            start = current
+            current += count + 1
+            if current > end:
+                raise dns.exception.FormError
+            starts.append(start)
+            labels.append(bytes(buffer[start + 1 : current]))
+        elif count >= 192:
+            if current + 2 > end:
+                raise dns.exception.FormError
+            if name_end is None:
+                name_end = current + 2
+            current = (count & 0x3F) * 256 + buffer[current + 1]
+            if current >= biggest_pointer:
+                raise BadPointer
+            suffix = suffixes.get(current)
+            if suffix is not None:
+                # We have decoded the rest of this name before.
+                labels.extend(suffix)
+                break
+            biggest_pointer = current
+        else:
+            raise BadLabelType
+    if name_end is None:
+        name_end = current
+    if name_end > parser.furthest:
+        parser.furthest = name_end
+    parser.current = parser.furthest
+    for i, start in enumerate(starts):
+        suffixes[start] = tuple(labels[i:])
     return Name(labels)
 
 
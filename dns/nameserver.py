@@ -1,4 +1,6 @@
-from typing import Optional, Union
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import dns.asyncbackend
@@ -8,6 +10,16 @@ import dns.message
 import dns.query
 
 
+def _running_loop(backend: dns.asyncbackend.Backend) -> Any:
+    # Return an object identifying the running event loop of backend.
+    if backend.name() == "trio":
+        # pylint: disable-next=import-outside-toplevel
+        import trio  # type: ignore
+
+        return trio.lowlevel.current_trio_token()
+    return asyncio.get_running_loop()
+
+
 class Nameserver:
     def __init__(self):
         pass
@@ -27,6 +39,14 @@ class Nameserver:
     def answer_port(self) -> int:
         raise NotImplementedError
 
+    def uses_connection_pool(self) -> bool:
+        """Can ``query()`` and ``async_query()`` take a *connection_pool*
+        keyword argument, a ``dns.query.ConnectionPool`` or
+        ``dns.asyncquery.ConnectionPool`` respectively, for their TCP or TLS
+        connections?
+        """
+        return False
+
     def query(
         self,
         request: dns.message.QueryMessage,
@@ -77,12 +97,21 @@ class AddressAndPortNameserver(Nameserver):
 
 
 class Do53Nameserver(AddressAndPortNameserver):
-    def __init__(self, address: str, port: int = 53):
+    def __init__(
+        self,
+        address: str,
+        port: int = 53,
+        pool: Optional[dns.query.UDPSocketPool] = None,
+    ):
         super().__init__(address, port)
+        self.pool = pool
 
     def kind(self):
         return "Do53"
 
+    def uses_connection_pool(self) -> bool:
+        return True
+
     def query(
         self,
         request: dns.message.QueryMessage,
@@ -92,6 +121,7 @@ class Do53Nameserver(AddressAndPortNameserver):
         max_size: bool,
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
+        connection_pool: Optional[dns.query.ConnectionPool] = None,
     ) -> dns.message.Message:
         if max_size:
             response = dns.query.tcp(
@@ -103,6 +133,7 @@ class Do53Nameserver(AddressAndPortNameserver):
                 source_port=source_port,
                 one_rr_per_rrset=one_rr_per_rrset,
                 ignore_trailing=ignore_trailing,
+                pool=connection_pool,
             )
         else:
             response = dns.query.udp(
@@ -117,6 +148,7 @@ class Do53Nameserver(AddressAndPortNameserver):
                 ignore_trailing=ignore_trailing,
                 ignore_errors=True,
                 ignore_unexpected=True,
+                pool=self.pool,
             )
         return response
 
@@ -130,6 +162,7 @@ class Do53Nameserver(AddressAndPortNameserver):
         backend: dns.asyncbackend.Backend,
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
+        connection_pool: Optional[dns.asyncquery.ConnectionPool] = None,
     ) -> dns.message.Message:
         if max_size:
             response = await dns.asyncquery.tcp(
@@ -142,6 +175,7 @@ class Do53Nameserver(AddressAndPortNameserver):
                 backend=backend,
                 one_rr_per_rrset=one_rr_per_rrset,
                 ignore_trailing=ignore_trailing,
+                pool=connection_pool,
             )
         else:
             response = await dns.asyncquery.udp(
@@ -162,6 +196,28 @@ class Do53Nameserver(AddressAndPortNameserver):
 
 
 class DoHNameserver(Nameserver):
+    """A DNS-over-HTTPS nameserver.
+
+    Queries made with ``query()`` and ``async_query()`` share an HTTP client,
+    one for each source address and port, which is made when it is first
+    needed.  The client keeps its connections open, so later queries do not
+    pay for new TCP and TLS handshakes.  Call ``close()`` or ``aclose()`` to
+    close the clients when the nameserver is no longer needed.  An async
+    client belongs to the event loop which made it, and a query in another
+    loop makes a new client, so ``aclose()`` should be called before a loop
+    ends.
+
+    *max_connections*, an ``int`` or ``None``, the maximum number of
+    connections each client keeps to the server.  ``None`` means no limit.
+    The default is 10.
+
+    *multiplex*, a ``bool``.  If ``True``, the default, and *http_version*
+    allows HTTP/2, concurrent queries are multiplexed as HTTP/2 streams on a
+    shared connection.  If ``False``, the clients only use HTTP/1.1, and each
+    concurrent query uses its own connection, which *http_version* must
+    then allow.
+    """
+
     def __init__(
         self,
         url: str,
@@ -169,13 +225,119 @@ class DoHNameserver(Nameserver):
         verify: Union[bool, str] = True,
         want_get: bool = False,
         http_version: dns.query.HTTPVersion = dns.query.HTTPVersion.DEFAULT,
+        max_connections: Optional[int] = 10,
+        multiplex: bool = True,
     ):
         super().__init__()
+        if not multiplex and http_version == dns.query.HTTPVersion.H2:
+            raise ValueError("HTTP/2 always multiplexes; use HTTP/1.1 instead")
         self.url = url
         self.bootstrap_address = bootstrap_address
         self.verify = verify
         self.want_get = want_get
         self.http_version = http_version
+        self.max_connections = max_connections
+        self.multiplex = multiplex
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[Optional[str], int], Any] = {}
+        self._async_clients: Dict[Tuple[Optional[str], int, str], Tuple[Any, Any]] = {}
+
+    def _uses_client(self) -> bool:
+        # dns.query.https() does not use a client for HTTP/3.
+        return dns.query.have_doh and self.http_version != dns.query.HTTPVersion.H3
+
+    def _make_client(
+        self,
+        client_class: Any,
+        transport_class: Any,
+        source: Optional[str],
+        source_port: int,
+    ) -> Any:
+        h1 = self.http_version in (
+            dns.query.HTTPVersion.H1,
+            dns.query.HTTPVersion.DEFAULT,
+        )
+        h2 = self.http_version in (
+            dns.query.HTTPVersion.H2,
+            dns.query.HTTPVersion.DEFAULT,
+        )
+        if not self.multiplex:
+            h2 = False
+        limits = dns.query.httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        transport = transport_class(
+            local_address=source,
+            http1=h1,
+            http2=h2,
+            verify=self.verify,
+            limits=limits,
+            local_port=source_port if source is not None else 0,
+            bootstrap_address=self.bootstrap_address,
+        )
+        return client_class(http1=h1, http2=h2, verify=self.verify, transport=transport)
+
+    def _get_client(self, source: Optional[str], source_port: int) -> Any:
+        key = (source, source_port)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._make_client(
+                    dns.query.httpx.Client,
+                    dns.query._HTTPTransport,
+                    source,
+                    source_port,
+                )
+                self._clients[key] = client
+            return client
+
+    def _get_async_client(
+        self,
+        source: Optional[str],
+        source_port: int,
+        backend: dns.asyncbackend.Backend,
+    ) -> Any:
+        # An async client can only be used in the event loop which made it,
+        # so a client made in another loop is replaced.  That loop cannot run
+        # the client's close, so the client is just dropped.  There is no
+        # await between the lookup and the store, so no lock is needed.
+        key = (source, source_port, backend.name())
+        loop = _running_loop(backend)
+        (client_loop, client) = self._async_clients.get(key, (None, None))
+        if client is None or client_loop is not loop:
+            client = self._make_client(
+                dns.query.httpx.AsyncClient,
+                backend.get_transport_class(),
+                source,
+                source_port,
+            )
+            self._async_clients[key] = (loop, client)
+        return client
+
+    def close(self) -> None:
+        """Close the clients made by ``query()``.  A later query makes a
+        new client.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the clients made by ``async_query()`` in the running event
+        loop, and forget those made in other loops.  A later query makes a new
+        client.
+        """
+        loop = _running_loop(dns.asyncbackend.get_default_backend())
+        clients = list(self._async_clients.values())
+        self._async_clients.clear()
+        for client_loop, client in clients:
+            # A client made in another event loop cannot be closed in this
+            # one, and is just dropped.
+            if client_loop is loop:
+                await client.aclose()
 
     def kind(self):
         return "DoH"
@@ -205,15 +367,19 @@ class DoHNameserver(Nameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        session = None
+        if self._uses_client():
+            session = self._get_client(source, source_port)
         return dns.query.https(
             request,
             self.url,
             timeout=timeout,
             source=source,
             source_port=source_port,
-            bootstrap_address=self.bootstrap_address,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
+            session=session,
+            bootstrap_address=self.bootstrap_address,
             verify=self.verify,
             post=(not self.want_get),
             http_version=self.http_version,
@@ -230,15 +396,19 @@ class DoHNameserver(Nameserver):
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
     ) -> dns.message.Message:
+        client = None
+        if self._uses_client():
+            client = self._get_async_client(source, source_port, backend)
         return await dns.asyncquery.https(
             request,
             self.url,
             timeout=timeout,
             source=source,
             source_port=source_port,
-            bootstrap_address=self.bootstrap_address,
             one_rr_per_rrset=one_rr_per_rrset,
             ignore_trailing=ignore_trailing,
+            client=client,
+            bootstrap_address=self.bootstrap_address,
             verify=self.verify,
             post=(not self.want_get),
             http_version=self.http_version,
@@ -260,6 +430,9 @@ class DoTNameserver(AddressAndPortNameserver):
     def kind(self):
         return "DoT"
 
+    def uses_connection_pool(self) -> bool:
+        return True
+
     def query(
         self,
         request: dns.message.QueryMessage,
@@ -269,6 +442,7 @@ class DoTNameserver(AddressAndPortNameserver):
         max_size: bool = False,
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
+        connection_pool: Optional[dns.query.ConnectionPool] = None,
     ) -> dns.message.Message:
         return dns.query.tls(
             request,
@@ -279,6 +453,7 @@ class DoTNameserver(AddressAndPortNameserver):
             ignore_trailing=ignore_trailing,
             server_hostname=self.hostname,
             verify=self.verify,
+            pool=connection_pool,
         )
 
     async def async_query(
@@ -291,6 +466,7 @@ class DoTNameserver(AddressAndPortNameserver):
         backend: dns.asyncbackend.Backend,
         one_rr_per_rrset: bool = False,
         ignore_trailing: bool = False,
+        connection_pool: Optional[dns.asyncquery.ConnectionPool] = None,
     ) -> dns.message.Message:
         return await dns.asyncquery.tls(
             request,
@@ -301,6 +477,7 @@ class DoTNameserver(AddressAndPortNameserver):
             ignore_trailing=ignore_trailing,
             server_hostname=self.hostname,
             verify=self.verify,
+            pool=connection_pool,
         )
 
 
@@ -0,0 +1,286 @@
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+"""DNS name trie"""
+
+import bisect
+
+# pylint seems to be confused about this one!
+from collections.abc import MutableMapping  # pylint: disable=no-name-in-module
+from typing import Any, Iterator, List, Optional, Tuple
+
+import dns.name
+
+
+class _Node:
+    __slots__ = ["children", "sorted_labels", "key", "value"]
+
+    def __init__(self):
+        # A dictionary mapping lowercased labels to child nodes, or None if
+        # there are no children.
+        self.children = None
+        # The keys of children in sorted order, or None if they have not
+        # been computed since the children last changed.
+        self.sorted_labels = None
+        # The name stored at this node, or None if no value is stored here.
+        self.key = None
+        self.value = None
+
+    def get_sorted_labels(self) -> List[bytes]:
+        if self.sorted_labels is None:
+            self.sorted_labels = sorted(self.children) if self.children else []
+        return self.sorted_labels
+
+    def first(self) -> "_Node":
+        # Return the first node with a value in this subtree.  Nodes without
+        # values always have children, so this always finds one.
+        node = self
+        while node.key is None:
+            node = node.children[node.get_sorted_labels()[0]]
+        return node
+
+    def last(self) -> "_Node":
+        # Return the last node with a value in this subtree.  Leaf nodes
+        # always have values.
+        node = self
+        while node.children:
+            node = node.children[node.get_sorted_labels()[-1]]
+        return node
+
+    def is_empty(self) -> bool:
+        return self.key is None and not self.children
+
+
+class NameTrie(MutableMapping):
+    """A dictionary whose keys are dns.name.Name objects, stored in a trie
+    of their labels.
+
+    In addition to being like a regular Python dictionary, a trie can get the
+    deepest match for a given key like a ``dns.namedict.NameDict``, iterate
+    over the names at or below a given name, and find the names before and
+    after a given name.
+
+    Iteration is in DNSSEC canonical order (RFC 4034 section 6.1), i.e. the
+    order of ``sorted()`` on the keys.  Relative names sort before absolute
+    names.
+
+    *items*, a mapping or an iterable of ``(dns.name.Name, value)`` tuples,
+    the initial contents of the trie.
+    """
+
+    __slots__ = ["_relative", "_absolute", "_len"]
+
+    def __init__(self, items: Any = None):
+        super().__init__()
+        # The empty name, and the root of all relative names.
+        self._relative = _Node()
+        # The root name, and the root of all absolute names.
+        self._absolute = _Node()
+        self._len = 0
+        if items is not None:
+            if hasattr(items, "items"):
+                items = items.items()
+            for key, value in items:
+                self[key] = value
+
+    def _top(self, key: dns.name.Name) -> Tuple[_Node, Tuple[bytes, ...]]:
+        # Return the top node for key and the labels to walk down from it,
+        # which exclude the root label of an absolute name.
+        if not isinstance(key, dns.name.Name):
+            raise ValueError("NameTrie key must be a name")
+        labels = key.labels
+        if key.is_absolute():
+            return (self._absolute, labels[:-1])
+        else:
+            return (self._relative, labels)
+
+    def _find(self, key: dns.name.Name) -> Optional[_Node]:
+        (node, labels) = self._top(key)
+        for label in reversed(labels):
+            if node.children is None:
+                return None
+            node = node.children.get(label.lower())
+            if node is None:
+                return None
+        return node
+
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None or node.key is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value):
+        (node, labels) = self._top(key)
+        for label in reversed(labels):
+            label = label.lower()
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(label)
+            if child is None:
+                child = _Node()
+                node.children[label] = child
+                node.sorted_labels = None
+            node = child
+        if node.key is None:
+            # Like a dict, keep the first key given for equal names.
+            node.key = key
+            self._len += 1
+        node.value = value
+
+    def __delitem__(self, key):
+        (node, labels) = self._top(key)
+        path = []
+        for label in reversed(labels):
+            label = label.lower()
+            child = node.children.get(label) if node.children else None
+            if child is None:
+                raise KeyError(key)
+            path.append((node, label))
+            node = child
+        if node.key is None:
+            raise KeyError(key)
+        node.key = None
+        node.value = None
+        self._len -= 1
+        # Prune nodes which no longer lead to any value.
+        while path and node.is_empty():
+            (node, label) = path.pop()
+            del node.children[label]
+            node.sorted_labels = None
+            if not node.children:
+                node.children = None
+
+    def __contains__(self, key):
+        node = self._find(key)
+        return node is not None and node.key is not None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for key, _ in self._walk(self._relative):
+            yield key
+        for key, _ in self._walk(self._absolute):
+            yield key
+
+    def _walk(self, node: _Node) -> Iterator[Tuple[dns.name.Name, Any]]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.key is not None:
+                yield (node.key, node.value)
+            if node.children:
+                children = node.children
+                stack.extend(
+                    children[label] for label in reversed(node.get_sorted_labels())
+                )
+
+    def iter_subtree(self, name: dns.name.Name) -> Iterator[Tuple[dns.name.Name, Any]]:
+        """Iterate over the names in the trie which are a subdomain of
+        *name*, including *name* itself if it is in the trie.
+
+        *name*, a ``dns.name.Name``, the top of the subtree.
+
+        Returns an iterator of ``(key, value)`` tuples in DNSSEC canonical
+        order.
+        """
+        node = self._find(name)
+        if node is None:
+            return iter(())
+        return self._walk(node)
+
+    def get_deepest_match(self, name: dns.name.Name) -> Tuple[dns.name.Name, Any]:
+        """Find the deepest match to *name* in the trie.
+
+        The deepest match is the longest name in the trie which is
+        a superdomain of *name*.  Note that *superdomain* includes matching
+        *name* itself.  As with ``dns.namedict.NameDict``, the empty name
+        matches any name.
+
+        *name*, a ``dns.name.Name``, the name to find.
+
+        Raises ``KeyError`` if there is no match.
+
+        Returns a ``(key, value)`` where *key* is the deepest
+        ``dns.name.Name``, and *value* is the value associated with *key*.
+        """
+        (node, labels) = self._top(name)
+        match = node if node.key is not None else None
+        for label in reversed(labels):
+            if node.children is None:
+                break
+            node = node.children.get(label.lower())
+            if node is None:
+                break
+            if node.key is not None:
+                match = node
+        if match is None:
+            match = self._relative
+            if match.key is None:
+                raise KeyError(name)
+        return (match.key, match.value)
+
+    def _path(self, name: dns.name.Name) -> Tuple[List[Tuple[_Node, bytes]], bool]:
+        # Return the (node, label) pairs on the way to name, where label is
+        # the label of the next node down whether or not it exists, and
+        # whether name's node exists.
+        (node, labels) = self._top(name)
+        path = []
+        for label in reversed(labels):
+            label = label.lower()
+            path.append((node, label))
+            child = node.children.get(label) if node.children else None
+            if child is None:
+                return (path, False)
+            node = child
+        path.append((node, b""))
+        return (path, True)
+
+    def predecessor(self, name: dns.name.Name) -> Optional[Tuple[dns.name.Name, Any]]:
+        """Find the name in the trie which is immediately before *name* in
+        DNSSEC canonical order.  *name* need not be in the trie.
+
+        *name*, a ``dns.name.Name``, the name to find the predecessor of.
+
+        Returns a ``(key, value)`` tuple, or ``None`` if there is no name
+        before *name*.
+        """
+        (path, exists) = self._path(name)
+        if exists:
+            # Nothing below name's node comes before it.
+            path.pop()
+        for node, label in reversed(path):
+            labels = node.get_sorted_labels()
+            i = bisect.bisect_left(labels, label)
+            if i > 0:
+                found = node.children[labels[i - 1]].last()
+                return (found.key, found.value)
+            if node.key is not None:
+                return (node.key, node.value)
+        if name.is_absolute() and not self._relative.is_empty():
+            found = self._relative.last()
+            return (found.key, found.value)
+        return None
+
+    def successor(self, name: dns.name.Name) -> Optional[Tuple[dns.name.Name, Any]]:
+        """Find the name in the trie which is immediately after *name* in
+        DNSSEC canonical order.  *name* need not be in the trie.
+
+        *name*, a ``dns.name.Name``, the name to find the successor of.
+
+        Returns a ``(key, value)`` tuple, or ``None`` if there is no name
+        after *name*.
+        """
+        (path, _) = self._path(name)
+        # When name's node exists its label is b"", which sorts before all of
+        # its children's labels, so its first child is found.
+        for node, label in reversed(path):
+            labels = node.get_sorted_labels()
+            i = bisect.bisect_right(labels, label)
+            if i < len(labels):
+                found = node.children[labels[i]].first()
+                return (found.key, found.value)
+        if not name.is_absolute() and not self._absolute.is_empty():
+            found = self._absolute.first()
+            return (found.key, found.value)
+        return None
@@ -27,11 +27,13 @@ import random
 import selectors
 import socket
 import struct
+import threading
 import time
 import urllib.parse
-from typing import Any, Dict, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import dns._features
+import dns._lru
 import dns.exception
 import dns.inet
 import dns.message
@@ -788,6 +790,215 @@ def receive_udp(
             return (r, received_time, from_address)
 
 
+class _PooledUDPSocket:
+    """A socket in a ``UDPSocketPool``, shared by the queries to one
+    destination.  Whichever waiting query is not satisfied reads the socket,
+    handing responses for the others to them.
+    """
+
+    def __init__(self, sock: Any):
+        self.sock = sock
+        self.uses = 0
+        self.retired = False
+        self.reading = False
+        self.condition = threading.Condition()
+        # Maps the ids of queries waiting for a response to the query's wire
+        # format question, with the qname lowercased, and the responses
+        # received for it.
+        self.waiters: Dict[bytes, Tuple[bytes, List[Tuple[bytes, float]]]] = {}
+
+    def receive(self, id: bytes, expiration: Optional[float]) -> Tuple[bytes, float]:
+        """Return the next ``(wire, received_time)`` response for the query
+        with *id*.
+        """
+        with self.condition:
+            responses = self.waiters[id][1]
+            while not responses:
+                if not self.reading:
+                    self.reading = True
+                    break
+                self.condition.wait(_remaining(expiration))
+            else:
+                return responses.pop(0)
+        try:
+            while True:
+                (wire, _) = _udp_recv(self.sock, 65535, expiration)
+                received_time = time.time()
+                with self.condition:
+                    waiter = self.waiters.get(wire[:2])
+                    if waiter is None:
+                        # A late or unexpected response.
+                        continue
+                    (question, others) = waiter
+                    # The question must be echoed, though the case of its
+                    # qname may not be.  As the qname is the first name in the
+                    # message, it cannot be compressed.
+                    qname_end = 12 + len(question) - 4
+                    if (
+                        wire[4:6] != b"\x00\x01"
+                        or wire[12:qname_end].lower() + wire[qname_end : qname_end + 4]
+                        != question
+                    ):
+                        continue
+                    others.append((wire, received_time))
+                    if responses:
+                        return responses.pop(0)
+                    self.condition.notify_all()
+        except OSError:
+            # Something is wrong with the socket, so don't use it again.  A
+            # timeout is not an OSError, and does not retire it.
+            self.retired = True
+            raise
+        finally:
+            with self.condition:
+                self.reading = False
+                self.condition.notify_all()
+
+
+class UDPSocketPool:
+    """A pool of UDP sockets which ``dns.query.udp()`` can use instead of
+    making a new socket for each query.
+
+    Queries to the same destination from the same source share a socket,
+    which is connected to the destination so that the kernel discards
+    datagrams from other addresses.  Responses are matched to the waiting
+    queries by their id and question.  Each socket is bound to a random
+    source port chosen by the operating system, and is replaced by a socket
+    with a new port after *max_uses* queries, so that the source port
+    still makes responses hard to spoof.
+
+    A pool is safe to use from multiple threads, and may be used as a context
+    manager, closing its sockets on exit.
+
+    *max_uses*, an ``int``, the number of queries sent on a socket before it
+    is replaced.  The default is 100.
+    """
+
+    def __init__(self, max_uses: int = 100):
+        if max_uses < 1:
+            raise ValueError("max_uses must be at least 1")
+        self.max_uses = max_uses
+        self.lock = threading.Lock()
+        self.sockets: Dict[Tuple, _PooledUDPSocket] = {}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Close the pool's sockets.  Sockets in use are closed when their
+        queries finish.
+        """
+        with self.lock:
+            self.closed = True
+            for pooled in self.sockets.values():
+                self._retire(pooled)
+            self.sockets.clear()
+
+    def _retire(self, pooled: _PooledUDPSocket) -> None:
+        # Called with the pool lock held.
+        with pooled.condition:
+            pooled.retired = True
+            if not pooled.waiters:
+                pooled.sock.close()
+
+    def _acquire(
+        self, af: int, destination: Any, source: Any, id: bytes, question: bytes
+    ) -> _PooledUDPSocket:
+        """Return a socket connected to *destination* where responses to the
+        query with *id* and *question* can be received.
+        """
+        with self.lock:
+            if self.closed:
+                raise ValueError("the pool is closed")
+            pooled = self.sockets.get((destination, source))
+            if pooled is not None and (
+                pooled.retired or pooled.uses >= self.max_uses or id in pooled.waiters
+            ):
+                # Replace the socket rather than let two queries with the
+                # same id wait on it.
+                del self.sockets[(destination, source)]
+                self._retire(pooled)
+                pooled = None
+            if pooled is None:
+                sock = _make_socket(af, socket.SOCK_DGRAM, source)
+                try:
+                    sock.connect(destination)
+                except Exception:
+                    sock.close()
+                    raise
+                pooled = _PooledUDPSocket(sock)
+                self.sockets[(destination, source)] = pooled
+            pooled.uses += 1
+            with pooled.condition:
+                pooled.waiters[id] = (question, [])
+            return pooled
+
+    def _release(
+        self, pooled: _PooledUDPSocket, destination: Any, source: Any, id: bytes
+    ) -> None:
+        with self.lock:
+            with pooled.condition:
+                del pooled.waiters[id]
+                if pooled.retired:
+                    if self.sockets.get((destination, source)) is pooled:
+                        del self.sockets[(destination, source)]
+                    if not pooled.waiters:
+                        pooled.sock.close()
+
+    def _query(
+        self,
+        q: dns.message.Message,
+        wire: bytes,
+        af: int,
+        destination: Any,
+        source: Any,
+        expiration: Optional[float],
+        one_rr_per_rrset: bool,
+        ignore_trailing: bool,
+        raise_on_truncation: bool,
+        ignore_errors: bool,
+    ) -> Tuple[dns.message.Message, float]:
+        id = wire[:2]
+        end = 12
+        while wire[end] != 0:
+            end += wire[end] + 1
+        question = wire[12 : end + 1].lower() + wire[end + 1 : end + 5]
+        pooled = self._acquire(af, destination, source, id, question)
+        try:
+            _udp_send(pooled.sock, wire, None, expiration)
+            while True:
+                (rwire, received_time) = pooled.receive(id, expiration)
+                try:
+                    r = dns.message.from_wire(
+                        rwire,
+                        keyring=q.keyring,
+                        request_mac=q.mac,
+                        one_rr_per_rrset=one_rr_per_rrset,
+                        ignore_trailing=ignore_trailing,
+                        raise_on_truncation=raise_on_truncation,
+                    )
+                except dns.message.Truncated as e:
+                    # As in receive_udp(), only report truncation of what
+                    # seems to be a response.
+                    if ignore_errors and not q.is_response(e.message()):
+                        continue
+                    raise
+                except Exception:
+                    if ignore_errors:
+                        continue
+                    raise
+                if ignore_errors and not q.is_response(r):
+                    continue
+                return (r, received_time)
+        finally:
+            self._release(pooled, destination, source, id)
+
+
 def udp(
     q: dns.message.Message,
     where: str,
@@ -801,6 +1012,7 @@ def udp(
     raise_on_truncation: bool = False,
     sock: Optional[Any] = None,
     ignore_errors: bool = False,
+    pool: Optional[UDPSocketPool] = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via UDP.
 
@@ -841,6 +1053,11 @@ def udp(
     mismatches occur, ignore them and keep listening for a valid response.
     The default is ``False``.
 
+    *pool*, a ``dns.query.UDPSocketPool`` or ``None``.  If not ``None``, and
+    *sock* is ``None``, a socket from the pool is used rather than a new
+    socket.  Responses from unexpected sources are always ignored, as the
+    pool's sockets are connected to their destination.
+
     Returns a ``dns.message.Message``.
     """
 
@@ -849,6 +1066,23 @@ def udp(
         where, port, source, source_port
     )
     (begin_time, expiration) = _compute_times(timeout)
+    if pool is not None and not sock and q.question:
+        (r, received_time) = pool._query(
+            q,
+            wire,
+            af,
+            destination,
+            source,
+            expiration,
+            one_rr_per_rrset,
+            ignore_trailing,
+            raise_on_truncation,
+            ignore_errors,
+        )
+        r.time = received_time - begin_time
+        if not (ignore_errors or q.is_response(r)):
+            raise BadResponse
+        return r
     if sock:
         cm: contextlib.AbstractContextManager = contextlib.nullcontext(sock)
     else:
@@ -1092,6 +1326,342 @@ def _connect(s, address, expiration):
         raise OSError(err, os.strerror(err))
 
 
+class TLSSessionCache(dns._lru.LRUStore[Tuple, List[Any]]):
+    """A cache of TLS sessions, so that a new TLS connection to a server can
+    resume an earlier session rather than make a full handshake, saving a
+    round trip and the public key operations on both ends.
+
+    A session can only be resumed with the ``ssl.SSLContext`` that made it,
+    so the cache also keeps the contexts it makes for servers, which saves
+    making and loading a new context for each connection.  Sessions and
+    contexts are kept by server address and port, server hostname, and the
+    caller's SSL context or *verify* setting.  When the cache is full, the
+    least-recently used server is removed to make space for a new one.
+
+    *max_size*, an ``int``, is the maximum number of servers to keep; it
+    must be greater than 0.  The default is 1000.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        # Maps keys to [context, session] lists.
+        super().__init__(max_size)
+
+    def _get(
+        self,
+        key: Tuple,
+        ssl_context: Optional[ssl.SSLContext],
+        server_hostname: Optional[str],
+        verify: Union[bool, str],
+    ) -> Tuple[ssl.SSLContext, Optional[Any]]:
+        # Return the context to use for a connection for key, and the session
+        # to resume, if any.
+        with self.lock:
+            # Hits and misses are counted by _handshake_done().
+            entry = self._lookup(key, False)
+            if entry is not None:
+                (context, session) = entry
+                if session is not None and session.time + session.timeout < time.time():
+                    entry[1] = session = None
+                return (context, session)
+        if ssl_context is None:
+            ssl_context = _make_dot_ssl_context(server_hostname, verify)
+        with self.lock:
+            # Another thread may have made a context for key meanwhile, and as
+            # its sessions will be stored with it, use it.
+            entry = self._lookup(key, False)
+            if entry is None:
+                entry = [ssl_context, None]
+                self._store(key, entry)
+            return (entry[0], entry[1])
+
+    def _handshake_done(self, s: ssl.SSLSocket) -> None:
+        self._count_handshake(bool(s.session_reused))
+
+    def _count_handshake(self, resumed: bool) -> None:
+        with self.lock:
+            if resumed:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _put(self, key: Tuple, s: ssl.SSLSocket) -> None:
+        # Store the session of s, which should be called once a response has
+        # been read, as with TLS 1.3 sessions are only sent after the
+        # handshake.
+        session = s.session
+        if session is None or (not session.has_ticket and not session.id):
+            return
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None and entry[0] is s.context:
+                entry[1] = session
+
+    def hits(self) -> int:
+        """How many connections have resumed a cached session?"""
+        return super().hits()
+
+    def misses(self) -> int:
+        """How many connections have made a full handshake?"""
+        return super().misses()
+
+    def flush(self) -> None:
+        """Remove all sessions and contexts from the cache."""
+        super().flush()
+
+
+#: The ``dns.query.TLSSessionCache`` used by ``dns.query.tls()`` and
+#: ``dns.asyncquery.tls()`` when neither a session cache nor a connection pool
+#: is given.
+default_tls_session_cache = TLSSessionCache()
+
+
+class _BaseConnectionPool:
+    """The bookkeeping shared by the synchronous and asynchronous connection
+    pools.  Connections are stored by a key identifying the server and how
+    the connection was made.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_server: int = 4,
+        idle_timeout: float = 10.0,
+        max_connections_per_server: Optional[int] = 8,
+    ):
+        if max_idle_per_server < 1:
+            raise ValueError("max_idle_per_server must be at least 1")
+        if max_connections_per_server is not None and max_connections_per_server < 1:
+            raise ValueError("max_connections_per_server must be at least 1")
+        self.max_idle_per_server = max_idle_per_server
+        self.idle_timeout = idle_timeout
+        self.max_connections_per_server = max_connections_per_server
+        self.lock = threading.Lock()
+        # Notified when a connection is returned to the pool or closed.
+        self.available = threading.Condition(self.lock)
+        # Maps keys to lists of (connection, idle_since) tuples, least recently
+        # used first.
+        self.idle: Dict[Tuple, List[Tuple[Any, float]]] = {}
+        # Maps keys to the number of connections taken from the pool, or being
+        # made for it, which have not been given back or released.
+        self.in_use: Dict[Tuple, int] = {}
+        self.closed = False
+        self.session_cache = TLSSessionCache()
+        self.pid = os.getpid()
+
+    def _forget_if_forked(self) -> None:
+        # Called with the lock held.  After a fork the idle connections are
+        # shared with the parent, so the child forgets them without closing
+        # them.
+        pid = os.getpid()
+        if pid != self.pid:
+            self.pid = pid
+            self.idle.clear()
+            self.in_use.clear()
+
+    def _take(self, key: Tuple) -> Tuple[Optional[Any], List[Any], bool]:
+        with self.lock:
+            return self._take_locked(key)
+
+    def _take_locked(self, key: Tuple) -> Tuple[Optional[Any], List[Any], bool]:
+        # Take a connection for key.  Returns the most recently used idle
+        # connection, or None, a list of connections which have been idle too
+        # long to be used, and whether a connection was taken.  If it was, the
+        # caller uses the idle connection, or makes a new one if there is none,
+        # and must later call _give() or _release().  If not, the server has
+        # max_connections_per_server connections in use, and the caller must
+        # wait for one to be given back or released.
+        now = time.time()
+        self._forget_if_forked()
+        stale: List[Any] = []
+        connections = self.idle.get(key)
+        if connections:
+            (connection, idle_since) = connections.pop()
+            if now - idle_since <= self.idle_timeout:
+                self.in_use[key] = self.in_use.get(key, 0) + 1
+                return (connection, [], True)
+            # The others have been idle even longer.
+            stale = [connection] + [c for c, _ in connections]
+            del self.idle[key]
+        in_use = self.in_use.get(key, 0)
+        if (
+            self.max_connections_per_server is not None
+            and in_use >= self.max_connections_per_server
+        ):
+            return (None, stale, False)
+        self.in_use[key] = in_use + 1
+        return (None, stale, True)
+
+    def _release_locked(self, key: Tuple) -> None:
+        count = self.in_use.get(key, 0) - 1
+        if count > 0:
+            self.in_use[key] = count
+        else:
+            self.in_use.pop(key, None)
+        self.available.notify()
+
+    def _release(self, key: Tuple) -> None:
+        # A connection taken for key has been closed, or could not be made.
+        with self.lock:
+            self._forget_if_forked()
+            self._release_locked(key)
+
+    def _give(self, key: Tuple, connection: Any) -> List[Any]:
+        # Return connection to the pool, returning a list of connections to
+        # be closed.
+        now = time.time()
+        with self.lock:
+            self._forget_if_forked()
+            self._release_locked(key)
+            if self.closed:
+                return [connection]
+            connections = self.idle.setdefault(key, [])
+            stale = []
+            while connections and (
+                len(connections) >= self.max_idle_per_server
+                or now - connections[0][1] > self.idle_timeout
+            ):
+                stale.append(connections.pop(0)[0])
+            connections.append((connection, now))
+            return stale
+
+    def _take_all(self) -> List[Any]:
+        with self.lock:
+            self.closed = True
+            connections = [c for cs in self.idle.values() for c, _ in cs]
+            self.idle.clear()
+            return connections
+
+
+def _is_idle(sock: Any) -> bool:
+    # Is the idle socket still open with nothing unexpected to read?  A TLS
+    # socket may have read only session tickets, which is fine.
+    try:
+        sock.recv(1)
+    except (BlockingIOError, ssl.SSLWantReadError):
+        return True
+    except OSError:
+        pass
+    return False
+
+
+class ConnectionPool(_BaseConnectionPool):
+    """A pool of open TCP and TLS connections which ``dns.query.tcp()`` and
+    ``dns.query.tls()`` can reuse for later queries to the same server, as
+    RFC 7766 recommends, avoiding a TCP and TLS handshake for each query.
+
+    Connections are kept by server address and port, source, and TLS
+    parameters.  A connection which the server has closed or reset is
+    discarded, and if that is found when a query is sent on it, the query
+    is retried once on a new connection.
+
+    A pool is safe to use from multiple threads, and may be used as a context
+    manager, closing its connections on exit.  Idle connections which have
+    timed out are only closed when the pool is next used, so call
+    ``close()`` when a pool is no longer needed.  After a fork, the child
+    does not use the connections the pool held before the fork.
+
+    *max_idle_per_server*, an ``int``, the maximum number of idle connections
+    kept for each server.  The default is 4.
+
+    *idle_timeout*, a ``float``, the number of seconds an idle connection is
+    kept.  The default is 10, which is less than the time most servers keep
+    an idle connection open.
+
+    *max_connections_per_server*, an ``int`` or ``None``, the maximum number
+    of connections to each server, idle or in use, made for the pool.  When
+    it is reached, a query waits for a connection to be returned to the pool
+    or closed, and raises ``dns.exception.Timeout`` if its timeout expires
+    first.  If ``None``, there is no limit.  The default is 8.
+
+    The pool's ``session_cache`` attribute is a ``dns.query.TLSSessionCache``
+    used for new TLS connections made for the pool, unless another one is
+    given to ``dns.query.tls()``.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Close the pool's idle connections.  Connections in use are closed
+        when their queries finish.
+        """
+        for sock in self._take_all():
+            sock.close()
+
+    def _take_or_wait(self, key: Tuple, expiration: Optional[float]) -> Optional[Any]:
+        stale: List[Any] = []
+        try:
+            with self.lock:
+                while True:
+                    (s, more_stale, taken) = self._take_locked(key)
+                    stale.extend(more_stale)
+                    if taken:
+                        return s
+                    self.available.wait(_remaining(expiration))
+        finally:
+            for sock in stale:
+                sock.close()
+
+    def _discard(self, key: Tuple, s: Any) -> None:
+        s.close()
+        self._release(key)
+
+    def _query(
+        self,
+        key: Tuple,
+        connect: Callable[[], Any],
+        q: dns.message.Message,
+        wire: bytes,
+        expiration: Optional[float],
+        one_rr_per_rrset: bool,
+        ignore_trailing: bool,
+        on_response: Optional[Callable[[Any], None]] = None,
+    ) -> Tuple[dns.message.Message, float]:
+        while True:
+            s = self._take_or_wait(key, expiration)
+            if s is not None and not _is_idle(s):
+                self._discard(key, s)
+                continue
+            reused = s is not None
+            if s is None:
+                try:
+                    s = connect()
+                except BaseException:
+                    self._release(key)
+                    raise
+            try:
+                send_tcp(s, wire, expiration)
+                (r, received_time) = receive_tcp(
+                    s, expiration, one_rr_per_rrset, q.keyring, q.mac, ignore_trailing
+                )
+            except dns.exception.DNSException:
+                # A timeout, or a bad response, which leaves the connection
+                # in an unknown state.
+                self._discard(key, s)
+                raise
+            except Exception:
+                self._discard(key, s)
+                if reused:
+                    # The server probably closed the connection after we
+                    # checked it, so try again on a new one.
+                    continue
+                raise
+            except BaseException:
+                self._discard(key, s)
+                raise
+            if not q.is_response(r):
+                self._discard(key, s)
+                raise BadResponse
+            if on_response is not None and not reused:
+                on_response(s)
+            for sock in self._give(key, s):
+                sock.close()
+            return (r, received_time)
+
+
 def tcp(
     q: dns.message.Message,
     where: str,
@@ -1102,6 +1672,7 @@ def tcp(
     one_rr_per_rrset: bool = False,
     ignore_trailing: bool = False,
     sock: Optional[Any] = None,
+    pool: Optional[ConnectionPool] = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TCP.
 
@@ -1132,11 +1703,40 @@ def tcp(
     if a socket is provided, it must be a nonblocking connected stream
     socket, and *where*, *port*, *source* and *source_port* are ignored.
 
+    *pool*, a ``dns.query.ConnectionPool`` or ``None``.  If not ``None``, and
+    *sock* is ``None``, an open connection from the pool is used if there is
+    one, and the connection is returned to the pool afterwards.
+
     Returns a ``dns.message.Message``.
     """
 
     wire = q.to_wire()
     (begin_time, expiration) = _compute_times(timeout)
+    if pool is not None and not sock:
+        (af, destination, source) = _destination_and_source(
+            where, port, source, source_port
+        )
+
+        def connect():
+            s = _make_socket(af, socket.SOCK_STREAM, source)
+            try:
+                _connect(s, destination, expiration)
+            except Exception:
+                s.close()
+                raise
+            return s
+
+        (r, received_time) = pool._query(
+            ("tcp", destination, source),
+            connect,
+            q,
+            wire,
+            expiration,
+            one_rr_per_rrset,
+            ignore_trailing,
+        )
+        r.time = received_time - begin_time
+        return r
     if sock:
         cm: contextlib.AbstractContextManager = contextlib.nullcontext(sock)
     else:
@@ -1160,6 +1760,127 @@ def tcp(
     )
 
 
+def _pipeline_ids(queries: List[dns.message.Message]) -> Dict[int, int]:
+    # Map the ids of queries to be sent on one connection to their indices.
+    ids: Dict[int, int] = {}
+    for i, q in enumerate(queries):
+        if q.id in ids:
+            raise ValueError("pipelined queries must have distinct ids")
+        ids[q.id] = i
+    return ids
+
+
+def _pipeline_response(
+    queries: List[dns.message.Message],
+    ids: Dict[int, int],
+    wire: bytes,
+    received_time: float,
+    begin_time: float,
+    one_rr_per_rrset: bool,
+    ignore_trailing: bool,
+) -> Tuple[int, dns.message.Message]:
+    # Match a response read from a pipelined connection to its query, returning
+    # the index of the query and the response.
+    if len(wire) < 12:
+        raise dns.message.ShortHeader
+    # Each id is only expected once, so a duplicate response is bad too.
+    i = ids.pop(struct.unpack("!H", wire[:2])[0], None)
+    if i is None:
+        raise BadResponse
+    q = queries[i]
+    r = dns.message.from_wire(
+        wire,
+        keyring=q.keyring,
+        request_mac=q.mac,
+        one_rr_per_rrset=one_rr_per_rrset,
+        ignore_trailing=ignore_trailing,
+    )
+    r.time = received_time - begin_time
+    if not q.is_response(r):
+        raise BadResponse
+    return (i, r)
+
+
+def pipelined_tcp(
+    queries: List[dns.message.Message],
+    where: str,
+    timeout: Optional[float] = None,
+    port: int = 53,
+    source: Optional[str] = None,
+    source_port: int = 0,
+    one_rr_per_rrset: bool = False,
+    ignore_trailing: bool = False,
+    sock: Optional[Any] = None,
+    window: int = 32,
+) -> List[dns.message.Message]:
+    """Return the responses obtained after sending queries via one TCP
+    connection, without waiting for each response before sending the next
+    query.
+
+    As RFC 7766 allows, the server may answer the queries in any order, and
+    responses are matched to the queries by their id.
+
+    *queries*, a list of ``dns.message.Message``, the queries to send.  They
+    must have distinct ids.
+
+    *timeout*, a ``float`` or ``None``, the number of seconds to wait before
+    the queries time out.  This is the time allowed for all of the queries,
+    not for each one.  If ``None``, the default, wait forever.
+
+    *window*, an ``int``, the maximum number of queries sent but not yet
+    answered.  The default is 32.  Limiting it keeps the server from blocking
+    on a connection which is not being read.
+
+    See :py:func:`dns.query.tcp()` for the documentation of the other
+    parameters.
+
+    Raises ``ValueError`` if queries have the same id, and
+    ``dns.query.BadResponse`` if a response does not match a query.
+
+    Returns a list of ``dns.message.Message``, the responses in the order of
+    *queries*.
+    """
+
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    queries = list(queries)
+    ids = _pipeline_ids(queries)
+    wires = [q.to_wire(prepend_length=True) for q in queries]
+    responses: List[Any] = [None] * len(queries)
+    (begin_time, expiration) = _compute_times(timeout)
+    if sock:
+        cm: contextlib.AbstractContextManager = contextlib.nullcontext(sock)
+    else:
+        (af, destination, source) = _destination_and_source(
+            where, port, source, source_port
+        )
+        cm = _make_socket(af, socket.SOCK_STREAM, source)
+    with cm as s:
+        if not sock:
+            _connect(s, destination, expiration)
+        sent = min(window, len(wires))
+        _net_write(s, b"".join(wires[:sent]), expiration)
+        for _ in range(len(wires)):
+            ldata = _net_read(s, 2, expiration)
+            (l,) = struct.unpack("!H", ldata)
+            wire = _net_read(s, l, expiration)
+            received_time = time.time()
+            (i, r) = _pipeline_response(
+                queries,
+                ids,
+                wire,
+                received_time,
+                begin_time,
+                one_rr_per_rrset,
+                ignore_trailing,
+            )
+            responses[i] = r
+            if sent < len(wires):
+                _net_write(s, wires[sent], expiration)
+                sent += 1
+    return responses
+
+
 def _tls_handshake(s, expiration):
     while True:
         try:
@@ -1206,6 +1927,8 @@ def tls(
     ssl_context: Optional[ssl.SSLContext] = None,
     server_hostname: Optional[str] = None,
     verify: Union[bool, str] = True,
+    pool: Optional[ConnectionPool] = None,
+    session_cache: Optional[TLSSessionCache] = None,
 ) -> dns.message.Message:
     """Return the response obtained after sending a query via TLS.
 
@@ -1250,6 +1973,17 @@ def tls(
     verification is done; if a `str` then it specifies the path to a certificate file or
     directory which will be used for verification.
 
+    *pool*, a ``dns.query.ConnectionPool`` or ``None``.  If not ``None``, and
+    *sock* is ``None``, an open connection from the pool is used if there is
+    one, and the connection is returned to the pool afterwards.
+
+    *session_cache*, a ``dns.query.TLSSessionCache`` or ``None``, the cache
+    of TLS sessions and SSL contexts to use.  A new connection resumes the
+    server's cached TLS session if there is one, and its session is cached
+    for later connections.  If ``None``, the pool's session cache is used if
+    *pool* is not ``None``, and otherwise
+    ``dns.query.default_tls_session_cache``.
+
     Returns a ``dns.message.Message``.
 
     """
@@ -1275,18 +2009,57 @@ def tls(
     (af, destination, source) = _destination_and_source(
         where, port, source, source_port
     )
-    if ssl_context is None and not sock:
-        ssl_context = _make_dot_ssl_context(server_hostname, verify)
+    if session_cache is None:
+        if pool is not None:
+            session_cache = pool.session_cache
+        else:
+            session_cache = default_tls_session_cache
+    cache = session_cache
+    # Connections made with a caller's context may differ from those made
+    # with a default one, so the context is part of the key.
+    key = (
+        destination,
+        server_hostname,
+        ssl_context if ssl_context is not None else verify,
+    )
 
-    with _make_socket(
-        af,
-        socket.SOCK_STREAM,
-        source,
-        ssl_context=ssl_context,
-        server_hostname=server_hostname,
-    ) as s:
-        _connect(s, destination, expiration)
-        _tls_handshake(s, expiration)
+    def connect():
+        (context, session) = cache._get(key, ssl_context, server_hostname, verify)
+        s = _make_socket(
+            af,
+            socket.SOCK_STREAM,
+            source,
+            ssl_context=context,
+            server_hostname=server_hostname,
+        )
+        try:
+            if session is not None:
+                s.session = session
+            _connect(s, destination, expiration)
+            _tls_handshake(s, expiration)
+        except Exception:
+            s.close()
+            raise
+        cache._handshake_done(s)
+        return s
+
+    def on_response(s):
+        cache._put(key, s)
+
+    if pool is not None:
+        (r, received_time) = pool._query(
+            ("tls", source) + key,
+            connect,
+            q,
+            wire,
+            expiration,
+            one_rr_per_rrset,
+            ignore_trailing,
+            on_response,
+        )
+        r.time = received_time - begin_time
+        return r
+    with connect() as s:
         send_tcp(s, wire, expiration)
         (r, received_time) = receive_tcp(
             s, expiration, one_rr_per_rrset, q.keyring, q.mac, ignore_trailing
@@ -1294,6 +2067,7 @@ def tls(
         r.time = received_time - begin_time
         if not q.is_response(r):
             raise BadResponse
+        on_response(s)
         return r
     assert (
         False  # help mypy figure out we can't get here  lgtm[py/unreachable-statement]
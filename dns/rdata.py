@@ -130,8 +130,16 @@ _constify = dns.immutable.constify
 class Rdata:
     """Base class for all DNS rdata types."""
 
-    __slots__ = ["rdclass", "rdtype", "rdcomment"]
+    __slots__ = ["rdclass", "rdtype", "rdcomment", "_digestable"]
 
+    rdclass: dns.rdataclass.RdataClass
+    rdtype: dns.rdatatype.RdataType
+    rdcomment: Optional[str]
+    _digestable: Optional[Tuple[bytes, bool]]
+
+    # Rdata are made in great numbers, so their constructors set attributes
+    # directly rather than paying for the immutable guard.
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype):
         """Initialize an rdata.
 
@@ -140,9 +148,36 @@ class Rdata:
         *rdtype*, an ``int`` is the rdatatype of the Rdata.
         """
 
-        self.rdclass = self._as_rdataclass(rdclass)
-        self.rdtype = self._as_rdatatype(rdtype)
-        self.rdcomment = None
+        object.__setattr__(self, "rdclass", self._as_rdataclass(rdclass))
+        object.__setattr__(self, "rdtype", self._as_rdatatype(rdtype))
+        object.__setattr__(self, "rdcomment", None)
+        # The cached result of _get_digestable(), if any.
+        object.__setattr__(self, "_digestable", None)
+
+    @classmethod
+    def _from_trusted(cls, rdclass, rdtype, **fields):
+        """Make an rdata from field values which are already known to be
+        valid and of the right types, without running them through the
+        checking and conversion done by the constructor.
+
+        This is for rdata read from wire format, where the format itself
+        guarantees the invariants the constructor would otherwise check,
+        e.g. that a 16-bit field fits in 16 bits.  Each keyword argument
+        names a slot of the class, and all of the class's own slots must be
+        given.
+        """
+        if not isinstance(rdclass, dns.rdataclass.RdataClass):
+            rdclass = cls._as_rdataclass(rdclass)
+        if not isinstance(rdtype, dns.rdatatype.RdataType):
+            rdtype = cls._as_rdatatype(rdtype)
+        rdata = object.__new__(cls)
+        object.__setattr__(rdata, "rdclass", rdclass)
+        object.__setattr__(rdata, "rdtype", rdtype)
+        object.__setattr__(rdata, "rdcomment", None)
+        object.__setattr__(rdata, "_digestable", None)
+        for slot, value in fields.items():
+            object.__setattr__(rdata, slot, value)
+        return rdata
 
     def _get_all_slots(self):
         return itertools.chain.from_iterable(
@@ -160,7 +195,10 @@ class Rdata:
         # attributes, and would compare badly.
         state = {}
         for slot in self._get_all_slots():
-            state[slot] = getattr(self, slot)
+            # The cached digestable form is not pickled, so that pickles
+            # stay compatible with versions which do not have it.
+            if slot != "_digestable":
+                state[slot] = getattr(self, slot)
         return state
 
     def __setstate__(self, state):
@@ -170,6 +208,7 @@ class Rdata:
             # Pickled rdata from 2.0.x might not have a rdcomment, so add
             # it if needed.
             object.__setattr__(self, "rdcomment", None)
+        object.__setattr__(self, "_digestable", None)
 
     def covers(self) -> dns.rdatatype.RdataType:
         """Return the type a Rdata covers.
@@ -256,6 +295,22 @@ class Rdata:
 
         return self.to_wire(origin=origin, canonicalize=True)
 
+    def _get_digestable(self) -> Tuple[bytes, bool]:
+        """Return the digestable form of the rdata and whether it has any
+        relative names.  If it does, the names are made absolute as if they
+        were relative to the root.
+
+        As rdata are immutable, the result is cached.
+        """
+        digestable = self._digestable
+        if digestable is None:
+            try:
+                digestable = (self.to_digestable(), False)
+            except dns.name.NeedAbsoluteNameOrOrigin:
+                digestable = (self.to_digestable(dns.name.root), True)
+            object.__setattr__(self, "_digestable", digestable)
+        return digestable
+
     def __repr__(self):
         covers = self.covers()
         if covers == dns.rdatatype.NONE:
@@ -292,20 +347,8 @@ class Rdata:
             In the future, all ordering comparisons for rdata with
             relative names will be disallowed.
         """
-        try:
-            our = self.to_digestable()
-            our_relative = False
-        except dns.name.NeedAbsoluteNameOrOrigin:
-            if _allow_relative_comparisons:
-                our = self.to_digestable(dns.name.root)
-            our_relative = True
-        try:
-            their = other.to_digestable()
-            their_relative = False
-        except dns.name.NeedAbsoluteNameOrOrigin:
-            if _allow_relative_comparisons:
-                their = other.to_digestable(dns.name.root)
-            their_relative = True
+        (our, our_relative) = self._get_digestable()
+        (their, their_relative) = other._get_digestable()
         if _allow_relative_comparisons:
             if our_relative != their_relative:
                 # For the purpose of comparison, all rdata with at least one
@@ -328,18 +371,8 @@ class Rdata:
             return False
         if self.rdclass != other.rdclass or self.rdtype != other.rdtype:
             return False
-        our_relative = False
-        their_relative = False
-        try:
-            our = self.to_digestable()
-        except dns.name.NeedAbsoluteNameOrOrigin:
-            our = self.to_digestable(dns.name.root)
-            our_relative = True
-        try:
-            their = other.to_digestable()
-        except dns.name.NeedAbsoluteNameOrOrigin:
-            their = other.to_digestable(dns.name.root)
-            their_relative = True
+        (our, our_relative) = self._get_digestable()
+        (their, their_relative) = other._get_digestable()
         if our_relative != their_relative:
             return False
         return our == their
@@ -388,7 +421,8 @@ class Rdata:
         return self._cmp(other) > 0
 
     def __hash__(self):
-        return hash(self.to_digestable(dns.name.root))
+        # The digestable form is the same as to_digestable(dns.name.root).
+        return hash(self._get_digestable()[0])
 
     @classmethod
     def from_text(
@@ -604,9 +638,12 @@ class GenericRdata(Rdata):
 
     __slots__ = ["data"]
 
+    data: bytes
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, data):
         super().__init__(rdclass, rdtype)
-        self.data = data
+        object.__setattr__(self, "data", data)
 
     def to_text(
         self,
@@ -638,6 +675,149 @@ class GenericRdata(Rdata):
         return cls(rdclass, rdtype, parser.get_remaining())
 
 
+# The rdata types which may be read as LazyRdata, mapped to the offset of the
+# domain name in their wire format, or to None if they have no domain name.
+# The name, if any, is never compressed, so the wire format of these types
+# can be copied verbatim, and is their DNSSEC canonical form apart from the
+# case of the name.
+_lazy_rdatatypes: Dict[dns.rdatatype.RdataType, Optional[int]] = {
+    dns.rdatatype.CDNSKEY: None,
+    dns.rdatatype.CDS: None,
+    dns.rdatatype.DLV: None,
+    dns.rdatatype.DNSKEY: None,
+    dns.rdatatype.DS: None,
+    dns.rdatatype.NSEC3: None,
+    dns.rdatatype.NSEC3PARAM: None,
+    dns.rdatatype.OPENPGPKEY: None,
+    dns.rdatatype.RRSIG: 18,
+    dns.rdatatype.SMIMEA: None,
+    dns.rdatatype.SPF: None,
+    dns.rdatatype.SSHFP: None,
+    dns.rdatatype.TLSA: None,
+    dns.rdatatype.TXT: None,
+    dns.rdatatype.ZONEMD: None,
+}
+
+
+def _uncompressed_name_end(wire, where):
+    """Return the offset just past the uncompressed name starting at *where* in
+    *wire*, or ``None`` if the name is compressed or malformed.
+    """
+    while where < len(wire):
+        count = wire[where]
+        if count == 0:
+            return where + 1
+        if count >= 64:
+            return None
+        where += count + 1
+    return None
+
+
+@dns.immutable.immutable
+class LazyRdata(Rdata):
+    """Rdata whose decoding is deferred until it is needed.
+
+    A ``LazyRdata`` holds the wire format of an rdata.  Rendering, hashing, and
+    comparing it use the wire format directly; accessing any attribute of the
+    rdata type, converting it to text, or calling ``decode()`` decodes it into
+    an instance of the rdata type's class.  Since the wire format is not
+    checked until it is decoded, errors in it are only raised then.
+
+    Note that a ``LazyRdata`` is not an instance of its rdata type's class,
+    so e.g. ``isinstance(rdata, dns.rdtypes.ANY.RRSIG.RRSIG)`` is ``False``.
+    Code which checks the class of rdata which might be lazy should call
+    ``dns.rdata.decode()`` on it first.
+
+    LazyRdata are made by ``dns.rdata.from_wire_parser()`` and functions built
+    on it, e.g. ``dns.message.from_wire()``, when their *lazy* option is set.
+    """
+
+    __slots__ = ["wire", "_rdata"]
+
+    wire: bytes
+    _rdata: Optional[Rdata]
+
+    @dns.immutable.unguarded_init
+    def __init__(self, rdclass, rdtype, wire):
+        """Initialize a lazy rdata.
+
+        *rdclass*, an ``int`` is the rdataclass of the Rdata.
+
+        *rdtype*, an ``int`` is the rdatatype of the Rdata.
+
+        *wire*, a ``bytes``, the uncompressed wire format of the rdata.
+        """
+        super().__init__(rdclass, rdtype)
+        object.__setattr__(self, "wire", wire)
+        object.__setattr__(self, "_rdata", None)
+
+    def __getattr__(self, name):
+        # This is only called if normal lookup fails, i.e. for the attributes
+        # of the decoded rdata.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.decode(), name)
+
+    def decode(self) -> Rdata:
+        """Decode the rdata.
+
+        Returns an instance of the chosen Rdata subclass.
+        """
+        rdata = self._rdata
+        if rdata is None:
+            rdata = from_wire(self.rdclass, self.rdtype, self.wire, 0, len(self.wire))
+            object.__setattr__(self, "_rdata", rdata)
+        return rdata
+
+    def covers(self) -> dns.rdatatype.RdataType:
+        if self.rdtype == dns.rdatatype.RRSIG:
+            if len(self.wire) < 2:
+                raise dns.exception.FormError("RRSIG rdata is too short")
+            return dns.rdatatype.RdataType.make(int.from_bytes(self.wire[:2], "big"))
+        return dns.rdatatype.NONE
+
+    def to_text(
+        self,
+        origin: Optional[dns.name.Name] = None,
+        relativize: bool = True,
+        **kw: Dict[str, Any],
+    ) -> str:
+        return self.decode().to_text(origin, relativize, **kw)
+
+    def _to_wire(self, file, compress=None, origin=None, canonicalize=False):
+        if canonicalize:
+            file.write(self.to_digestable())
+        else:
+            file.write(self.wire)
+
+    def to_digestable(self, origin: Optional[dns.name.Name] = None) -> bytes:
+        start = _lazy_rdatatypes[self.rdtype]
+        if start is None:
+            return self.wire
+        end = _uncompressed_name_end(self.wire, start)
+        return self.wire[:start] + self.wire[start:end].lower() + self.wire[end:]
+
+    def replace(self, **kwargs: Any) -> Rdata:
+        return self.decode().replace(**kwargs)
+
+    @classmethod
+    def from_wire_parser(cls, rdclass, rdtype, parser, origin=None):
+        return cls(rdclass, rdtype, parser.get_remaining())
+
+
+def decode(rdata: Rdata) -> Rdata:
+    """Return *rdata* decoded if it is a ``dns.rdata.LazyRdata``, and
+    otherwise *rdata* itself.
+
+    *rdata*, a ``dns.rdata.Rdata``, the rdata.
+
+    Returns an instance of the rdata type's class.
+    """
+    if isinstance(rdata, LazyRdata):
+        return rdata.decode()
+    return rdata
+
+
 _rdata_classes: Dict[Tuple[dns.rdataclass.RdataClass, dns.rdatatype.RdataType], Any] = (
     {}
 )
@@ -792,6 +972,7 @@ def from_wire_parser(
     rdtype: Union[dns.rdatatype.RdataType, str],
     parser: dns.wire.Parser,
     origin: Optional[dns.name.Name] = None,
+    lazy: bool = False,
 ) -> Rdata:
     """Build an rdata object from wire format
 
@@ -813,11 +994,26 @@ def from_wire_parser(
     *origin*, a ``dns.name.Name`` (or ``None``).  If not ``None``,
     then names will be relativized to this origin.
 
+    *lazy*, a ``bool``.  If ``True``, and the rdata type's wire format can
+    be used without decoding it, e.g. for DNSKEY, DS, RRSIG, and TXT, a
+    ``dns.rdata.LazyRdata`` is returned.  The default is ``False``.
+
     Returns an instance of the chosen Rdata subclass.
     """
 
     rdclass = dns.rdataclass.RdataClass.make(rdclass)
     rdtype = dns.rdatatype.RdataType.make(rdtype)
+    if lazy and rdtype in _lazy_rdatatypes:
+        start = _lazy_rdatatypes[rdtype]
+        if start is None:
+            return LazyRdata.from_wire_parser(rdclass, rdtype, parser, origin)
+        # The name must be absolute and not compressed for the wire format
+        # to be usable as is.
+        if origin is None:
+            wire = parser.get_remaining()
+            if _uncompressed_name_end(wire, start) is not None:
+                return LazyRdata(rdclass, rdtype, wire)
+            parser.rewind(parser.current - len(wire))
     cls = get_rdata_class(rdclass, rdtype)
     with dns.exception.ExceptionWrapper(dns.exception.FormError):
         return cls.from_wire_parser(rdclass, rdtype, parser, origin)
@@ -857,6 +1053,10 @@ def from_wire(
 
     Returns an instance of the chosen Rdata subclass.
     """
+    if isinstance(wire, str) and wire == "":
+        # An empty str has always been accepted as the wire format of empty
+        # rdata, e.g. a zero length APL.
+        wire = b""
     parser = dns.wire.Parser(wire, current)
     with parser.restrict_to(rdlen):
         return from_wire_parser(rdclass, rdtype, parser, origin)
@@ -23,6 +23,7 @@ import time
 import dns.dnssectypes
 import dns.exception
 import dns.immutable
+import dns.name
 import dns.rdata
 import dns.rdatatype
 
@@ -65,6 +66,17 @@ class RRSIG(dns.rdata.Rdata):
         "signature",
     ]
 
+    type_covered: dns.rdatatype.RdataType
+    algorithm: dns.dnssectypes.Algorithm
+    labels: int
+    original_ttl: int
+    expiration: int
+    inception: int
+    key_tag: int
+    signer: dns.name.Name
+    signature: bytes
+
+    @dns.immutable.unguarded_init
     def __init__(
         self,
         rdclass,
@@ -80,15 +92,15 @@ class RRSIG(dns.rdata.Rdata):
         signature,
     ):
         super().__init__(rdclass, rdtype)
-        self.type_covered = self._as_rdatatype(type_covered)
-        self.algorithm = dns.dnssectypes.Algorithm.make(algorithm)
-        self.labels = self._as_uint8(labels)
-        self.original_ttl = self._as_ttl(original_ttl)
-        self.expiration = self._as_uint32(expiration)
-        self.inception = self._as_uint32(inception)
-        self.key_tag = self._as_uint16(key_tag)
-        self.signer = self._as_name(signer)
-        self.signature = self._as_bytes(signature)
+        object.__setattr__(self, "type_covered", self._as_rdatatype(type_covered))
+        object.__setattr__(self, "algorithm", dns.dnssectypes.Algorithm.make(algorithm))
+        object.__setattr__(self, "labels", self._as_uint8(labels))
+        object.__setattr__(self, "original_ttl", self._as_ttl(original_ttl))
+        object.__setattr__(self, "expiration", self._as_uint32(expiration))
+        object.__setattr__(self, "inception", self._as_uint32(inception))
+        object.__setattr__(self, "key_tag", self._as_uint16(key_tag))
+        object.__setattr__(self, "signer", self._as_name(signer))
+        object.__setattr__(self, "signature", self._as_bytes(signature))
 
     def covers(self):
         return self.type_covered
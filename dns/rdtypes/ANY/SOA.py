@@ -31,17 +31,26 @@ class SOA(dns.rdata.Rdata):
 
     __slots__ = ["mname", "rname", "serial", "refresh", "retry", "expire", "minimum"]
 
+    mname: dns.name.Name
+    rname: dns.name.Name
+    serial: int
+    refresh: int
+    retry: int
+    expire: int
+    minimum: int
+
+    @dns.immutable.unguarded_init
     def __init__(
         self, rdclass, rdtype, mname, rname, serial, refresh, retry, expire, minimum
     ):
         super().__init__(rdclass, rdtype)
-        self.mname = self._as_name(mname)
-        self.rname = self._as_name(rname)
-        self.serial = self._as_uint32(serial)
-        self.refresh = self._as_ttl(refresh)
-        self.retry = self._as_ttl(retry)
-        self.expire = self._as_ttl(expire)
-        self.minimum = self._as_ttl(minimum)
+        object.__setattr__(self, "mname", self._as_name(mname))
+        object.__setattr__(self, "rname", self._as_name(rname))
+        object.__setattr__(self, "serial", self._as_uint32(serial))
+        object.__setattr__(self, "refresh", self._as_ttl(refresh))
+        object.__setattr__(self, "retry", self._as_ttl(retry))
+        object.__setattr__(self, "expire", self._as_ttl(expire))
+        object.__setattr__(self, "minimum", self._as_ttl(minimum))
 
     def to_text(self, origin=None, relativize=True, **kw):
         mname = self.mname.choose_relativity(origin, relativize)
@@ -83,4 +92,15 @@ class SOA(dns.rdata.Rdata):
     def from_wire_parser(cls, rdclass, rdtype, parser, origin=None):
         mname = parser.get_name(origin)
         rname = parser.get_name(origin)
-        return cls(rdclass, rdtype, mname, rname, *parser.get_struct("!IIIII"))
+        (serial, refresh, retry, expire, minimum) = parser.get_struct("!IIIII")
+        return cls._from_trusted(
+            rdclass,
+            rdtype,
+            mname=mname,
+            rname=rname,
+            serial=serial,
+            refresh=refresh,
+            retry=retry,
+            expire=expire,
+            minimum=minimum,
+        )
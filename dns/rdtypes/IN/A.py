@@ -28,9 +28,12 @@ class A(dns.rdata.Rdata):
 
     __slots__ = ["address"]
 
+    address: str
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, address):
         super().__init__(rdclass, rdtype)
-        self.address = self._as_ipv4_address(address)
+        object.__setattr__(self, "address", self._as_ipv4_address(address))
 
     def to_text(self, origin=None, relativize=True, **kw):
         return self.address
@@ -48,4 +51,4 @@ class A(dns.rdata.Rdata):
     @classmethod
     def from_wire_parser(cls, rdclass, rdtype, parser, origin=None):
         address = parser.get_remaining()
-        return cls(rdclass, rdtype, address)
+        return cls._from_trusted(rdclass, rdtype, address=dns.ipv4.inet_ntoa(address))
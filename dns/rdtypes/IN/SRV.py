@@ -32,12 +32,18 @@ class SRV(dns.rdata.Rdata):
 
     __slots__ = ["priority", "weight", "port", "target"]
 
+    priority: int
+    weight: int
+    port: int
+    target: dns.name.Name
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, priority, weight, port, target):
         super().__init__(rdclass, rdtype)
-        self.priority = self._as_uint16(priority)
-        self.weight = self._as_uint16(weight)
-        self.port = self._as_uint16(port)
-        self.target = self._as_name(target)
+        object.__setattr__(self, "priority", self._as_uint16(priority))
+        object.__setattr__(self, "weight", self._as_uint16(weight))
+        object.__setattr__(self, "port", self._as_uint16(port))
+        object.__setattr__(self, "target", self._as_name(target))
 
     def to_text(self, origin=None, relativize=True, **kw):
         target = self.target.choose_relativity(origin, relativize)
@@ -40,12 +40,18 @@ class DNSKEYBase(dns.rdata.Rdata):
 
     __slots__ = ["flags", "protocol", "algorithm", "key"]
 
+    flags: Flag
+    protocol: int
+    algorithm: dns.dnssectypes.Algorithm
+    key: bytes
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, flags, protocol, algorithm, key):
         super().__init__(rdclass, rdtype)
-        self.flags = Flag(self._as_uint16(flags))
-        self.protocol = self._as_uint8(protocol)
-        self.algorithm = dns.dnssectypes.Algorithm.make(algorithm)
-        self.key = self._as_bytes(key)
+        object.__setattr__(self, "flags", Flag(self._as_uint16(flags)))
+        object.__setattr__(self, "protocol", self._as_uint8(protocol))
+        object.__setattr__(self, "algorithm", dns.dnssectypes.Algorithm.make(algorithm))
+        object.__setattr__(self, "key", self._as_bytes(key))
 
     def to_text(self, origin=None, relativize=True, **kw):
         return "%d %d %d %s" % (
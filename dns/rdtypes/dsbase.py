@@ -30,6 +30,11 @@ class DSBase(dns.rdata.Rdata):
 
     __slots__ = ["key_tag", "algorithm", "digest_type", "digest"]
 
+    key_tag: int
+    algorithm: dns.dnssectypes.Algorithm
+    digest_type: dns.dnssectypes.DSDigest
+    digest: bytes
+
     # Digest types registry:
     # https://www.iana.org/assignments/ds-rr-types/ds-rr-types.xhtml
     _digest_length_by_type = {
@@ -39,12 +44,17 @@ class DSBase(dns.rdata.Rdata):
         4: 48,  # SHA-384, RFC 6605 Sec. 2
     }
 
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, key_tag, algorithm, digest_type, digest):
         super().__init__(rdclass, rdtype)
-        self.key_tag = self._as_uint16(key_tag)
-        self.algorithm = dns.dnssectypes.Algorithm.make(algorithm)
-        self.digest_type = dns.dnssectypes.DSDigest.make(self._as_uint8(digest_type))
-        self.digest = self._as_bytes(digest)
+        object.__setattr__(self, "key_tag", self._as_uint16(key_tag))
+        object.__setattr__(self, "algorithm", dns.dnssectypes.Algorithm.make(algorithm))
+        object.__setattr__(
+            self,
+            "digest_type",
+            dns.dnssectypes.DSDigest.make(self._as_uint8(digest_type)),
+        )
+        object.__setattr__(self, "digest", self._as_bytes(digest))
         try:
             if len(self.digest) != self._digest_length_by_type[self.digest_type]:
                 raise ValueError("digest length inconsistent with digest type")
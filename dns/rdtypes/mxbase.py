@@ -32,10 +32,14 @@ class MXBase(dns.rdata.Rdata):
 
     __slots__ = ["preference", "exchange"]
 
+    preference: int
+    exchange: dns.name.Name
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, preference, exchange):
         super().__init__(rdclass, rdtype)
-        self.preference = self._as_uint16(preference)
-        self.exchange = self._as_name(exchange)
+        object.__setattr__(self, "preference", self._as_uint16(preference))
+        object.__setattr__(self, "exchange", self._as_name(exchange))
 
     def to_text(self, origin=None, relativize=True, **kw):
         exchange = self.exchange.choose_relativity(origin, relativize)
@@ -58,7 +62,9 @@ class MXBase(dns.rdata.Rdata):
     def from_wire_parser(cls, rdclass, rdtype, parser, origin=None):
         preference = parser.get_uint16()
         exchange = parser.get_name(origin)
-        return cls(rdclass, rdtype, preference, exchange)
+        return cls._from_trusted(
+            rdclass, rdtype, preference=preference, exchange=exchange
+        )
 
     def _processing_priority(self):
         return self.preference
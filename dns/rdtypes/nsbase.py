@@ -29,9 +29,12 @@ class NSBase(dns.rdata.Rdata):
 
     __slots__ = ["target"]
 
+    target: dns.name.Name
+
+    @dns.immutable.unguarded_init
     def __init__(self, rdclass, rdtype, target):
         super().__init__(rdclass, rdtype)
-        self.target = self._as_name(target)
+        object.__setattr__(self, "target", self._as_name(target))
 
     def to_text(self, origin=None, relativize=True, **kw):
         target = self.target.choose_relativity(origin, relativize)
@@ -50,7 +53,7 @@ class NSBase(dns.rdata.Rdata):
     @classmethod
     def from_wire_parser(cls, rdclass, rdtype, parser, origin=None):
         target = parser.get_name(origin)
-        return cls(rdclass, rdtype, target)
+        return cls._from_trusted(rdclass, rdtype, target=target)
 
 
 @dns.immutable.immutable
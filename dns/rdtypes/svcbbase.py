@@ -99,7 +99,7 @@ def _escapify(qstring):
 
 def _unescape(value):
     if value == "":
-        return value
+        return b""
     unescaped = b""
     l = len(value)
     i = 0
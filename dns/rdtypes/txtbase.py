@@ -32,6 +32,9 @@ class TXTBase(dns.rdata.Rdata):
 
     __slots__ = ["strings"]
 
+    strings: Tuple[bytes]
+
+    @dns.immutable.unguarded_init
     def __init__(
         self,
         rdclass: dns.rdataclass.RdataClass,
@@ -47,8 +50,10 @@ class TXTBase(dns.rdata.Rdata):
         *strings*, a tuple of ``bytes``
         """
         super().__init__(rdclass, rdtype)
-        self.strings: Tuple[bytes] = self._as_tuple(
-            strings, lambda x: self._as_bytes(x, True, 255)
+        object.__setattr__(
+            self,
+            "strings",
+            self._as_tuple(strings, lambda x: self._as_bytes(x, True, 255)),
         )
         if len(self.strings) == 0:
             raise ValueError("the list of strings must not be empty")
@@ -103,4 +108,8 @@ class TXTBase(dns.rdata.Rdata):
         while parser.remaining() > 0:
             s = parser.get_counted_bytes()
             strings.append(s)
-        return cls(rdclass, rdtype, strings)
+        if len(strings) == 0:
+            raise ValueError("the list of strings must not be empty")
+        # Counted strings can't be longer than 255 bytes, so only emptiness
+        # needs checking.
+        return cls._from_trusted(rdclass, rdtype, strings=tuple(strings))
@@ -22,8 +22,10 @@ import io
 import random
 import struct
 import time
+from typing import Any
 
 import dns.exception
+import dns.name
 import dns.tsig
 
 QUESTION = 0
@@ -86,7 +88,7 @@ class Renderer:
 
     origin: the origin to use when rendering relative names
 
-    compress: the compression table
+    compress: the compression table, a ``dns.name.WireCompressTable``
 
     section: an int, the section currently being rendered
 
@@ -106,7 +108,7 @@ class Renderer:
         self.flags = flags
         self.max_size = max_size
         self.origin = origin
-        self.compress = {}
+        self.compress = dns.name.WireCompressTable()
         self.section = QUESTION
         self.counts = [0, 0, 0, 0]
         self.output.write(b"\x00" * 12)
@@ -331,6 +333,26 @@ class Renderer:
 
         return self.output.getvalue()
 
+    def get_wire_into(self, buffer: Any, offset: int = 0) -> int:
+        """Copy the wire format message into *buffer*, a writable buffer such
+        as a ``bytearray`` or ``memoryview``, starting at *offset*.
+
+        Unlike ``get_wire()``, this does not make a new ``bytes``, so a caller
+        can render many messages into one reusable buffer.
+
+        Raises ``dns.exception.TooBig`` if the message does not fit.
+
+        Returns an ``int``, the length of the message.
+        """
+
+        target = memoryview(buffer).cast("B")
+        with self.output.getbuffer() as wire:
+            length = len(wire)
+            if offset + length > len(target):
+                raise dns.exception.TooBig
+            target[offset : offset + length] = wire
+        return length
+
     def reserve(self, size: int) -> None:
         """Reserve *size* bytes."""
         if size < 0:
@@ -920,6 +920,7 @@ class BaseResolver:
     retry_servfail: bool
     rotate: bool
     ndots: Optional[int]
+    connection_pool: Optional[Any]
     _nameservers: Sequence[Union[str, dns.nameserver.Nameserver]]
 
     def __init__(
@@ -968,6 +969,7 @@ class BaseResolver:
         self.retry_servfail = False
         self.rotate = False
         self.ndots = None
+        self.connection_pool = None
 
     def read_resolv_conf(self, f: Any) -> None:
         """Process *f* as a file in the /etc/resolv.conf format.  If f is
@@ -1232,7 +1234,41 @@ class BaseResolver:
 
 
 class Resolver(BaseResolver):
-    """DNS stub resolver."""
+    """DNS stub resolver.
+
+    A resolver keeps TCP and DoT connections to its nameservers open for
+    later queries in its *connection_pool*.  Call ``close()``, or use the
+    resolver as a context manager, to close them when the resolver is no
+    longer needed.
+    """
+
+    connection_pool: Optional[dns.query.ConnectionPool]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def reset(self) -> None:
+        """Reset all resolver configuration to the defaults."""
+
+        # The first reset() is made by __init__(), when there is no pool yet.
+        self.close()
+        super().reset()
+        self.connection_pool = dns.query.ConnectionPool()
+
+    def close(self) -> None:
+        """Close the idle connections in the resolver's connection pool.
+
+        The resolver may still be used afterwards, but makes a new connection
+        for each TCP or DoT query unless a new pool is set.
+        """
+
+        pool = getattr(self, "connection_pool", None)
+        if pool is not None:
+            pool.close()
 
     def resolve(
         self,
@@ -1317,6 +1353,12 @@ class Resolver(BaseResolver):
                 if backoff:
                     time.sleep(backoff)
                 timeout = self._compute_timeout(start, lifetime, resolution.errors)
+                kwargs: Dict[str, Any] = {}
+                if (
+                    self.connection_pool is not None
+                    and nameserver.uses_connection_pool()
+                ):
+                    kwargs["connection_pool"] = self.connection_pool
                 try:
                     response = nameserver.query(
                         request,
@@ -1324,6 +1366,7 @@ class Resolver(BaseResolver):
                         source=source,
                         source_port=source_port,
                         max_size=tcp,
+                        **kwargs,
                     )
                 except Exception as ex:
                     (_, done) = resolution.query_result(None, ex)
@@ -0,0 +1,202 @@
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+"""DNS Response Wire Format Caching."""
+
+import struct
+from typing import Optional, Tuple
+
+import dns._lru
+import dns.exception
+import dns.flags
+import dns.message
+import dns.name
+import dns.opcode
+import dns.rdatatype
+import dns.versioned
+import dns.wire
+
+# The query flags which affect responses.  RD and CD are copied into
+# responses, and AD asks for the AD flag to be set in them (RFC 6840).
+_KEY_FLAGS = dns.flags.RD | dns.flags.CD | dns.flags.AD
+
+# The qname, qtype, qclass, key flags, EDNS version, EDNS payload, and EDNS
+# flags of a query.
+_Key = Tuple[dns.name.Name, int, int, int, int, int, int]
+
+
+class _Entry:
+    __slots__ = ["wire", "zone", "version_id"]
+
+    def __init__(
+        self,
+        wire: bytes,
+        zone: Optional[dns.versioned.Zone],
+        version_id: Optional[int],
+    ):
+        self.wire = wire
+        self.zone = zone
+        self.version_id = version_id
+
+
+def _query_key(query: dns.wire.WireType) -> Optional[Tuple[_Key, int]]:
+    # Return the cache key for the wire format query and the offset of the
+    # end of its qname, or None if the query can't use the cache.
+    try:
+        (_, flags, opcode, _, counts, question) = dns.message.peek(query)
+    except dns.exception.FormError:
+        return None
+    if (
+        flags & dns.flags.QR
+        or opcode != dns.opcode.QUERY
+        or question is None
+        or counts[:3] != (1, 0, 0)
+        or counts[3] > 1
+    ):
+        return None
+    (qname, rdtype, rdclass) = question
+    # The qname is the first name in the message, so it is uncompressed.
+    qname_end = 12 + sum(len(label) + 1 for label in qname.labels)
+    if counts[3] == 1:
+        # The only additional record must be an OPT without options.  It has a
+        # fixed 11 octet layout, starting with the root name.
+        offset = qname_end + 4
+        if len(query) != offset + 11:
+            return None
+        (owner, otype, payload, ttl, rdlen) = struct.unpack_from(
+            "!BHHIH", query, offset
+        )
+        if owner != 0 or otype != dns.rdatatype.OPT or rdlen != 0:
+            return None
+        edns = (ttl >> 16) & 0xFF
+        ednsflags = ttl & dns.flags.DO
+    else:
+        if len(query) != qname_end + 4:
+            return None
+        edns = -1
+        payload = 0
+        ednsflags = 0
+    key = (qname, rdtype, rdclass, flags & _KEY_FLAGS, edns, payload, ednsflags)
+    return (key, qname_end)
+
+
+class ResponseCache(dns._lru.LRUStore[_Key, _Entry]):
+    """Thread-safe, bounded, least-recently-used cache of wire format
+    responses, for servers.
+
+    Responses are keyed by the question of the query they answer, the query
+    flags which affect responses (RD, CD, and AD), and the EDNS version, payload, and
+    DO flag of the query.  When a response is taken from the cache, its id
+    and the case of its question name are set to those of the query, so an
+    answer which is the same for many queries is only rendered once.
+
+    Only queries with one question, and no records other than an optional
+    OPT record without EDNS options, are cached, as other queries, e.g. those
+    with TSIG signatures, cookies, or client subnets, need responses made for
+    them alone.  Queries over UDP and TCP may be given responses of
+    different sizes, so a server should use a cache for each.
+
+    If a response is made from the contents of a ``dns.versioned.Zone``,
+    passing the zone to ``put()`` ensures the response is not used once a new
+    version of the zone is committed.
+
+    Typical use::
+
+        response = cache.get(query)
+        if response is None:
+            response = make_response(query)  # the server's own code
+            cache.put(query, response, zone, version_id)
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """*max_size*, an ``int``, is the maximum number of responses to
+        keep; it must be greater than 0.
+        """
+
+        super().__init__(max_size)
+
+    def get(self, query: dns.wire.WireType) -> Optional[bytes]:
+        """Get the cached response to a query.
+
+        *query*, a ``bytes`` or other object supporting the buffer protocol,
+        the wire format query.
+
+        Returns a ``bytes``, the wire format response with the id and
+        question name of *query*, or ``None`` if there is no usable cached
+        response.
+        """
+
+        kq = _query_key(query)
+        if kq is None:
+            return None
+        (key, qname_end) = kq
+        with self.lock:
+            entry = self.data.get(key)
+            if (
+                entry is not None
+                and entry.zone is not None
+                and entry.zone.current_version_id() != entry.version_id
+            ):
+                # The zone has changed since the response was made.
+                del self.data[key]
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+        response = bytearray(entry.wire)
+        response[0:2] = query[0:2]
+        response[12:qname_end] = query[12:qname_end]
+        return bytes(response)
+
+    def put(
+        self,
+        query: dns.wire.WireType,
+        response: bytes,
+        zone: Optional[dns.versioned.Zone] = None,
+        version_id: Optional[int] = None,
+    ) -> bool:
+        """Cache the response to a query.
+
+        *query*, a ``bytes`` or other object supporting the buffer protocol,
+        the wire format query.
+
+        *response*, a ``bytes``, the wire format response to *query*.  Its
+        question must be the question of *query*.
+
+        *zone*, a ``dns.versioned.Zone`` or ``None``, the zone the response
+        was made from, if any.  The response will not be used once a version
+        of the zone other than *version_id* is current.
+
+        *version_id*, an ``int`` or ``None``, the id of the version of *zone*
+        the response was made from, e.g. ``txn.version.id`` for the reader
+        transaction used.  If ``None``, the current version of the zone is
+        assumed, which is only correct if the zone has not changed since the
+        response was made.
+
+        Raises ``ValueError`` if the question of *response* is not the
+        question of *query*.
+
+        Returns a ``bool``, ``True`` if the response was cached, or ``False``
+        if the query can't use the cache.
+        """
+
+        kq = _query_key(query)
+        if kq is None:
+            return False
+        (key, qname_end) = kq
+        question = dns.message.peek(response)[5]
+        if question is None or question != key[:3]:
+            raise ValueError("the response does not answer the query")
+        if zone is not None and version_id is None:
+            version_id = zone.current_version_id()
+        entry = _Entry(bytes(response), zone, version_id)
+        with self.lock:
+            self._store(key, entry)
+        return True
+
+    def flush(self) -> None:
+        """Remove all responses from the cache.
+
+        Responses made from a ``dns.versioned.Zone`` given to ``put()`` are
+        not used after the zone changes, so this is only needed when the
+        data other responses were made from changes.
+        """
+        super().flush()
@@ -226,6 +226,9 @@ class Tokenizer:
     idna_codec: A dns.name.IDNACodec, specifies the IDNA
     encoder/decoder.  If None, the default IDNA 2003
     encoder/decoder is used.
+
+    name_pool: A dns.name.NamePool or None.  If not None, names read
+    by the tokenizer are interned in the pool.
     """
 
     def __init__(
@@ -233,6 +236,7 @@ class Tokenizer:
         f: Any = sys.stdin,
         filename: Optional[str] = None,
         idna_codec: Optional[dns.name.IDNACodec] = None,
+        name_pool: Optional[dns.name.NamePool] = None,
     ):
         """Initialize a tokenizer instance.
 
@@ -246,6 +250,9 @@ class Tokenizer:
         idna_codec: A dns.name.IDNACodec, specifies the IDNA
         encoder/decoder.  If None, the default IDNA 2003
         encoder/decoder is used.
+
+        name_pool: A dns.name.NamePool or None.  If not None, names read
+        by the tokenizer are interned in the pool.
         """
 
         if isinstance(f, str):
@@ -276,6 +283,7 @@ class Tokenizer:
             self.idna_codec: dns.name.IDNACodec = dns.name.IDNA_2003
         else:
             self.idna_codec = idna_codec
+        self.name_pool = name_pool
 
     def _get_char(self) -> str:
         """Read a character from input."""
@@ -658,7 +666,13 @@ class Tokenizer:
         if not token.is_identifier():
             raise dns.exception.SyntaxError("expecting an identifier")
         name = dns.name.from_text(token.value, origin, self.idna_codec)
-        return name.choose_relativity(relativize_to or origin, relativize)
+        name = name.choose_relativity(relativize_to or origin, relativize)
+        return self.intern_name(name)
+
+    def intern_name(self, name: dns.name.Name) -> dns.name.Name:
+        if self.name_pool is None:
+            return name
+        return self.name_pool.intern(name)
 
     def get_name(
         self,
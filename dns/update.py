@@ -92,29 +92,29 @@ class UpdateMessage(dns.message.Message):  # lgtm[py/missing-equals]
     @property
     def zone(self) -> List[dns.rrset.RRset]:
         """The zone section."""
-        return self.sections[0]
+        return self._get_section(0)
 
     @zone.setter
     def zone(self, v):
-        self.sections[0] = v
+        self._set_section(0, v)
 
     @property
     def prerequisite(self) -> List[dns.rrset.RRset]:
         """The prerequisite section."""
-        return self.sections[1]
+        return self._get_section(1)
 
     @prerequisite.setter
     def prerequisite(self, v):
-        self.sections[1] = v
+        self._set_section(1, v)
 
     @property
     def update(self) -> List[dns.rrset.RRset]:
         """The update section."""
-        return self.sections[2]
+        return self._get_section(2)
 
     @update.setter
     def update(self, v):
-        self.sections[2] = v
+        self._set_section(2, v)
 
     def _add_rr(self, name, ttl, rd, deleting=None, section=None):
         """Add a single RR to the update section."""
@@ -232,6 +232,16 @@ class Zone(dns.zone.Zone):  # lgtm[py/missing-equals]
             self._pruning_policy = policy
             self._prune_versions_unlocked()
 
+    def current_version_id(self) -> int:
+        """Return the id of the current version of the zone.
+
+        A new version with a greater id is made each time a write transaction
+        is committed, so the id tells whether the zone has changed, e.g. for
+        invalidating data derived from it.
+        """
+        with self._version_lock:
+            return self._versions[-1].id
+
     def _end_read(self, txn):
         with self._version_lock:
             self._readers.remove(txn)
@@ -1,18 +1,49 @@
 # Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
 
 import contextlib
+import mmap
 import struct
-from typing import Iterator, Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 import dns.exception
 import dns.name
 
+WireType = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+_UINT16 = struct.Struct("!H")
+_UINT32 = struct.Struct("!I")
+
 
 class Parser:
-    def __init__(self, wire: bytes, current: int = 0):
+    """Parse DNS wire format.
+
+    *wire* may be a ``bytes`` or any other object supporting the buffer
+    protocol, e.g. a ``bytearray``, ``memoryview``, or ``mmap.mmap``.
+    Integers are unpacked directly from the buffer, so the only copies made
+    are the ``bytes`` returned by ``get_bytes()`` and the methods built on it.
+    """
+
+    def __init__(
+        self,
+        wire: WireType,
+        current: int = 0,
+        name_pool: Optional["dns.name.NamePool"] = None,
+    ):
         self.wire = wire
+        # Slicing a memoryview does not copy, so slices of anything other
+        # than bytes are made from a view and then converted to bytes.
+        self.buffer: Union[bytes, memoryview]
+        if isinstance(wire, bytes):
+            self.buffer = wire
+        else:
+            self.buffer = memoryview(wire).cast("B")
+        self.name_pool = name_pool
+        # A map from the offset of a label in the wire to the labels of the
+        # name suffix starting there, so that names which point at an
+        # already decoded suffix need not decode it again.
+        self.name_suffixes: Dict[int, Tuple[bytes, ...]] = {}
         self.current = 0
-        self.end = len(self.wire)
+        self.end = len(self.buffer)
         if current:
             self.seek(current)
         self.furthest = current
@@ -20,14 +51,22 @@ class Parser:
     def remaining(self) -> int:
         return self.end - self.current
 
-    def get_bytes(self, size: int) -> bytes:
+    def _advance(self, size: int) -> int:
+        # Consume *size* bytes, returning the offset of the first one.
         assert size >= 0
-        if size > self.remaining():
+        start = self.current
+        current = start + size
+        if current > self.end:
             raise dns.exception.FormError
-        output = self.wire[self.current : self.current + size]
-        self.current += size
-        self.furthest = max(self.furthest, self.current)
-        return output
+        self.current = current
+        if current > self.furthest:
+            self.furthest = current
+        return start
+
+    def get_bytes(self, size: int) -> bytes:
+        start = self._advance(size)
+        # Note that bytes() of a bytes is the same object, not a copy.
+        return bytes(self.buffer[start : start + size])
 
     def get_counted_bytes(self, length_size: int = 1) -> bytes:
         length = int.from_bytes(self.get_bytes(length_size), "big")
@@ -37,25 +76,49 @@ class Parser:
         return self.get_bytes(self.remaining())
 
     def get_uint8(self) -> int:
-        return struct.unpack("!B", self.get_bytes(1))[0]
+        return self.buffer[self._advance(1)]
 
     def get_uint16(self) -> int:
-        return struct.unpack("!H", self.get_bytes(2))[0]
+        return _UINT16.unpack_from(self.buffer, self._advance(2))[0]
 
     def get_uint32(self) -> int:
-        return struct.unpack("!I", self.get_bytes(4))[0]
+        return _UINT32.unpack_from(self.buffer, self._advance(4))[0]
 
     def get_uint48(self) -> int:
         return int.from_bytes(self.get_bytes(6), "big")
 
     def get_struct(self, format: str) -> Tuple:
-        return struct.unpack(format, self.get_bytes(struct.calcsize(format)))
+        return struct.unpack_from(
+            format, self.buffer, self._advance(struct.calcsize(format))
+        )
 
     def get_name(self, origin: Optional["dns.name.Name"] = None) -> "dns.name.Name":
         name = dns.name.from_wire_parser(self)
         if origin:
             name = name.relativize(origin)
-        return name
+        return self.intern_name(name)
+
+    def intern_name(self, name: "dns.name.Name") -> "dns.name.Name":
+        if self.name_pool is None:
+            return name
+        return self.name_pool.intern(name)
+
+    def skip_name(self) -> None:
+        """Skip over a possibly compressed name without decoding it.
+
+        Compression pointers are not followed, so only the structure of the
+        labels at the current position is checked.
+        """
+        count = self.get_uint8()
+        while count != 0:
+            if count < 64:
+                self._advance(count)
+            elif count >= 192:
+                self._advance(1)
+                return
+            else:
+                raise dns.name.BadLabelType
+            count = self.get_uint8()
 
     def seek(self, where: int) -> None:
         # Note that seeking to the end is OK!  (If you try to read
@@ -64,6 +127,13 @@ class Parser:
             raise dns.exception.FormError
         self.current = where
 
+    def rewind(self, where: int) -> None:
+        """Seek back to *where* so that the data after it can be read again."""
+        if where > self.current:
+            raise ValueError("cannot rewind forwards")
+        self.seek(where)
+        self.furthest = where
+
     @contextlib.contextmanager
     def restrict_to(self, size: int) -> Iterator:
         assert size >= 0
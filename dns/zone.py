@@ -692,7 +692,7 @@ class Zone(dns.transaction.TransactionManager):
 
             if sorted:
                 names = list(self.keys())
-                names.sort()
+                names.sort(key=dns.name.Name.canonical_key)
             else:
                 names = self.keys()
             for n in names:
@@ -812,7 +812,9 @@ class Zone(dns.transaction.TransactionManager):
             assert self.origin is not None
             origin_name = self.origin
         hasher = hashinfo()
-        for name, node in sorted(self.items()):
+        for name, node in sorted(
+            self.items(), key=lambda item: item[0].canonical_key()
+        ):
             rrnamebuf = name.to_digestable(self.origin)
             for rdataset in sorted(node, key=lambda rds: (rds.rdtype, rds.covers)):
                 if name == origin_name and dns.rdatatype.ZONEMD in (
@@ -1190,6 +1192,7 @@ def _from_text(
     check_origin: bool = True,
     idna_codec: Optional[dns.name.IDNACodec] = None,
     allow_directives: Union[bool, Iterable[str]] = True,
+    name_pool: Optional[dns.name.NamePool] = None,
 ) -> Zone:
     # See the comments for the public APIs from_text() and from_file() for
     # details.
@@ -1202,7 +1205,9 @@ def _from_text(
         filename = "<string>"
     zone = zone_factory(origin, rdclass, relativize=relativize)
     with zone.writer(True) as txn:
-        tok = dns.tokenizer.Tokenizer(text, filename, idna_codec=idna_codec)
+        tok = dns.tokenizer.Tokenizer(
+            text, filename, idna_codec=idna_codec, name_pool=name_pool
+        )
         reader = dns.zonefile.Reader(
             tok,
             rdclass,
@@ -1232,6 +1237,7 @@ def from_text(
     check_origin: bool = True,
     idna_codec: Optional[dns.name.IDNACodec] = None,
     allow_directives: Union[bool, Iterable[str]] = True,
+    name_pool: Optional[dns.name.NamePool] = None,
 ) -> Zone:
     """Build a zone object from a zone file format string.
 
@@ -1273,6 +1279,9 @@ def from_text(
     name.  If a non-empty iterable, then only the listed directives (including the
     ``$``) are allowed.
 
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, names
+    read from the zone file are interned in the pool.
+
     Raises ``dns.zone.NoSOA`` if there is no SOA RRset.
 
     Raises ``dns.zone.NoNS`` if there is no NS RRset.
@@ -1292,6 +1301,7 @@ def from_text(
         check_origin,
         idna_codec,
         allow_directives,
+        name_pool,
     )
 
 
@@ -1306,6 +1316,7 @@ def from_file(
     check_origin: bool = True,
     idna_codec: Optional[dns.name.IDNACodec] = None,
     allow_directives: Union[bool, Iterable[str]] = True,
+    name_pool: Optional[dns.name.NamePool] = None,
 ) -> Zone:
     """Read a zone file and build a zone object.
 
@@ -1347,6 +1358,9 @@ def from_file(
     name.  If a non-empty iterable, then only the listed directives (including the
     ``$``) are allowed.
 
+    *name_pool*, a ``dns.name.NamePool`` or ``None``.  If not ``None``, names
+    read from the zone file are interned in the pool.
+
     Raises ``dns.zone.NoSOA`` if there is no SOA RRset.
 
     Raises ``dns.zone.NoNS`` if there is no NS RRset.
@@ -1374,6 +1388,7 @@ def from_file(
             check_origin,
             idna_codec,
             allow_directives,
+            name_pool,
         )
     assert False  # make mypy happy  lgtm[py/unreachable-statement]
 
@@ -174,6 +174,7 @@ class Reader:
                 return
             if self.relativize:
                 name = name.relativize(self.zone_origin)
+            name = self.tok.intern_name(name)
 
         # TTL
         if self.force_ttl is not None:
@@ -422,6 +423,7 @@ class Reader:
                 return
             if self.relativize:
                 name = name.relativize(self.zone_origin)
+            name = self.tok.intern_name(name)
 
             try:
                 rd = dns.rdata.from_text(
@@ -527,7 +529,9 @@ class Reader:
                             )
                         )
                         self.current_file = open(filename)
-                        self.tok = dns.tokenizer.Tokenizer(self.current_file, filename)
+                        self.tok = dns.tokenizer.Tokenizer(
+                            self.current_file, filename, name_pool=self.tok.name_pool
+                        )
                         self.current_origin = new_origin
                     elif c == "$GENERATE":
                         self._generate_line()
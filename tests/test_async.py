@@ -20,7 +20,9 @@ import random
 import socket
 import time
 import unittest
+import unittest.mock
 
+import dns._features
 import dns.asyncbackend
 import dns.asyncquery
 import dns.asyncresolver
@@ -695,6 +697,107 @@ class AsyncioOnlyTests(unittest.TestCase):
         self.async_run(run)
 
 
+class PipelinedTCPTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = dns.asyncbackend.set_default_backend("asyncio")
+
+    def async_run(self, afunc):
+        return asyncio.run(afunc())
+
+    def test_pipelined_tcp(self):
+        queries = [dns.message.make_query(f"www{n}.example.", "A") for n in range(10)]
+        for n, q in enumerate(queries):
+            q.id = n
+
+        async def run():
+            return await dns.asyncquery.pipelined_tcp(
+                queries, "127.0.0.1", port=server.port, timeout=5, window=4
+            )
+
+        with tests.util.ReversingTCPServer(10, 4) as server:
+            responses = self.async_run(run)
+        self.assertEqual(len(responses), 10)
+        for q, r in zip(queries, responses):
+            self.assertTrue(q.is_response(r))
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = dns.asyncbackend.set_default_backend("asyncio")
+
+    def async_run(self, afunc):
+        return asyncio.run(afunc())
+
+    def test_reuse(self):
+        async def run():
+            async with dns.asyncquery.ConnectionPool() as pool:
+                for n in range(3):
+                    q = dns.message.make_query(f"www{n}.example.", "A")
+                    r = await dns.asyncquery.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                    self.assertTrue(q.is_response(r))
+
+        with tests.util.CountingTCPServer() as server:
+            self.async_run(run)
+        self.assertEqual(server.connections, 1)
+
+    def test_server_closes(self):
+        async def run():
+            async with dns.asyncquery.ConnectionPool() as pool:
+                for n in range(3):
+                    q = dns.message.make_query(f"www{n}.example.", "A")
+                    r = await dns.asyncquery.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                    self.assertTrue(q.is_response(r))
+                    await self.backend.sleep(0.1)
+
+        with tests.util.CountingTCPServer(close_after=1) as server:
+            self.async_run(run)
+        self.assertEqual(server.connections, 3)
+
+    def test_health_check(self):
+        async def run():
+            async with dns.asyncquery.ConnectionPool() as pool:
+                q = dns.message.make_query("www.example.", "A")
+                await dns.asyncquery.tcp(
+                    q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                )
+                ((s, _),) = next(iter(pool.idle.values()))
+                # Let the server's close arrive.
+                await self.backend.sleep(0.1)
+                self.assertFalse(s.is_idle())
+                with unittest.mock.patch.object(
+                    dns.asyncquery, "send_tcp", wraps=send_tcp
+                ) as send:
+                    await dns.asyncquery.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                # The closed connection was not tried.
+                self.assertEqual(send.call_count, 1)
+
+        send_tcp = dns.asyncquery.send_tcp
+        with tests.util.CountingTCPServer(close_after=1) as server:
+            self.async_run(run)
+        self.assertEqual(server.connections, 2)
+
+    def test_resolver(self):
+        async def run():
+            resolver = dns.asyncresolver.Resolver(configure=False)
+            self.assertIsNone(resolver.connection_pool)
+            resolver.nameservers = ["127.0.0.1"]
+            resolver.port = server.port
+            async with dns.asyncquery.ConnectionPool() as resolver.connection_pool:
+                for n in range(3):
+                    answer = await resolver.resolve(f"www{n}.example.", "A", tcp=True)
+                    self.assertEqual(answer[0].address, "1.2.3.4")
+
+        with tests.util.CountingTCPServer() as server:
+            self.async_run(run)
+        self.assertEqual(server.connections, 1)
+
+
 try:
     import sniffio
     import trio
@@ -718,6 +821,14 @@ try:
         def async_run(self, afunc):
             return trio.run(afunc)
 
+    @unittest.skipIf(not dns._features.have("trio"), "trio not found or too old")
+    class TrioPipelinedTCPTests(PipelinedTCPTests):
+        def setUp(self):
+            self.backend = dns.asyncbackend.set_default_backend("trio")
+
+        def async_run(self, afunc):
+            return trio.run(afunc)
+
 except ImportError:
     pass
 
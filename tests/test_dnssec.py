@@ -32,6 +32,7 @@ import dns.rdtypes.ANY.CDS
 import dns.rdtypes.ANY.DNSKEY
 import dns.rdtypes.ANY.DS
 import dns.rrset
+import dns.wire
 import dns.zone
 from dns.rdtypes.dnskeybase import Flag
 
@@ -662,6 +663,24 @@ class DNSSECValidatorTestCase(unittest.TestCase):
     def testAbsoluteRSAGood(self):  # type: () -> None
         dns.dnssec.validate(abs_soa, abs_soa_rrsig, abs_keys, None, when)
 
+    def testAbsoluteRSAGoodLazy(self):  # type: () -> None
+        def lazy(rrset):
+            rdatas = []
+            for rd in rrset:
+                wire = rd.to_wire()
+                parser = dns.wire.Parser(wire)
+                with parser.restrict_to(len(wire)):
+                    rdatas.append(
+                        dns.rdata.from_wire_parser(
+                            rd.rdclass, rd.rdtype, parser, None, True
+                        )
+                    )
+            self.assertIsInstance(rdatas[0], dns.rdata.LazyRdata)
+            return dns.rrset.from_rdata_list(rrset.name, rrset.ttl, rdatas)
+
+        keys = {name: lazy(rrset) for (name, rrset) in abs_keys.items()}
+        dns.dnssec.validate(abs_soa, lazy(abs_soa_rrsig), keys, None, when)
+
     def testDuplicateKeytag(self):  # type: () -> None
         dns.dnssec.validate(
             abs_soa, abs_soa_rrsig, abs_keys_duplicate_keytag, None, when
@@ -14,9 +14,11 @@
 # WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import asyncio
 import random
 import socket
 import unittest
+from unittest import mock
 
 try:
     import ssl
@@ -25,8 +27,10 @@ try:
 except Exception:
     _have_ssl = False
 
+import dns.asyncquery
 import dns.edns
 import dns.message
+import dns.nameserver
 import dns.query
 import dns.quic
 import dns.rdatatype
@@ -173,6 +177,21 @@ class DNSOverHTTPSTestCaseHttpx(unittest.TestCase):
         self.assertTrue("8.8.8.8" in seen)
         self.assertTrue("8.8.4.4" in seen)
 
+    def test_nameserver_reuses_client(self):
+        nameserver_url = random.choice(KNOWN_ANYCAST_DOH_RESOLVER_URLS)
+        nameserver = dns.nameserver.DoHNameserver(nameserver_url, max_connections=2)
+        try:
+            for _ in range(2):
+                q = dns.message.make_query("example.com.", dns.rdatatype.A)
+                r = nameserver.query(q, 4, None, 0)
+                self.assertTrue(q.is_response(r))
+            self.assertEqual(len(nameserver._clients), 1)
+            client = nameserver._clients[(None, 0)]
+        finally:
+            nameserver.close()
+        self.assertTrue(client.is_closed)
+        self.assertEqual(len(nameserver._clients), 0)
+
     def test_padded_get(self):
         nameserver_url = random.choice(KNOWN_PAD_AWARE_DOH_RESOLVER_URLS)
         q = dns.message.make_query("example.com.", dns.rdatatype.A, use_edns=0, pad=128)
@@ -249,5 +268,110 @@ class DNSOverHTTP3TestCase(unittest.TestCase):
             self.assertTrue(q.is_response(r))
 
 
+class DoHNameserverClientTestCase(unittest.TestCase):
+    # The clients are mocked, so these tests need neither httpx nor a server.
+
+    def setUp(self):
+        self.httpx = mock.MagicMock()
+        self.httpx.Client.side_effect = lambda **kwargs: mock.MagicMock()
+        self.httpx.AsyncClient.side_effect = lambda **kwargs: mock.MagicMock(
+            aclose=mock.AsyncMock()
+        )
+        self.https = mock.MagicMock()
+        self.async_https = mock.AsyncMock()
+        patches = [
+            mock.patch.multiple(
+                dns.query,
+                have_doh=True,
+                httpx=self.httpx,
+                _HTTPTransport=mock.MagicMock(),
+                https=self.https,
+                create=True,
+            ),
+            mock.patch.object(dns.asyncquery, "https", self.async_https),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.backend = mock.MagicMock()
+        self.backend.name.return_value = "asyncio"
+        self.q = dns.message.make_query("example.com.", dns.rdatatype.A)
+
+    def session(self):
+        return self.https.call_args.kwargs["session"]
+
+    def client(self):
+        return self.async_https.call_args.kwargs["client"]
+
+    def test_reuse_and_close(self):
+        nameserver = dns.nameserver.DoHNameserver("https://example/dns-query")
+        nameserver.query(self.q, 2, None, 0)
+        session = self.session()
+        nameserver.query(self.q, 2, None, 0)
+        self.assertIs(self.session(), session)
+        nameserver.query(self.q, 2, "127.0.0.1", 0)
+        self.assertIsNot(self.session(), session)
+        self.assertEqual(self.httpx.Client.call_count, 2)
+        nameserver.close()
+        session.close.assert_called_once_with()
+        nameserver.query(self.q, 2, None, 0)
+        self.assertIsNot(self.session(), session)
+
+    def test_knobs(self):
+        nameserver = dns.nameserver.DoHNameserver(
+            "https://example/dns-query", max_connections=3, multiplex=False
+        )
+        nameserver.query(self.q, 2, None, 0)
+        self.httpx.Limits.assert_called_once_with(
+            max_connections=3, max_keepalive_connections=3
+        )
+        kwargs = self.httpx.Client.call_args.kwargs
+        self.assertTrue(kwargs["http1"])
+        self.assertFalse(kwargs["http2"])
+        with self.assertRaises(ValueError):
+            dns.nameserver.DoHNameserver(
+                "https://example/dns-query",
+                http_version=dns.query.HTTPVersion.H2,
+                multiplex=False,
+            )
+        nameserver = dns.nameserver.DoHNameserver(
+            "https://example/dns-query", http_version=dns.query.HTTPVersion.H3
+        )
+        nameserver.query(self.q, 2, None, 0)
+        self.assertIsNone(self.session())
+        self.assertEqual(self.httpx.Client.call_count, 1)
+
+    def test_async_reuse_and_close(self):
+        nameserver = dns.nameserver.DoHNameserver("https://example/dns-query")
+        clients = []
+
+        async def run():
+            for _ in range(2):
+                await nameserver.async_query(self.q, 2, None, 0, False, self.backend)
+                clients.append(self.client())
+
+        asyncio.run(run())
+        self.assertIs(clients[0], clients[1])
+        # A new event loop gets a new client.
+        asyncio.run(run())
+        self.assertIsNot(clients[2], clients[1])
+        self.assertIs(clients[2], clients[3])
+        with mock.patch("dns.asyncbackend.get_default_backend") as get_backend:
+            get_backend.return_value = self.backend
+            asyncio.run(nameserver.aclose())
+        # The last client belongs to a finished loop, so is dropped unclosed.
+        clients[2].aclose.assert_not_awaited()
+        self.assertEqual(len(nameserver._async_clients), 0)
+
+        async def run_and_close():
+            await run()
+            await nameserver.aclose()
+
+        with mock.patch("dns.asyncbackend.get_default_backend") as get_backend:
+            get_backend.return_value = self.backend
+            asyncio.run(run_and_close())
+        clients[4].aclose.assert_awaited_once_with()
+
+
 if __name__ == "__main__":
     unittest.main()
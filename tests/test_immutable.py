@@ -147,3 +147,60 @@ class DecoratorTestCase(unittest.TestCase):
         with self.assertRaises(TypeError):
             B(a, 20)
         self.assertEqual(a.a, 10)
+
+    def make_unguarded_classes(self):
+        class UA:
+            __slots__ = ("a",)
+
+            @self.immutable_module.unguarded_init
+            def __init__(self, a):
+                object.__setattr__(self, "a", a)
+
+        UA = self.immutable_module.immutable(UA)
+
+        # UB follows the usual protocol, even though UA does not.
+        class UB(UA):
+            __slots__ = ("b",)
+
+            def __init__(self, a, b):
+                super().__init__(a)
+                self.b = b
+
+        UB = self.immutable_module.immutable(UB)
+
+        # UC inherits UB's __init__.
+        class UC(UB):
+            __slots__ = ()
+
+        UC = self.immutable_module.immutable(UC)
+
+        return (UA, UB, UC)
+
+    def test_unguarded_init(self):
+        UA, UB, UC = self.make_unguarded_classes()
+        ua = UA(1)
+        self.assertEqual(ua.a, 1)
+        for cls in (UB, UC):
+            ub = cls(1, 2)
+            self.assertEqual((ub.a, ub.b), (1, 2))
+            with self.assertRaises(TypeError):
+                ub.b = 3
+        with self.assertRaises(TypeError):
+            ua.a = 2
+        with self.assertRaises(TypeError):
+            del ua.a
+        # UA's __init__ is not guarded, and UC's is not guarded twice.
+        self.assertIs(UA.__init__, UA.__mro__[2].__init__)
+        self.assertIs(UC.__init__, UB.__init__)
+
+    def test_unguarded_init_cannot_assign(self):
+        class A:
+            __slots__ = ("a",)
+
+            @self.immutable_module.unguarded_init
+            def __init__(self, a):
+                self.a = a
+
+        A = self.immutable_module.immutable(A)
+        with self.assertRaises(TypeError):
+            A(1)
@@ -17,13 +17,19 @@
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 import binascii
+import operator
 import unittest
+from unittest.mock import patch
 
 import dns.edns
+import dns.entropy
 import dns.exception
 import dns.flags
 import dns.message
 import dns.name
+import dns.opcode
+import dns.rcode
+import dns.rdata
 import dns.rdataclass
 import dns.rdatatype
 import dns.rdtypes.ANY.OPT
@@ -973,6 +979,280 @@ www.dnspython.org. 300 IN A 1.2.3.4
         self.assertEqual(r2.flags & dns.flags.TC, 0)
         self.assertEqual(len(r2.additional), 30)
 
+    def test_pack_additional(self):
+        q = dns.message.make_query("www.example", "a")
+        r = dns.message.make_response(q)
+        targets = [f"ns{n}.example." for n in range(6)]
+        r.authority.append(
+            dns.rrset.from_text_list("example.", 3600, "in", "ns", targets)
+        )
+        # A large RRset which is not glue comes first.
+        r.additional.append(
+            dns.rrset.from_text_list(
+                "other.example.", 3600, "in", "txt", [f'"{n:0200}"' for n in range(4)]
+            )
+        )
+        for n, target in enumerate(targets):
+            r.additional.append(
+                dns.rrset.from_text(target, 3600, "in", "a", f"10.0.0.{n}")
+            )
+            r.additional.append(
+                dns.rrset.from_text(target, 3600, "in", "aaaa", f"::{n}")
+            )
+        r.additional.append(
+            dns.rrset.from_text("small.example.", 3600, "in", "a", "10.0.1.1")
+        )
+
+        # With prefer_truncation, rendering stops at the large RRset.
+        w1 = r.to_wire(max_size=512, prefer_truncation=True)
+        r1 = dns.message.from_wire(w1)
+        self.assertEqual(r1.flags & dns.flags.TC, 0)
+        self.assertEqual(len(r1.additional), 0)
+
+        # With pack_additional, all of the glue fits, then whatever else does.
+        w2 = r.to_wire(max_size=512, pack_additional=True)
+        self.assertLessEqual(len(w2), 512)
+        r2 = dns.message.from_wire(w2)
+        self.assertEqual(r2.flags & dns.flags.TC, 0)
+        self.assertEqual(len(r2.additional), 13)
+        self.assertEqual(r2.additional[-1].name.to_text(), "small.example.")
+        self.assertEqual(r2.authority, r.authority)
+
+        # If the glue does not fit, TC is set.
+        r.authority[0].update(
+            dns.rrset.from_text_list(
+                "example.",
+                3600,
+                "in",
+                "ns",
+                [f"ns{n}.example." for n in range(6, 24)],
+            )
+        )
+        for n in range(6, 24):
+            r.additional.append(
+                dns.rrset.from_text(f"ns{n}.example.", 3600, "in", "a", f"10.0.0.{n}")
+            )
+        w4 = r.to_wire(max_size=512, pack_additional=True)
+        self.assertLessEqual(len(w4), 512)
+        r4 = dns.message.from_wire(w4)
+        self.assertNotEqual(r4.flags & dns.flags.TC, 0)
+
+        # Glue for names outside the delegation is optional.
+        r = dns.message.make_response(q)
+        r.authority.append(
+            dns.rrset.from_text_list(
+                "example.", 3600, "in", "ns", [f"ns{n}.example.net." for n in range(24)]
+            )
+        )
+        for n in range(24):
+            r.additional.append(
+                dns.rrset.from_text(
+                    f"ns{n}.example.net.", 3600, "in", "a", f"10.0.0.{n}"
+                )
+            )
+        w5 = r.to_wire(max_size=512, pack_additional=True)
+        r5 = dns.message.from_wire(w5)
+        self.assertEqual(r5.flags & dns.flags.TC, 0)
+        self.assertGreater(len(r5.additional), 0)
+        self.assertLess(len(r5.additional), 24)
+
+    def test_to_wire_into(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        a = dns.message.from_text(answer_text)
+        q = dns.message.make_query("www.example", "a", use_edns=0, pad=128)
+        t = dns.message.make_query("www.example", "a", use_edns=0, pad=128)
+        t.use_tsig(keyring)
+        buffer = bytearray(1024)
+        for m in (a, q, t):
+            # Disable shuffling so the renderings can be compared.
+            length = m.to_wire_into(buffer, want_shuffle=False)
+            self.assertIsNone(m.wire)
+            wire = m.to_wire(want_shuffle=False)
+            self.assertEqual(length, len(wire))
+            if m.tsig:
+                # The signature includes the time, so just check the
+                # message verifies.
+                m2 = dns.message.from_wire(buffer[:length], keyring=keyring)
+                self.assertEqual(m2, m)
+            else:
+                self.assertEqual(buffer[:length], wire)
+                length = m.to_wire_into(
+                    memoryview(buffer), prepend_length=True, want_shuffle=False
+                )
+                self.assertEqual(
+                    buffer[:length], m.to_wire(prepend_length=True, want_shuffle=False)
+                )
+        # The wire of a parsed message is kept.
+        m = dns.message.from_wire(goodwire)
+        m.to_wire_into(buffer)
+        self.assertEqual(m.wire, goodwire)
+
+    def test_to_wire_into_too_small(self):
+        q = dns.message.make_query("www.example", "a")
+        rrs = [
+            dns.rrset.from_text("www.example.", 3600, "in", "a", f"1.2.3.{n}")
+            for n in range(32)
+        ]
+        r = dns.message.make_response(q)
+        r.answer.extend(rrs)
+        buffer = bytearray(300)
+        with self.assertRaises(dns.exception.TooBig):
+            r.to_wire_into(buffer)
+        with self.assertRaises(dns.exception.TooBig):
+            r.to_wire_into(bytearray(1))
+        with self.assertRaises(dns.exception.TooBig):
+            r.to_wire_into(bytearray(1), prepend_length=True)
+        # With prefer_truncation, as many records as fit are rendered, and TC
+        # is set.
+        length = r.to_wire_into(buffer, prefer_truncation=True)
+        self.assertLessEqual(length, 300)
+        r2 = dns.message.from_wire(buffer[:length], one_rr_per_rrset=True)
+        self.assertNotEqual(r2.flags & dns.flags.TC, 0)
+        self.assertEqual(len(r2.answer), 16)
+
+    def test_from_wire_many(self):
+        wires = []
+        for n in range(10):
+            q = dns.message.make_query(f"www{n}.example", "a")
+            q.id = n
+            wires.append(q.to_wire())
+        wires[3] = wires[3][:5]
+        wires[7] = wires[7] + b"junk"
+        for workers in (1, 2):
+            results = list(
+                dns.message.from_wire_many(iter(wires), workers=workers, chunksize=3)
+            )
+            self.assertEqual(len(results), 10)
+            for n, result in enumerate(results):
+                if n == 3:
+                    self.assertIsInstance(result, dns.message.ShortHeader)
+                elif n == 7:
+                    self.assertIsInstance(result, dns.message.TrailingJunk)
+                else:
+                    self.assertEqual(result, dns.message.from_wire(wires[n]))
+            results = list(
+                dns.message.from_wire_many(
+                    wires,
+                    workers=workers,
+                    function=operator.attrgetter("id"),
+                    ignore_trailing=True,
+                )
+            )
+            self.assertIsInstance(results[3], dns.message.ShortHeader)
+            self.assertEqual(results[:3] + results[4:], [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        with self.assertRaises(ValueError):
+            list(dns.message.from_wire_many(wires, chunksize=0))
+
+    def test_from_wire_many_without_function_is_serial(self):
+        wires = [dns.message.make_query("www.example", "a").to_wire()] * 4
+        with patch("concurrent.futures.ProcessPoolExecutor") as executor:
+            results = list(dns.message.from_wire_many(wires, workers=2))
+        executor.assert_not_called()
+        self.assertEqual(results, [dns.message.from_wire(wires[0])] * 4)
+
+    def test_from_wire_many_lazy_and_name_pool(self):
+        r = dns.message.make_response(dns.message.make_query("www.example", "a"))
+        r.answer.append(dns.rrset.from_text("www.example.", 300, "IN", "A", "10.0.0.1"))
+        wires = [r.to_wire()] * 4
+        for workers in (1, 2):
+            results = list(
+                dns.message.from_wire_many(
+                    wires,
+                    workers=workers,
+                    lazy=True,
+                    name_pool=dns.name.NamePool(),
+                )
+            )
+            self.assertEqual(results, [r] * 4)
+            results = list(
+                dns.message.from_wire_many(
+                    wires,
+                    workers=workers,
+                    function=operator.attrgetter("answer"),
+                    lazy=True,
+                    name_pool=dns.name.NamePool(),
+                )
+            )
+            self.assertEqual(results, [r.answer] * 4)
+
+    def test_query_template(self):
+        q = dns.message.make_query(
+            "www.Example.", "A", use_edns=0, options=[dns.edns.ECSOption("1.2.3.0")]
+        )
+        t = dns.message.QueryTemplate(q)
+        q.id = 1234
+        self.assertEqual(t.to_wire(1234), q.to_wire())
+        buffer = bytearray(512)
+        length = t.to_wire_into(buffer, 1234)
+        self.assertEqual(buffer[:length], q.to_wire())
+        with self.assertRaises(dns.exception.TooBig):
+            t.to_wire_into(bytearray(length - 1))
+        self.assertEqual(t.get_mac(t.to_wire()), b"")
+        # The template is unchanged by making queries.
+        self.assertEqual(t.to_wire(1234), q.to_wire())
+        ids = set()
+        for _ in range(10):
+            m = dns.message.from_wire(t.to_wire())
+            ids.add(m.id)
+            m.id = q.id
+            self.assertEqual(m, q)
+        self.assertGreater(len(ids), 1)
+
+    def test_query_template_randomize_case(self):
+        q = dns.message.make_query("abcdefghij-0123.example.", "A")
+        t = dns.message.QueryTemplate(q)
+        names = set()
+        for _ in range(10):
+            wire = t.to_wire(1, randomize_case=True)
+            m = dns.message.from_wire(wire)
+            qname = m.question[0].name
+            self.assertEqual(qname, q.question[0].name)
+            self.assertEqual(qname.to_text().lower(), "abcdefghij-0123.example.")
+            names.add(qname.to_text())
+            buffer = bytearray(512)
+            length = t.to_wire_into(buffer, 1, randomize_case=True)
+            self.assertEqual(dns.message.from_wire(buffer[:length]).id, 1)
+        self.assertGreater(len(names), 1)
+        # Relative names use the origin.
+        q = dns.message.make_query(dns.name.from_text("www", None), "A")
+        t = dns.message.QueryTemplate(q, origin=dns.name.from_text("example."))
+        wire = t.to_wire(randomize_case=True)
+        self.assertEqual(
+            dns.message.from_wire(wire).question[0].name,
+            dns.name.from_text("www.example."),
+        )
+        with self.assertRaises(ValueError):
+            dns.message.QueryTemplate(dns.message.Message())
+
+    def test_query_template_randomize_case_without_system_random(self):
+        name = "abcdefghijklmnopqrstuvwxyz.abcdefghijklmnopqrstuvwxyz.example."
+        t = dns.message.QueryTemplate(dns.message.make_query(name, "A"))
+        with patch.object(dns.entropy, "system_random", None):
+            wire = t.to_wire(randomize_case=True)
+        qname = dns.message.from_wire(wire).question[0].name
+        self.assertEqual(qname.to_text().lower(), name)
+
+    def test_query_template_tsig(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        q = dns.message.make_query("www.example.", "A", use_edns=0, pad=128)
+        q.use_tsig(keyring)
+        t = dns.message.QueryTemplate(q)
+        self.assertEqual(len(t.to_wire()), len(q.to_wire()))
+        buffer = bytearray(512)
+        for wire in (t.to_wire(4321), buffer[: t.to_wire_into(buffer, 4321)]):
+            self.assertEqual(len(wire) % 128, 0)
+            m = dns.message.from_wire(wire, keyring=keyring)
+            self.assertEqual(m.id, 4321)
+            self.assertEqual(m.tsig[0].original_id, 4321)
+            self.assertEqual(t.get_mac(wire), m.mac)
+            r = dns.message.make_response(m)
+            r2 = dns.message.from_wire(
+                r.to_wire(), keyring=keyring, request_mac=t.get_mac(wire)
+            )
+            self.assertEqual(r2.id, 4321)
+        with self.assertRaises(dns.exception.TooBig):
+            t.to_wire_into(bytearray(len(t.wire) + 1))
+
     def test_section_count(self):
         a = dns.message.from_text(answer_text)
         self.assertEqual(a.section_count(a.question), 1)
@@ -1014,6 +1294,267 @@ www.dnspython.org. 300 IN A 1.2.3.4
         r.flags |= dns.flags.QR
         self.assertEqual(r.extended_errors(), options)
 
+    def test_from_wire_buffers(self):
+        q = dns.message.make_query("www.dnspython.org.", "A", use_edns=0)
+        r = dns.message.make_response(q)
+        r.answer.append(
+            dns.rrset.from_text("www.dnspython.org.", 300, "IN", "A", "10.0.0.1")
+        )
+        wire = r.to_wire()
+        for buffer in (bytearray(wire), memoryview(wire)):
+            m = dns.message.from_wire(buffer)
+            self.assertEqual(m, r)
+            self.assertIsInstance(m.wire, bytes)
+            self.assertEqual(m.wire, wire)
+
+    def test_from_wire_with_name_pool(self):
+        q = dns.message.make_query("www.dnspython.org.", "A")
+        r = dns.message.make_response(q)
+        r.answer.append(
+            dns.rrset.from_text(
+                "www.dnspython.org.", 300, "IN", "CNAME", "dnspython.org."
+            )
+        )
+        r.answer.append(
+            dns.rrset.from_text("dnspython.org.", 300, "IN", "A", "10.0.0.1")
+        )
+        wire = r.to_wire()
+        pool = dns.name.NamePool()
+        m1 = dns.message.from_wire(wire, name_pool=pool)
+        m2 = dns.message.from_wire(wire, name_pool=pool)
+        self.assertEqual(m1, r)
+        self.assertIs(m1.question[0].name, m2.question[0].name)
+        self.assertIs(m1.question[0].name, m1.answer[0].name)
+        self.assertIs(m1.answer[0][0].target, m1.answer[1].name)
+        self.assertEqual(pool.misses(), 2)
+
+    def _lazy_test_response(self):
+        q = dns.message.make_query("www.dnspython.org.", "A", use_edns=0)
+        r = dns.message.make_response(q)
+        r.answer.append(
+            dns.rrset.from_text(
+                "www.dnspython.org.", 300, "IN", "CNAME", "dnspython.org."
+            )
+        )
+        r.answer.append(
+            dns.rrset.from_text("dnspython.org.", 300, "IN", "A", "10.0.0.1")
+        )
+        r.authority.append(
+            dns.rrset.from_text("dnspython.org.", 300, "IN", "NS", "ns1.dnspython.org.")
+        )
+        r.additional.append(
+            dns.rrset.from_text("ns1.dnspython.org.", 300, "IN", "A", "10.0.0.2")
+        )
+        return r
+
+    def test_from_wire_lazy(self):
+        r = self._lazy_test_response()
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, lazy=True)
+        self.assertIsNotNone(m._deferred)
+        # EDNS is processed immediately
+        self.assertEqual(m.edns, 0)
+        self.assertEqual(m.question, r.question)
+        self.assertIsNotNone(m._deferred)
+        self.assertEqual(m.answer, r.answer)
+        self.assertIsNotNone(m._deferred)
+        self.assertEqual(m.authority, r.authority)
+        self.assertEqual(m.additional, r.additional)
+        self.assertIsNone(m._deferred)
+        self.assertEqual(m, dns.message.from_wire(wire))
+        self.assertEqual(m.to_wire(), wire)
+
+    def test_from_wire_lazy_reused_buffer(self):
+        r = self._lazy_test_response()
+        wire = r.to_wire()
+        buffer = bytearray(wire)
+        m = dns.message.from_wire(memoryview(buffer), lazy=True)
+        # Overwrite and then resize the buffer as a receive loop might.
+        buffer[12:] = b"\x00" * (len(buffer) - 12)
+        buffer.extend(b"\x00" * 100)
+        self.assertEqual(m.answer, r.answer)
+        self.assertEqual(m.authority, r.authority)
+        self.assertEqual(m.additional, r.additional)
+        self.assertEqual(m.to_wire(), wire)
+
+    def test_from_wire_lazy_find_rrset(self):
+        r = self._lazy_test_response()
+        m = dns.message.from_wire(r.to_wire(), lazy=True)
+        rrset = m.find_rrset(
+            dns.message.ADDITIONAL,
+            dns.name.from_text("ns1.dnspython.org."),
+            dns.rdataclass.IN,
+            dns.rdatatype.A,
+        )
+        self.assertEqual(rrset, r.additional[0])
+        self.assertEqual(m.sections, r.sections)
+
+    def test_from_wire_lazy_set_section(self):
+        r = self._lazy_test_response()
+        m = dns.message.from_wire(r.to_wire(), lazy=True)
+        m.answer = []
+        self.assertEqual(m.answer, [])
+        self.assertEqual(m.additional, r.additional)
+        self.assertIsNotNone(m._deferred)
+        self.assertEqual(m.authority, r.authority)
+        self.assertIsNone(m._deferred)
+
+    def test_from_wire_lazy_tsig(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        r = self._lazy_test_response()
+        r.use_tsig(keyring, "keyname.")
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, keyring=keyring, lazy=True)
+        self.assertIsNotNone(m.tsig)
+        self.assertEqual(m.additional, r.additional)
+        bad_wire = wire[:-1] + bytes([wire[-1] ^ 1])
+
+        def bad():
+            dns.message.from_wire(bad_wire, keyring=keyring, lazy=True)
+
+        self.assertRaises(dns.exception.DNSException, bad)
+
+    def test_from_wire_lazy_continue_on_error(self):
+        r = self._lazy_test_response()
+        wire = r.to_wire()
+        # Truncate the additional A record's rdata to 3 octets.
+        index = wire.rindex(b"\x00\x04\x0a\x00\x00\x02")
+        bad_wire = wire[:index] + b"\x00\x03\x0a\x00\x00" + wire[index + 6 :]
+        m = dns.message.from_wire(bad_wire, continue_on_error=True, lazy=True)
+        self.assertEqual(m.errors, [])
+        self.assertEqual(m.answer, r.answer)
+        self.assertEqual(m.additional, [])
+        self.assertEqual(len(m.errors), 1)
+
+        def bad():
+            m = dns.message.from_wire(bad_wire, lazy=True)
+            m.additional
+
+        self.assertRaises(dns.exception.FormError, bad)
+
+    def test_from_wire_lazy_rdata(self):
+        r = self._lazy_test_response()
+        r.answer.append(
+            dns.rrset.from_text(
+                "dnspython.org.",
+                300,
+                "IN",
+                "RRSIG",
+                "A 8 2 300 20200101000000 20030101000000 2143 dnspython.org. AQO8",
+            )
+        )
+        r.additional.append(
+            dns.rrset.from_text("ns1.dnspython.org.", 300, "IN", "TXT", "hello")
+        )
+        wire = r.to_wire()
+        m = dns.message.from_wire(wire, lazy_rdata=True)
+        self.assertIsInstance(m.answer[2][0], dns.rdata.LazyRdata)
+        self.assertIsInstance(m.additional[1][0], dns.rdata.LazyRdata)
+        self.assertNotIsInstance(m.answer[1][0], dns.rdata.LazyRdata)
+        self.assertEqual(m.answer[2].covers, dns.rdatatype.A)
+        self.assertEqual(m, r)
+        self.assertEqual(m.to_wire(), wire)
+        self.assertEqual(m.to_text(), r.to_text())
+
+    def test_iter_records(self):
+        r = self._lazy_test_response()
+        wire = r.to_wire()
+        records = list(dns.message.iter_records(wire))
+        self.assertEqual(
+            [(section, name, rdtype) for (section, name, rdtype, *_) in records],
+            [
+                (
+                    dns.message.QUESTION,
+                    dns.name.from_text("www.dnspython.org."),
+                    dns.rdatatype.A,
+                ),
+                (
+                    dns.message.ANSWER,
+                    dns.name.from_text("www.dnspython.org."),
+                    dns.rdatatype.CNAME,
+                ),
+                (
+                    dns.message.ANSWER,
+                    dns.name.from_text("dnspython.org."),
+                    dns.rdatatype.A,
+                ),
+                (
+                    dns.message.AUTHORITY,
+                    dns.name.from_text("dnspython.org."),
+                    dns.rdatatype.NS,
+                ),
+                (
+                    dns.message.ADDITIONAL,
+                    dns.name.from_text("ns1.dnspython.org."),
+                    dns.rdatatype.A,
+                ),
+                (dns.message.ADDITIONAL, dns.name.root, dns.rdatatype.OPT),
+            ],
+        )
+        (_, _, _, rdclass, ttl, rdata_offset, rdlen) = records[0]
+        self.assertEqual((rdclass, ttl, rdlen), (dns.rdataclass.IN, 0, 0))
+        self.assertEqual(rdata_offset, 12 + 19 + 4)
+        (_, _, rdtype, rdclass, ttl, rdata_offset, rdlen) = records[3]
+        self.assertEqual((rdclass, ttl), (dns.rdataclass.IN, 300))
+        rd = dns.rdata.from_wire(rdclass, rdtype, wire, rdata_offset, rdlen)
+        self.assertEqual(rd, r.authority[0][0])
+        self.assertEqual(records[-1][3], r.payload)
+
+    def test_iter_records_errors(self):
+        r = self._lazy_test_response()
+        wire = r.to_wire()
+        with self.assertRaises(dns.message.ShortHeader):
+            list(dns.message.iter_records(wire[:11]))
+        with self.assertRaises(dns.message.TrailingJunk):
+            list(dns.message.iter_records(wire + b"\x00"))
+        self.assertEqual(
+            len(list(dns.message.iter_records(wire + b"\x00", ignore_trailing=True))),
+            6,
+        )
+        records = []
+        with self.assertRaises(dns.exception.FormError):
+            for record in dns.message.iter_records(wire[:-1]):
+                records.append(record)
+        self.assertEqual(len(records), 5)
+
+    def test_peek(self):
+        r = self._lazy_test_response()
+        r.set_rcode(dns.rcode.NXDOMAIN)
+        wire = r.to_wire()
+        (id, flags, opcode, rcode, counts, question) = dns.message.peek(wire)
+        self.assertEqual(id, r.id)
+        self.assertEqual(flags, r.flags)
+        self.assertEqual(opcode, dns.opcode.QUERY)
+        self.assertEqual(rcode, dns.rcode.NXDOMAIN)
+        self.assertEqual(counts, (1, 2, 1, 2))
+        self.assertEqual(
+            question,
+            (
+                dns.name.from_text("www.dnspython.org."),
+                dns.rdatatype.A,
+                dns.rdataclass.IN,
+            ),
+        )
+        # Nothing after the question is read.
+        self.assertEqual(
+            dns.message.peek(wire[:35]), (id, flags, 0, 3, counts, question)
+        )
+
+    def test_peek_no_question(self):
+        u = dns.update.UpdateMessage("example.")
+        u.zone = []
+        (_, _, opcode, _, counts, question) = dns.message.peek(u.to_wire())
+        self.assertEqual(opcode, dns.opcode.UPDATE)
+        self.assertEqual(counts, (0, 0, 0, 0))
+        self.assertIsNone(question)
+
+    def test_peek_errors(self):
+        wire = dns.message.make_query("www.dnspython.org.", "A").to_wire()
+        with self.assertRaises(dns.message.ShortHeader):
+            dns.message.peek(wire[:11])
+        with self.assertRaises(dns.exception.FormError):
+            dns.message.peek(wire[:-1])
+
 
 if __name__ == "__main__":
     unittest.main()
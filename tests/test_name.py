@@ -26,6 +26,7 @@ from typing import Dict  # pylint: disable=unused-import
 import dns.e164
 import dns.name
 import dns.reversename
+import dns.wire
 
 # pylint: disable=line-too-long,unsupported-assignment-operation
 
@@ -193,6 +194,60 @@ class NameTestCase(unittest.TestCase):
         n2 = dns.name.from_text("foo.com")
         self.assertEqual(hash(n1), hash(n2))
 
+    def testHashCached(self):
+        n = dns.name.from_text("www.dnspython.org")
+        self.assertIsNone(n._hash)
+        h = hash(n)
+        self.assertEqual(n._hash, h)
+        self.assertEqual(hash(n), h)
+        with self.assertRaises(TypeError):
+            n._hash = 1
+
+    def testCanonicalKey(self):
+        texts = [
+            "",
+            ".",
+            "example.",
+            "a.example.",
+            "yljkjljk.a.example.",
+            "Z.a.example.",
+            "zABC.a.EXAMPLE.",
+            "z.example.",
+            "\\001.z.example.",
+            "*.z.example.",
+            "\\200.z.example.",
+            "\\000.z.example.",
+            "\\000\\001.z.example.",
+            "\\001\\000.z.example.",
+            "\\001.\\000.z.example.",
+            "\\000.\\001.z.example.",
+            "a\\000.example.",
+            "a.a\\000.example.",
+            "ab.example.",
+            "foo",
+            "a.foo",
+            "FOO",
+            "foo.bar",
+        ]
+        names = [dns.name.from_text(text, None) for text in texts]
+        for n1 in names:
+            for n2 in names:
+                order = n1.fullcompare(n2)[1]
+                k1 = n1.canonical_key()
+                k2 = n2.canonical_key()
+                self.assertEqual((k1 > k2) - (k1 < k2), (order > 0) - (order < 0))
+        self.assertEqual(sorted(names, key=dns.name.Name.canonical_key), sorted(names))
+
+    def testCanonicalKeyCached(self):
+        n = dns.name.from_text("www.dnspython.org")
+        self.assertIsNone(n._canonical_key)
+        k = n.canonical_key()
+        self.assertEqual(k, b"\x01org\x00dnspython\x00www")
+        self.assertIs(n.canonical_key(), k)
+        n2 = pickle.loads(pickle.dumps(n))
+        self.assertIsNone(n2._canonical_key)
+        self.assertEqual(n2.canonical_key(), k)
+
     def testCompare1(self):
         n1 = dns.name.from_text("a")
         n2 = dns.name.from_text("b")
@@ -495,6 +550,33 @@ class NameTestCase(unittest.TestCase):
         n2.to_wire(f, None)
         self.assertEqual(f.getvalue(), b"\x03FOO\x03bar\x00\x01\x61\x03foo\x03bar\x00")
 
+    def testToWireCompressionTableKeys(self):
+        n1 = dns.name.from_text("FOO.bar")
+        n2 = dns.name.from_text("a.Foo.BAR")
+        f = BytesIO()
+        f.write(b"\x00" * 12)
+        compress = dns.name.WireCompressTable()
+        n1.to_wire(f, compress)
+        n2.to_wire(f, compress)
+        self.assertEqual(
+            compress,
+            {
+                b"\x03foo\x03bar\x00": 12,
+                b"\x03bar\x00": 16,
+                b"\x01a\x03foo\x03bar\x00": 21,
+            },
+        )
+        self.assertEqual(f.getvalue()[12:], b"\x03FOO\x03bar\x00\x01a\xc0\x0c")
+
+    def testToWireCompressCanonicalize(self):
+        n1 = dns.name.from_text("FOO.bar")
+        n2 = dns.name.from_text("A.foo.BAR")
+        for compress in ({}, dns.name.WireCompressTable()):
+            f = BytesIO()
+            n1.to_wire(f, compress, canonicalize=True)
+            n2.to_wire(f, compress, canonicalize=True)
+            self.assertEqual(f.getvalue(), b"\x03foo\x03bar\x00\x01a\xc0\x00")
+
     def testToWire6(self):
         n = dns.name.from_text("FOO.bar")
         v = n.to_wire()
@@ -809,6 +891,52 @@ class NameTestCase(unittest.TestCase):
         e = dns.name.from_unicode(t)
         self.assertEqual(str(e), "xn--knigsgsschen-lcb0w.")
 
+    def testIDNACodecCache(self):
+        codec = dns.name.IDNA2003Codec()
+        self.assertEqual(codec.cache_size(), 0)
+        t = "Königsgäßchen.Königsgäßchen"
+        n = dns.name.from_unicode(t, idna_codec=codec)
+        self.assertEqual(codec.cache_hits(), 0)
+        self.assertEqual(codec.cache_misses(), 0)
+        codec.set_cache_size(2)
+        e = dns.name.from_unicode(t, idna_codec=codec)
+        self.assertEqual(e, n)
+        self.assertEqual(codec.cache_size(), 1)
+        self.assertEqual(codec.cache_hits(), 1)
+        self.assertEqual(codec.cache_misses(), 1)
+        self.assertEqual(
+            e.to_unicode(True, idna_codec=codec), "königsgässchen.königsgässchen"
+        )
+        self.assertEqual(codec.cache_size(), 2)
+        self.assertEqual(codec.cache_hits(), 2)
+        self.assertEqual(codec.cache_misses(), 2)
+        # The least-recently used label is removed when the cache is full.
+        dns.name.from_unicode("straße", idna_codec=codec)
+        self.assertEqual(codec.cache_size(), 2)
+        self.assertEqual(codec._cache.data.get("Königsgäßchen"), None)
+        codec.reset_cache_statistics()
+        self.assertEqual(codec.cache_hits(), 0)
+        self.assertEqual(codec.cache_misses(), 0)
+        codec.set_cache_size(1)
+        self.assertEqual(codec.cache_size(), 1)
+        codec.flush_cache()
+        self.assertEqual(codec.cache_size(), 0)
+        codec.set_cache_size(0)
+        self.assertIsNone(codec._cache)
+        self.assertEqual(dns.name.from_unicode(t, idna_codec=codec), n)
+        self.assertEqual(codec.cache_misses(), 0)
+
+    def testIDNACodecCacheErrors(self):
+        codec = dns.name.IDNA2003Codec(strict_decode=True)
+        codec.set_cache_size(10)
+        n = dns.name.Name([b"xn--0000h"])
+        for _ in range(2):
+            with self.assertRaises(dns.name.IDNAException):
+                n.to_unicode(idna_codec=codec)
+        # Failures are not cached.
+        self.assertEqual(codec.cache_size(), 0)
+        self.assertEqual(codec.cache_misses(), 2)
+
     @unittest.skipUnless(
         dns.name.have_idna_2008, "Python idna cannot be imported; no IDNA2008"
     )
@@ -1184,6 +1312,16 @@ class NameTestCase(unittest.TestCase):
         p = pickle.dumps(n1)
         n2 = pickle.loads(p)
         self.assertEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n2))
+
+    def test_pickle_with_cached_hash(self):
+        n1 = dns.name.from_text("foo.example")
+        hash(n1)
+        p = pickle.dumps(n1)
+        self.assertNotIn(b"_hash", p)
+        n2 = pickle.loads(p)
+        self.assertIsNone(n2._hash)
+        self.assertEqual(hash(n1), hash(n2))
 
     def test_pad_to_max_name(self):
         # Test edge cases in our padding helper.
@@ -1284,5 +1422,62 @@ class NameTestCase(unittest.TestCase):
             name.predecessor(origin, True)
 
 
+class NamePoolTestCase(unittest.TestCase):
+    def test_intern(self):
+        pool = dns.name.NamePool()
+        n1 = dns.name.from_text("www.dnspython.org.", name_pool=pool)
+        n2 = dns.name.from_text("www.dnspython.org.", name_pool=pool)
+        self.assertIs(n1, n2)
+        self.assertEqual(pool.hits(), 1)
+        self.assertEqual(pool.misses(), 1)
+        self.assertEqual(len(pool), 1)
+        pool.reset_statistics()
+        self.assertEqual(pool.hits(), 0)
+        self.assertEqual(pool.misses(), 0)
+
+    def test_intern_is_case_sensitive(self):
+        pool = dns.name.NamePool()
+        n1 = dns.name.from_text("www.dnspython.org.", name_pool=pool)
+        n2 = dns.name.from_text("WWW.dnspython.org.", name_pool=pool)
+        self.assertEqual(n1, n2)
+        self.assertIsNot(n1, n2)
+        self.assertEqual(n2.to_text(), "WWW.dnspython.org.")
+
+    def test_intern_root_and_unicode(self):
+        pool = dns.name.NamePool()
+        self.assertIs(
+            dns.name.from_text(".", name_pool=pool),
+            dns.name.from_text(".", name_pool=pool),
+        )
+        self.assertIs(
+            dns.name.from_unicode("K\u00f6nig.example.", name_pool=pool),
+            dns.name.from_text("K\u00f6nig.example.", name_pool=pool),
+        )
+
+    def test_lru(self):
+        pool = dns.name.NamePool(2)
+        a = pool.intern(dns.name.from_text("a."))
+        b = pool.intern(dns.name.from_text("b."))
+        # make "a." the most recently used
+        self.assertIs(pool.intern(dns.name.from_text("a.")), a)
+        pool.intern(dns.name.from_text("c."))
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.intern(dns.name.from_text("a.")), a)
+        self.assertIsNot(pool.intern(dns.name.from_text("b.")), b)
+        pool.set_max_size(0)
+        self.assertEqual(pool.max_size, 1)
+        self.assertEqual(len(pool), 1)
+        pool.flush()
+        self.assertEqual(len(pool), 0)
+
+    def test_parser(self):
+        pool = dns.name.NamePool()
+        wire = b"\x03www\x07example\x00\xc0\x00"
+        parser = dns.wire.Parser(wire, name_pool=pool)
+        n1 = parser.get_name()
+        n2 = parser.get_name()
+        self.assertIs(n1, n2)
+
+
 if __name__ == "__main__":
     unittest.main()
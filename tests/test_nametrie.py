@@ -0,0 +1,174 @@
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+import random
+import unittest
+
+import dns.name
+import dns.namedict
+import dns.nametrie
+
+
+def _n(text):
+    return dns.name.from_text(text, None)
+
+
+class NameTrieTestCase(unittest.TestCase):
+    def setUp(self):
+        self.names = [
+            _n("example."),
+            _n("a.example."),
+            _n("yljkjljk.a.example."),
+            _n("Z.a.example."),
+            _n("zABC.a.EXAMPLE."),
+            _n("z.example."),
+            _n("\\001.z.example."),
+            _n("*.z.example."),
+            _n("\\200.z.example."),
+            _n("com."),
+            _n("foo"),
+            _n("bar.foo"),
+        ]
+        self.trie = dns.nametrie.NameTrie(
+            (name, i) for i, name in enumerate(self.names)
+        )
+
+    def testMapping(self):
+        self.assertEqual(len(self.trie), len(self.names))
+        for i, name in enumerate(self.names):
+            self.assertIn(name, self.trie)
+            self.assertEqual(self.trie[name], i)
+        self.assertEqual(self.trie[_n("YLJKJLJK.a.example.")], 2)
+        self.assertNotIn(_n("b.example."), self.trie)
+        self.assertNotIn(_n("z.a.example"), self.trie)
+        self.assertNotIn(dns.name.root, self.trie)
+        with self.assertRaises(KeyError):
+            self.trie[_n("b.a.example.")]
+        # Like a dict, the first key is kept when an equal key is set.
+        self.trie[_n("COM.")] = 100
+        self.assertEqual(len(self.trie), len(self.names))
+        self.assertEqual(self.trie[_n("com.")], 100)
+        keys = [key for key in self.trie if key == _n("com.")]
+        self.assertEqual(keys[0].to_text(), "com.")
+
+    def testOrder(self):
+        self.assertEqual(list(self.trie), sorted(self.names))
+
+    def testBadKey(self):
+        with self.assertRaises(ValueError):
+            self.trie["example."] = 1
+
+    def testDelete(self):
+        del self.trie[_n("a.example.")]
+        self.assertEqual(len(self.trie), len(self.names) - 1)
+        self.assertNotIn(_n("a.example."), self.trie)
+        self.assertIn(_n("z.a.example."), self.trie)
+        with self.assertRaises(KeyError):
+            del self.trie[_n("a.example.")]
+        with self.assertRaises(KeyError):
+            del self.trie[_n("b.a.example.")]
+        for name in self.names:
+            if name in self.trie:
+                del self.trie[name]
+        self.assertEqual(len(self.trie), 0)
+        self.assertEqual(list(self.trie), [])
+        self.assertIsNone(self.trie._absolute.children)
+        self.assertIsNone(self.trie._relative.children)
+
+    def testSubtree(self):
+        subtree = list(self.trie.iter_subtree(_n("a.example.")))
+        self.assertEqual(
+            subtree,
+            [(name, self.trie[name]) for name in sorted(self.names[1:5])],
+        )
+        subtree = list(self.trie.iter_subtree(_n("example.")))
+        self.assertEqual(len(subtree), 9)
+        # The top of a subtree need not be in the trie.
+        self.assertEqual(len(list(self.trie.iter_subtree(dns.name.root))), 10)
+        self.assertEqual(list(self.trie.iter_subtree(_n("b.example."))), [])
+
+    def testDeepestMatch(self):
+        ndict = dns.namedict.NameDict((name, i) for i, name in enumerate(self.names))
+        for text in [
+            "example.",
+            "q.a.example.",
+            "q.yljkjljk.a.EXAMPLE.",
+            "www.com.",
+            "bar.foo",
+            "q.foo",
+        ]:
+            name = _n(text)
+            self.assertEqual(
+                self.trie.get_deepest_match(name), ndict.get_deepest_match(name)
+            )
+        with self.assertRaises(KeyError):
+            self.trie.get_deepest_match(_n("org."))
+        self.trie[dns.name.empty] = -1
+        self.assertEqual(self.trie.get_deepest_match(_n("org.")), (dns.name.empty, -1))
+        self.assertEqual(self.trie.get_deepest_match(_n("bar")), (dns.name.empty, -1))
+
+    def testNeighbours(self):
+        keys = sorted(self.names)
+        probes = list(keys)
+        probes.extend(
+            _n(text)
+            for text in [
+                "b.example.",
+                "zz.a.example.",
+                "0.a.example.",
+                "q.z.example.",
+                "example.com.",
+                "org.",
+                "aaa.",
+                ".",
+                "zzz",
+                "a.bar.foo",
+                "zzz.foo",
+            ]
+        )
+        probes.append(dns.name.empty)
+        for name in probes:
+            before = [key for key in keys if key < name]
+            after = [key for key in keys if key > name]
+            predecessor = self.trie.predecessor(name)
+            successor = self.trie.successor(name)
+            if before:
+                self.assertEqual(predecessor, (before[-1], self.trie[before[-1]]))
+            else:
+                self.assertIsNone(predecessor)
+            if after:
+                self.assertEqual(successor, (after[0], self.trie[after[0]]))
+            else:
+                self.assertIsNone(successor)
+
+    def testRandom(self):
+        rng = random.Random(42)
+        labels = ["a", "B", "c", "www", "mail", "\\000", "z"]
+        names = set()
+        for _ in range(500):
+            depth = rng.randint(0, 4)
+            text = ".".join(rng.choice(labels) for _ in range(depth))
+            name = dns.name.from_text(text) if text else dns.name.root
+            names.add(name)
+        trie = dns.nametrie.NameTrie({name: str(name) for name in names})
+        self.assertEqual(list(trie), sorted(names))
+        removed = rng.sample(sorted(names), len(names) // 2)
+        for name in removed:
+            del trie[name]
+            names.remove(name)
+        keys = sorted(names)
+        self.assertEqual(list(trie), keys)
+        for name in removed:
+            before = [key for key in keys if key < name]
+            after = [key for key in keys if key > name]
+            if before:
+                self.assertEqual(trie.predecessor(name)[0], before[-1])
+            else:
+                self.assertIsNone(trie.predecessor(name))
+            if after:
+                self.assertEqual(trie.successor(name)[0], after[0])
+            else:
+                self.assertIsNone(trie.successor(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
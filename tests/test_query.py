@@ -15,11 +15,14 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT
 # OF OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+import asyncio
 import contextlib
 import socket
 import sys
+import threading
 import time
 import unittest
+import unittest.mock
 
 try:
     import ssl
@@ -28,6 +31,8 @@ try:
 except Exception:
     have_ssl = False
 
+import dns.asyncbackend
+import dns.asyncquery
 import dns.exception
 import dns.flags
 import dns.inet
@@ -37,6 +42,8 @@ import dns.query
 import dns.rcode
 import dns.rdataclass
 import dns.rdatatype
+import dns.resolver
+import dns.rrset
 import dns.tsigkeyring
 import dns.zone
 import tests.util
@@ -45,7 +52,7 @@ import tests.util
 # and threading, so try to import it and if it doesn't work, skip
 # those tests.
 try:
-    from .nanonameserver import Server
+    from .nanonameserver import ConnectionType, Server
 
     _nanonameserver_available = True
 except ImportError:
@@ -613,6 +620,321 @@ class TsigTests(unittest.TestCase):
             self.assertTrue("1.2.3.4" in seen)
 
 
+def _answer_in_reverse(sock, count):
+    # Receive count queries, then answer them in the reverse order.
+    queries = []
+    for _ in range(count):
+        (wire, peer) = sock.recvfrom(65535)
+        queries.append((dns.message.from_wire(wire), peer))
+    for q, peer in reversed(queries):
+        r = dns.message.make_response(q)
+        r.answer.append(
+            dns.rrset.from_text(q.question[0].name, 300, "IN", "A", "1.2.3.4")
+        )
+        sock.sendto(r.to_wire(), peer)
+
+
+class UDPSocketPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def serve(self, count):
+        thread = threading.Thread(
+            target=_answer_in_reverse, args=(self.server, count), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def test_demultiplexing(self):
+        count = 4
+        thread = self.serve(count)
+        results = {}
+
+        def query(pool, n):
+            q = dns.message.make_query(f"www{n}.example.", "A")
+            results[n] = dns.query.udp(
+                q, "127.0.0.1", port=self.port, timeout=5, pool=pool
+            )
+
+        with dns.query.UDPSocketPool() as pool:
+            threads = [
+                threading.Thread(target=query, args=(pool, n)) for n in range(count)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            # All of the queries shared one socket.
+            self.assertEqual(len(pool.sockets), 1)
+            (pooled,) = pool.sockets.values()
+            self.assertEqual(pooled.uses, count)
+            self.assertEqual(pooled.waiters, {})
+        thread.join()
+        self.assertEqual(len(results), count)
+        for n, r in results.items():
+            self.assertEqual(r.question[0].name.to_text(), f"www{n}.example.")
+        self.assertTrue(pooled.sock.fileno() < 0)
+
+    def test_rotation(self):
+        with dns.query.UDPSocketPool(max_uses=2) as pool:
+            ports = []
+            for n in range(3):
+                thread = self.serve(1)
+                q = dns.message.make_query(f"www{n}.example.", "A")
+                dns.query.udp(q, "127.0.0.1", port=self.port, timeout=5, pool=pool)
+                thread.join()
+                (pooled,) = pool.sockets.values()
+                ports.append(pooled.sock.getsockname()[1])
+            self.assertEqual(ports[0], ports[1])
+            self.assertNotEqual(ports[1], ports[2])
+        with self.assertRaises(ValueError):
+            dns.query.udp(q, "127.0.0.1", port=self.port, timeout=5, pool=pool)
+        with self.assertRaises(ValueError):
+            dns.query.UDPSocketPool(max_uses=0)
+
+    def test_timeout(self):
+        with dns.query.UDPSocketPool() as pool:
+            q = dns.message.make_query("www.example.", "A")
+            with self.assertRaises(dns.exception.Timeout):
+                dns.query.udp(q, "127.0.0.1", port=self.port, timeout=0.1, pool=pool)
+            # A timeout does not retire the socket.
+            (pooled,) = pool.sockets.values()
+            self.assertFalse(pooled.retired)
+            self.assertEqual(pooled.waiters, {})
+
+    def test_question_type_case(self):
+        # Types 65 and 97 differ only in the bit which changes the case of
+        # a letter, which must not be ignored outside of the qname.
+        def answer_wrong_type():
+            (wire, peer) = self.server.recvfrom(65535)
+            q = dns.message.from_wire(wire)
+            rwire = bytearray(dns.message.make_response(q).to_wire())
+            qtype = 12 + len(q.question[0].name.to_wire())
+            rwire[qtype : qtype + 2] = b"\x00\x61"
+            self.server.sendto(rwire, peer)
+
+        thread = threading.Thread(target=answer_wrong_type, daemon=True)
+        thread.start()
+        with dns.query.UDPSocketPool() as pool, unittest.mock.patch.object(
+            dns.message, "from_wire", wraps=dns.message.from_wire
+        ) as from_wire:
+            q = dns.message.make_query("www.example.", 65)
+            with self.assertRaises(dns.exception.Timeout):
+                dns.query.udp(q, "127.0.0.1", port=self.port, timeout=0.5, pool=pool)
+        thread.join()
+        # The response was discarded without being parsed; only the server
+        # parsed anything.
+        self.assertEqual(from_wire.call_count, 1)
+
+
+class PipelinedTCPTests(unittest.TestCase):
+    def test_pipelined_tcp(self):
+        queries = [dns.message.make_query(f"www{n}.example.", "A") for n in range(10)]
+        for n, q in enumerate(queries):
+            q.id = n
+        with tests.util.ReversingTCPServer(10, 4) as server:
+            responses = dns.query.pipelined_tcp(
+                queries, "127.0.0.1", port=server.port, timeout=5, window=4
+            )
+        self.assertEqual(len(responses), 10)
+        for q, r in zip(queries, responses):
+            self.assertTrue(q.is_response(r))
+
+    def test_pipelined_tcp_bad_arguments(self):
+        q = dns.message.make_query("www.example.", "A")
+        with self.assertRaises(ValueError):
+            dns.query.pipelined_tcp([q, q], "127.0.0.1")
+        with self.assertRaises(ValueError):
+            dns.query.pipelined_tcp([q], "127.0.0.1", window=0)
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def test_reuse(self):
+        with tests.util.CountingTCPServer() as server:
+            with dns.query.ConnectionPool() as pool:
+                for n in range(3):
+                    q = dns.message.make_query(f"www{n}.example.", "A")
+                    r = dns.query.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                    self.assertTrue(q.is_response(r))
+                self.assertEqual(server.connections, 1)
+                self.assertEqual(sum(len(c) for c in pool.idle.values()), 1)
+            self.assertEqual(pool.idle, {})
+
+    def test_server_closes(self):
+        with tests.util.CountingTCPServer(close_after=1) as server:
+            with dns.query.ConnectionPool() as pool:
+                for n in range(3):
+                    q = dns.message.make_query(f"www{n}.example.", "A")
+                    r = dns.query.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                    self.assertTrue(q.is_response(r))
+                    # Let the server's close arrive.
+                    time.sleep(0.1)
+                self.assertEqual(server.connections, 3)
+
+    def test_idle_timeout(self):
+        with tests.util.CountingTCPServer() as server:
+            with dns.query.ConnectionPool(idle_timeout=0) as pool:
+                for n in range(2):
+                    q = dns.message.make_query(f"www{n}.example.", "A")
+                    dns.query.tcp(
+                        q, "127.0.0.1", port=server.port, timeout=5, pool=pool
+                    )
+                    time.sleep(0.01)
+                self.assertEqual(server.connections, 2)
+        with self.assertRaises(ValueError):
+            dns.query.ConnectionPool(max_idle_per_server=0)
+        with self.assertRaises(ValueError):
+            dns.query.ConnectionPool(max_connections_per_server=0)
+
+    def test_max_connections_per_server(self):
+        q = dns.message.make_query("www.example.", "A")
+        with tests.util.CountingTCPServer() as server:
+            with dns.query.ConnectionPool(max_connections_per_server=1) as pool:
+                dns.query.tcp(q, "127.0.0.1", timeout=2, port=server.port, pool=pool)
+                # Take the only connection, as another query would.
+                key = next(iter(pool.idle))
+                (s, _, taken) = pool._take(key)
+                self.assertTrue(taken)
+                with self.assertRaises(dns.exception.Timeout):
+                    dns.query.tcp(
+                        q, "127.0.0.1", timeout=0.2, port=server.port, pool=pool
+                    )
+                # A waiting query uses the connection once it is given back.
+                timer = threading.Timer(0.1, pool._give, (key, s))
+                timer.start()
+                dns.query.tcp(q, "127.0.0.1", timeout=2, port=server.port, pool=pool)
+                timer.join()
+                self.assertEqual(server.connections, 1)
+                self.assertEqual(pool.in_use, {})
+
+    @unittest.skipIf(not _nanonameserver_available, "nanonameserver required")
+    @unittest.skipIf(not have_ssl, "ssl not available")
+    def test_tls(self):
+        with TSIGNanoNameserver() as ns, dns.query.ConnectionPool() as pool:
+            (address, port) = ns.get_address(ConnectionType.DOT)
+            connections = set()
+            for n in range(3):
+                q = dns.message.make_query(f"www{n}.example.", "A")
+                r = dns.query.tls(
+                    q, address, port=port, timeout=5, verify=False, pool=pool
+                )
+                self.assertTrue(q.is_response(r))
+                connections.update(c for cs in pool.idle.values() for c, _ in cs)
+            self.assertEqual(len(connections), 1)
+            self.assertEqual(len(pool.session_cache), 1)
+            self.assertEqual(pool.session_cache.misses(), 1)
+
+    def test_resolver(self):
+        with tests.util.CountingTCPServer() as server:
+            with dns.resolver.Resolver(configure=False) as resolver:
+                resolver.nameservers = ["127.0.0.1"]
+                resolver.port = server.port
+                for n in range(3):
+                    answer = resolver.resolve(f"www{n}.example.", "A", tcp=True)
+                    self.assertEqual(answer[0].address, "1.2.3.4")
+            self.assertEqual(server.connections, 1)
+            self.assertTrue(resolver.connection_pool.closed)
+
+    def test_fork(self):
+        with tests.util.CountingTCPServer() as server:
+            with dns.query.ConnectionPool() as pool:
+                q = dns.message.make_query("www.example.", "A")
+                dns.query.tcp(q, "127.0.0.1", timeout=2, port=server.port, pool=pool)
+                self.assertEqual(len(pool.idle), 1)
+                # Pretend we are the child of a fork.
+                pool.pid = -1
+                dns.query.tcp(q, "127.0.0.1", timeout=2, port=server.port, pool=pool)
+                self.assertEqual(server.connections, 2)
+
+
+@unittest.skipIf(not _nanonameserver_available, "nanonameserver required")
+@unittest.skipIf(not have_ssl, "ssl not available")
+class TLSSessionCacheTests(unittest.TestCase):
+    def test_resumption(self):
+        cache = dns.query.TLSSessionCache()
+        with TSIGNanoNameserver() as ns:
+            (address, port) = ns.get_address(ConnectionType.DOT)
+            for n in range(3):
+                q = dns.message.make_query(f"www{n}.example.", "A")
+                r = dns.query.tls(
+                    q, address, port=port, timeout=5, verify=False, session_cache=cache
+                )
+                self.assertTrue(q.is_response(r))
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.misses(), 1)
+            self.assertEqual(cache.hits(), 2)
+            cache.reset_statistics()
+            self.assertEqual(cache.hits(), 0)
+            self.assertEqual(cache.misses(), 0)
+            cache.flush()
+            self.assertEqual(len(cache), 0)
+            dns.query.tls(
+                q, address, port=port, timeout=5, verify=False, session_cache=cache
+            )
+            self.assertEqual(cache.misses(), 1)
+
+    def test_default_cache(self):
+        cache = dns.query.TLSSessionCache()
+        with TSIGNanoNameserver() as ns, unittest.mock.patch.object(
+            dns.query, "default_tls_session_cache", cache
+        ):
+            (address, port) = ns.get_address(ConnectionType.DOT)
+            for n in range(2):
+                q = dns.message.make_query(f"www{n}.example.", "A")
+                dns.query.tls(q, address, port=port, timeout=5, verify=False)
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.misses(), 1)
+            self.assertEqual(cache.hits(), 1)
+
+    def test_async(self):
+        async def run():
+            for n in range(2):
+                q = dns.message.make_query(f"www{n}.example.", "A")
+                await dns.asyncquery.tls(
+                    q, address, port=port, timeout=5, verify=False, backend=backend
+                )
+            async with dns.asyncquery.ConnectionPool() as pool:
+                await dns.asyncquery.tls(
+                    q, address, port=port, timeout=5, verify=False, pool=pool
+                )
+                return pool.session_cache.misses()
+
+        backend = dns.asyncbackend.get_backend("asyncio")
+        cache = dns.query.TLSSessionCache()
+        with TSIGNanoNameserver() as ns, unittest.mock.patch.object(
+            dns.query, "default_tls_session_cache", cache
+        ):
+            (address, port) = ns.get_address(ConnectionType.DOT)
+            pool_misses = asyncio.run(run())
+        # The asynchronous backends cannot resume sessions.
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.misses(), 2)
+        self.assertEqual(cache.hits(), 0)
+        self.assertEqual(pool_misses, 1)
+
+    def test_max_size(self):
+        cache = dns.query.TLSSessionCache(max_size=1)
+        with TSIGNanoNameserver() as ns1, TSIGNanoNameserver() as ns2:
+            q = dns.message.make_query("www.example.", "A")
+            for ns in (ns1, ns2):
+                (address, port) = ns.get_address(ConnectionType.DOT)
+                dns.query.tls(
+                    q, address, port=port, timeout=5, verify=False, session_cache=cache
+                )
+            self.assertEqual(len(cache), 1)
+            cache.set_max_size(0)
+            self.assertEqual(cache.max_size, 1)
+
+
 @unittest.skipIf(sys.platform == "win32", "low level tests do not work on win32")
 class LowLevelWaitTests(unittest.TestCase):
     def test_wait_for(self):
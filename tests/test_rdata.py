@@ -28,6 +28,7 @@ import dns.rdata
 import dns.rdataclass
 import dns.rdataset
 import dns.rdatatype
+import dns.rdtypes.ANY.DS
 import dns.rdtypes.ANY.RRSIG
 import dns.rdtypes.IN.APL
 import dns.rdtypes.util
@@ -288,6 +289,67 @@ class RdataTestCase(unittest.TestCase):
         r4 = pickle.loads(p)
         self.assertEqual(r3, r4)
 
+    def test_digestable_cached(self):
+        rd = dns.rdata.from_text("IN", "MX", "10 Mail.Example.")
+        self.assertIsNone(rd._digestable)
+        h = hash(rd)
+        self.assertEqual(rd._digestable, (rd.to_digestable(), False))
+        self.assertEqual(rd._digestable[0], b"\x00\x0a\x04mail\x07example\x00")
+        self.assertEqual(hash(rd), h)
+        self.assertEqual(rd, dns.rdata.from_text("IN", "MX", "10 mail.example."))
+        # The cache is not pickled.
+        self.assertNotIn("_digestable", rd.__getstate__())
+        rd2 = pickle.loads(pickle.dumps(rd))
+        self.assertIsNone(rd2._digestable)
+        self.assertEqual(rd2, rd)
+        # Nor does it survive replace().
+        rd3 = rd.replace(preference=20)
+        self.assertIsNone(rd3._digestable)
+        self.assertNotEqual(rd3, rd)
+
+    def test_digestable_cached_relative(self):
+        rd = dns.rdata.from_text("IN", "MX", "10 mail", relativize=False)
+        self.assertEqual(hash(rd), hash(rd.to_digestable(dns.name.root)))
+        self.assertEqual(rd._digestable, (rd.to_digestable(dns.name.root), True))
+        self.assertNotEqual(rd, dns.rdata.from_text("IN", "MX", "10 mail."))
+
+    def test_from_wire_trusted(self):
+        # Rdata read from wire without revalidation must be the same as
+        # rdata made by the validating constructor.
+        cases = [
+            ("A", "10.0.0.1"),
+            ("AAAA", "2001:db8::1"),
+            ("CNAME", "www.example."),
+            ("NS", "ns1.example."),
+            ("MX", "10 mail.example."),
+            ("TXT", '"v=spf1" "" "-all"'),
+            ("SOA", "ns1.example. hostmaster.example. 4294967295 1 2 3 4"),
+        ]
+        for rdtype, text in cases:
+            rd1 = dns.rdata.from_text("IN", rdtype, text)
+            wire = rd1.to_wire()
+            rd2 = dns.rdata.from_wire("IN", rdtype, wire, 0, len(wire))
+            self.assertIs(type(rd2), type(rd1))
+            self.assertEqual(rd2, rd1)
+            for slot in rd1._get_all_slots():
+                value = getattr(rd2, slot)
+                self.assertEqual(value, getattr(rd1, slot))
+                self.assertIs(type(value), type(getattr(rd1, slot)))
+            self.assertIsInstance(rd2.rdclass, dns.rdataclass.RdataClass)
+            self.assertIsInstance(rd2.rdtype, dns.rdatatype.RdataType)
+            with self.assertRaises(TypeError):
+                rd2.rdcomment = "foo"
+
+    def test_from_wire_trusted_still_checks(self):
+        # Invariants the wire format doesn't guarantee are still checked.
+        for rdtype, wire in [
+            ("A", b"\x0a\x00\x00"),
+            ("AAAA", b"\x20\x01"),
+            ("TXT", b""),
+        ]:
+            with self.assertRaises(dns.exception.FormError):
+                dns.rdata.from_wire("IN", rdtype, wire, 0, len(wire))
+
     def test_AFSDB_properties(self):
         rd = dns.rdata.from_text(
             dns.rdataclass.IN, dns.rdatatype.AFSDB, "0 afsdb.example."
@@ -519,6 +581,7 @@ class RdataTestCase(unittest.TestCase):
         expected_mx = dns.rdata.from_text("in", "mx", "10 mx.example.")
         with open(here("mx-2-0.pickle"), "rb") as f:
             mx = pickle.load(f)
+        self.assertIsNone(mx._digestable)
         self.assertEqual(mx, expected_mx)
         self.assertIsNone(mx.rdcomment)
 
@@ -1063,5 +1126,96 @@ class RdataConvertersTestCase(unittest.TestCase):
             Rdata._as_ttl(dns.ttl.MAX_TTL + 1)
 
 
+class LazyRdataTestCase(unittest.TestCase):
+    def _lazy(self, rdtype, text, origin=None):
+        rd = dns.rdata.from_text("IN", rdtype, text)
+        wire = rd.to_wire()
+        parser = dns.wire.Parser(wire)
+        with parser.restrict_to(len(wire)):
+            return (rd, dns.rdata.from_wire_parser("IN", rdtype, parser, origin, True))
+
+    def test_lazy_txt(self):
+        (rd, lazy) = self._lazy("TXT", '"hello" "world"')
+        self.assertIsInstance(lazy, dns.rdata.LazyRdata)
+        self.assertIsNone(lazy._rdata)
+        self.assertEqual(lazy.to_wire(), rd.to_wire())
+        self.assertEqual(lazy.to_digestable(), rd.to_digestable())
+        self.assertEqual(lazy, rd)
+        self.assertEqual(rd, lazy)
+        self.assertEqual(hash(lazy), hash(rd))
+        self.assertIsNone(lazy._rdata)
+        self.assertEqual(lazy.strings, (b"hello", b"world"))
+        self.assertEqual(lazy.to_text(), '"hello" "world"')
+        self.assertIs(lazy.decode(), lazy._rdata)
+        self.assertEqual(lazy.decode(), rd)
+        self.assertEqual(lazy.replace(strings=["hi"]).strings, (b"hi",))
+
+    def test_lazy_rrsig(self):
+        (rd, lazy) = self._lazy(
+            "RRSIG",
+            "NSEC 1 3 3600 20200101000000 20030101000000 2143 FOO.example. "
+            "AQO8XS4y9r77X9SHBmrxMoJf1Pf9AT9Mr/L5BBGtO9/e9f/zl4FFgM2l "
+            "B6M2XEm6mp6mit4tzpB/sAEQw1McYz6bJdKkTiqtuWTCfDmgQhI6/Ha0 "
+            "EfGPNSqnY99FmbSeWNIRaa4fgSCVFhvbrYq1nXkNVyQPeEVHkoDNCXlK",
+        )
+        self.assertIsInstance(lazy, dns.rdata.LazyRdata)
+        self.assertEqual(lazy.covers(), dns.rdatatype.NSEC)
+        self.assertEqual(lazy.to_wire(), rd.to_wire())
+        # The signer's case is preserved when rendering, but not in the
+        # canonical form.
+        self.assertIn(b"\x03FOO", lazy.to_wire())
+        self.assertEqual(lazy.to_digestable(), rd.to_digestable())
+        self.assertEqual(lazy.to_wire(canonicalize=True), rd.to_digestable())
+        self.assertEqual(lazy, rd)
+        self.assertLess(lazy, rd.replace(key_tag=2144))
+        self.assertIsNone(lazy._rdata)
+        self.assertEqual(lazy.signer, dns.name.from_text("FOO.example."))
+        self.assertIsNotNone(lazy._rdata)
+
+    def test_lazy_rrsig_not_lazy(self):
+        text = "NSEC 1 3 3600 20200101000000 20030101000000 2143 foo.example. AQO8"
+        (rd, _) = self._lazy("RRSIG", text)
+        # relativized signer
+        (_, rd2) = self._lazy("RRSIG", text, dns.name.from_text("example."))
+        self.assertNotIsInstance(rd2, dns.rdata.LazyRdata)
+        self.assertEqual(rd2.signer, dns.name.from_text("foo", None))
+        # compressed signer
+        wire = b"\x07example\x00" + rd.to_wire()[:18] + b"\x03foo\xc0\x00AQO8"
+        parser = dns.wire.Parser(wire, 9)
+        with parser.restrict_to(len(wire) - 9):
+            rd3 = dns.rdata.from_wire_parser("IN", "RRSIG", parser, None, True)
+        self.assertNotIsInstance(rd3, dns.rdata.LazyRdata)
+        self.assertEqual(rd3.signer, dns.name.from_text("foo.example."))
+
+    def test_lazy_not_lazy_type(self):
+        (_, rd) = self._lazy("MX", "10 mail.example.")
+        self.assertNotIsInstance(rd, dns.rdata.LazyRdata)
+
+    def test_lazy_bad_rdata(self):
+        parser = dns.wire.Parser(b"\x00\x03\x08")
+        with parser.restrict_to(3):
+            rd = dns.rdata.from_wire_parser("IN", "DS", parser, None, True)
+        self.assertIsInstance(rd, dns.rdata.LazyRdata)
+        with self.assertRaises(dns.exception.FormError):
+            rd.decode()
+
+    def test_lazy_bad_rrsig_covers(self):
+        rd = dns.rdata.LazyRdata(dns.rdataclass.IN, dns.rdatatype.RRSIG, b"\x00")
+        with self.assertRaises(dns.exception.FormError):
+            rd.covers()
+
+    def test_decode(self):
+        (rd, lazy) = self._lazy("DS", "12345 8 2 " + "ab" * 32)
+        self.assertNotIsInstance(lazy, dns.rdtypes.ANY.DS.DS)
+        self.assertIsInstance(dns.rdata.decode(lazy), dns.rdtypes.ANY.DS.DS)
+        self.assertIs(dns.rdata.decode(rd), rd)
+
+    def test_lazy_pickle(self):
+        (rd, lazy) = self._lazy("DS", "12345 8 2 " + "ab" * 32)
+        lazy2 = pickle.loads(pickle.dumps(lazy))
+        self.assertEqual(lazy2, rd)
+        self.assertEqual(lazy2.digest, rd.digest)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -37,6 +37,28 @@ class RendererTestCase(unittest.TestCase):
         expected.id = message.id
         self.assertEqual(message, expected)
 
+    def test_get_wire_into(self):
+        r = dns.renderer.Renderer(id=1, flags=dns.flags.QR)
+        qname = dns.name.from_text("foo.example")
+        r.add_question(qname, dns.rdatatype.A)
+        rds = dns.rdataset.from_text("in", "a", 30, "10.0.0.1", "10.0.0.2")
+        r.add_rdataset(dns.renderer.ANSWER, qname, rds)
+        r.write_header()
+        wire = r.get_wire()
+        buffer = bytearray(b"\xff" * 100)
+        self.assertEqual(r.get_wire_into(buffer), len(wire))
+        self.assertEqual(bytes(buffer[: len(wire)]), wire)
+        self.assertEqual(r.get_wire_into(memoryview(buffer), 2), len(wire))
+        self.assertEqual(bytes(buffer[2 : len(wire) + 2]), wire)
+        with self.assertRaises(dns.exception.TooBig):
+            r.get_wire_into(bytearray(len(wire) - 1))
+        with self.assertRaises(dns.exception.TooBig):
+            r.get_wire_into(buffer, 100 - len(wire) + 1)
+        # The renderer can still be used after copying.
+        r.add_rdataset(dns.renderer.ANSWER, qname, rds)
+        r.write_header()
+        self.assertEqual(r.get_wire_into(buffer), len(r.get_wire()))
+
     def test_tsig(self):
         r = dns.renderer.Renderer(flags=dns.flags.RD, max_size=512)
         qname = dns.name.from_text("foo.example")
@@ -0,0 +1,164 @@
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+import unittest
+
+import dns.edns
+import dns.flags
+import dns.message
+import dns.name
+import dns.rdataset
+import dns.responsecache
+import dns.tsigkeyring
+import dns.versioned
+import dns.zone
+
+zone_text = """
+@ 300 IN SOA ns1 hostmaster 1 7200 900 1209600 86400
+@ 300 IN NS ns1
+ns1 300 IN A 10.0.0.1
+www 300 IN A 10.0.0.2
+www 300 IN A 10.0.0.3
+"""
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.zone = dns.zone.from_text(
+            zone_text, "example.", zone_factory=dns.versioned.Zone
+        )
+        self.cache = dns.responsecache.ResponseCache()
+
+    def respond(self, wire):
+        # A minimal authoritative server.
+        query = dns.message.from_wire(wire)
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        question = query.question[0]
+        with self.zone.reader() as txn:
+            rdataset = txn.get(question.name, question.rdtype)
+            if rdataset is not None:
+                rrset = response.find_rrset(
+                    response.answer,
+                    question.name,
+                    question.rdclass,
+                    question.rdtype,
+                    create=True,
+                )
+                rrset.update(rdataset)
+            return (response.to_wire(), txn.version.id)
+
+    def serve(self, query):
+        wire = query.to_wire()
+        response = self.cache.get(wire)
+        if response is None:
+            (response, version_id) = self.respond(wire)
+            self.cache.put(wire, response, self.zone, version_id)
+        return dns.message.from_wire(response)
+
+    def test_hit(self):
+        q1 = dns.message.make_query("www.example.", "A", id=1)
+        r1 = self.serve(q1)
+        self.assertEqual(self.cache.misses(), 1)
+        self.assertEqual(self.cache.hits(), 0)
+        self.assertTrue(q1.is_response(r1))
+        self.assertEqual(len(r1.answer[0]), 2)
+        # A hit has the id and question case of its query.
+        q2 = dns.message.make_query("WwW.eXample.", "A", id=2)
+        r2 = self.serve(q2)
+        self.assertEqual(self.cache.hits(), 1)
+        self.assertTrue(q2.is_response(r2))
+        self.assertEqual(r2.id, 2)
+        self.assertEqual(r2.question[0].name.to_text(), "WwW.eXample.")
+        self.assertEqual(r2.answer, r1.answer)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.reset_statistics()
+        self.assertEqual(self.cache.hits(), 0)
+        self.assertEqual(self.cache.misses(), 0)
+        self.cache.flush()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_key(self):
+        queries = [
+            dns.message.make_query("www.example.", "A"),
+            dns.message.make_query("www.example.", "AAAA"),
+            dns.message.make_query("www.example.", "A", flags=0),
+            dns.message.make_query(
+                "www.example.", "A", flags=dns.flags.RD | dns.flags.AD
+            ),
+            dns.message.make_query("www.example.", "A", use_edns=0),
+            dns.message.make_query("www.example.", "A", use_edns=0, payload=4096),
+            dns.message.make_query("www.example.", "A", want_dnssec=True),
+            dns.message.make_query("ns1.example.", "A"),
+        ]
+        for query in queries:
+            self.serve(query)
+        self.assertEqual(len(self.cache), len(queries))
+        self.assertEqual(self.cache.misses(), len(queries))
+        for query in queries:
+            response = self.serve(query)
+            self.assertTrue(query.is_response(response))
+            self.assertEqual(response.edns, query.edns)
+        self.assertEqual(self.cache.hits(), len(queries))
+
+    def test_uncacheable(self):
+        keyring = dns.tsigkeyring.from_text({"keyname.": "NjHwPsMKjdN++dOfE5iAiQ=="})
+        signed = dns.message.make_query("www.example.", "A")
+        signed.use_tsig(keyring)
+        queries = [
+            dns.message.make_query(
+                "www.example.", "A", options=[dns.edns.ECSOption("1.2.3.0")]
+            ),
+            signed,
+            dns.message.make_response(dns.message.make_query("www.example.", "A")),
+            dns.message.Message(),
+        ]
+        response = self.respond(queries[0].to_wire())[0]
+        for query in queries:
+            wire = query.to_wire()
+            self.assertFalse(self.cache.put(wire, response))
+            self.assertIsNone(self.cache.get(wire))
+        self.assertIsNone(self.cache.get(b"\x00" * 11))
+        self.assertIsNone(self.cache.get(b"\x00" * 4 + b"\x00\x01" + b"\x00" * 6))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.misses(), 0)
+
+    def test_wrong_response(self):
+        q1 = dns.message.make_query("www.example.", "A").to_wire()
+        q2 = dns.message.make_query("ns1.example.", "A").to_wire()
+        with self.assertRaises(ValueError):
+            self.cache.put(q1, self.respond(q2)[0])
+
+    def test_zone_change(self):
+        query = dns.message.make_query("www.example.", "A")
+        self.serve(query)
+        self.serve(query)
+        self.assertEqual(self.cache.hits(), 1)
+        with self.zone.writer() as txn:
+            txn.replace("www", dns.rdataset.from_text("IN", "A", 300, "10.0.0.4"))
+        response = self.serve(query)
+        self.assertEqual(self.cache.hits(), 1)
+        self.assertEqual(self.cache.misses(), 2)
+        self.assertEqual(response.answer[0][0].address, "10.0.0.4")
+        response = self.serve(query)
+        self.assertEqual(self.cache.hits(), 2)
+        self.assertEqual(response.answer[0][0].address, "10.0.0.4")
+
+    def test_max_size(self):
+        cache = dns.responsecache.ResponseCache(2)
+        wires = [
+            dns.message.make_query(name, "A").to_wire()
+            for name in ["www.example.", "ns1.example.", "example."]
+        ]
+        for wire in wires:
+            self.assertTrue(cache.put(wire, self.respond(wire)[0]))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(wires[0]))
+        self.assertIsNotNone(cache.get(wires[1]))
+        self.assertIsNotNone(cache.get(wires[2]))
+        cache.set_max_size(0)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(wires[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -179,6 +179,13 @@ class TSIGTestCase(unittest.TestCase):
         # not raising is passing
         dns.message.from_wire(w, keyring)
 
+    def test_sign_and_validate_buffer(self):
+        m = dns.message.make_query("example", "a")
+        m.use_tsig(keyring, keyname)
+        w = m.to_wire()
+        # not raising is passing
+        dns.message.from_wire(memoryview(bytearray(w)), keyring)
+
     def test_signature_is_invalid(self):
         m = dns.message.make_query("example", "a")
         m.use_tsig(keyring, keyname)
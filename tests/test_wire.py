@@ -1,5 +1,6 @@
 # Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
 
+import mmap
 import unittest
 
 import dns.exception
@@ -54,6 +55,53 @@ class BinaryTestCase(unittest.TestCase):
         # verify the restore_furthest()
         self.assertEqual(p.current, len(wire))
 
+    def test_compressed_name_suffixes(self):
+        wire = b"\x09dnspython\x03org\x00\x03www\xc0\x00\x03ftp\xc0\x0f\xc0\x0f"
+        p = dns.wire.Parser(wire)
+        self.assertEqual(p.get_name(), dns.name.from_text("dnspython.org"))
+        self.assertEqual(
+            p.name_suffixes,
+            {0: (b"dnspython", b"org", b""), 10: (b"org", b"")},
+        )
+        self.assertEqual(p.get_name(), dns.name.from_text("www.dnspython.org"))
+        self.assertEqual(p.name_suffixes[15], (b"www", b"dnspython", b"org", b""))
+        self.assertEqual(p.get_name(), dns.name.from_text("ftp.www.dnspython.org"))
+        self.assertEqual(p.get_name(), dns.name.from_text("www.dnspython.org"))
+        self.assertEqual(p.remaining(), 0)
+
+    def test_compressed_name_suffix_bad_pointer(self):
+        # Pointers are still checked for pointing backwards even if there are
+        # already decoded suffixes.
+        wire = b"\x03org\x00\xc0\x00\xc0\x07"
+        p = dns.wire.Parser(wire)
+        p.get_name()
+        p.get_name()
+        with self.assertRaises(dns.name.BadPointer):
+            p.get_name()
+
+    def test_buffers(self):
+        wire = b"\x03www\x09dnspython\x03org\x00\x00\x02\x00\x00\x00\x01\xff"
+        expected = dns.name.from_text("www.dnspython.org")
+        with mmap.mmap(-1, len(wire)) as m:
+            m.write(wire)
+            for buffer in (bytearray(wire), memoryview(wire), m):
+                p = dns.wire.Parser(buffer)
+                self.assertEqual(p.get_name(), expected)
+                self.assertEqual(p.get_uint16(), 2)
+                self.assertEqual(p.get_uint32(), 1)
+                value = p.get_bytes(1)
+                self.assertIsInstance(value, bytes)
+                self.assertEqual(value, b"\xff")
+                self.assertEqual(p.remaining(), 0)
+                with self.assertRaises(dns.exception.FormError):
+                    p.get_uint8()
+                del p
+
+    def test_bytes_not_copied(self):
+        wire = b"\x00\x01\x02"
+        p = dns.wire.Parser(wire)
+        self.assertIs(p.get_remaining(), wire)
+
     def test_seek(self):
         wire = b"\x09dnspython\x03org\x00"
         p = dns.wire.Parser(wire)
@@ -474,6 +474,19 @@ class ZoneTestCase(unittest.TestCase):
             f.write("\n")
         self.assertEqual(f.getvalue(), example_text_output)
 
+    def testFromTextWithNamePool(self):
+        pool = dns.name.NamePool()
+        z = dns.zone.from_text(
+            example_text, "example.", relativize=True, name_pool=pool
+        )
+        self.assertEqual(z, dns.zone.from_text(example_text, "example."))
+        self.assertGreater(pool.hits(), 0)
+        ns = z.find_rdataset("@", "NS")
+        for name in z.nodes.keys():
+            self.assertIs(pool.intern(name), name)
+        for rd in ns:
+            self.assertIs(pool.intern(rd.target), rd.target)
+
     def testGenerate(self):
         z = dns.zone.from_text(example_generate, "example.", relativize=True)
         f = StringIO()
@@ -1224,6 +1237,19 @@ class VersionedZoneTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             z.reader(1, 1)
 
+    def testCurrentVersionId(self):
+        z = dns.zone.from_text(
+            example_text, "example.", relativize=True, zone_factory=dns.versioned.Zone
+        )
+        id = z.current_version_id()
+        with z.reader() as txn:
+            self.assertEqual(txn.version.id, id)
+        with z.writer() as txn:
+            txn.delete("bar.foo")
+        self.assertGreater(z.current_version_id(), id)
+        with z.reader() as txn:
+            self.assertEqual(txn.version.id, z.current_version_id())
+
     def testUnknownVersion(self):
         z = dns.zone.from_text(
             example_text, "example.", relativize=True, zone_factory=dns.versioned.Zone
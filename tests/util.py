@@ -18,12 +18,16 @@
 import enum
 import inspect
 import os
+import socket
+import struct
+import threading
 
 import dns.message
 import dns.name
 import dns.query
 import dns.rdataclass
 import dns.rdatatype
+import dns.rrset
 
 # Cache for is_internet_reachable()
 _internet_reachable = None
@@ -131,3 +135,104 @@ def is_docker() -> bool:
         return os.path.isfile("/.dockerenv")
     except Exception:
         return False
+
+
+def read_exactly(conn, count):
+    data = b""
+    while len(data) < count:
+        n = conn.recv(count - len(data))
+        if not n:
+            raise EOFError
+        data += n
+    return data
+
+
+class ReversingTCPServer:
+    """A TCP server for testing pipelined queries.  It accepts one connection,
+    reads up to *window* queries at a time, and answers each batch in reverse
+    order, stopping after *count* queries.
+    """
+
+    def __init__(self, count, window):
+        self.count = count
+        self.window = window
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(1)
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.thread.join()
+        self.listener.close()
+
+    def serve(self):
+        (conn, _) = self.listener.accept()
+        with conn:
+            left = self.count
+            while left > 0:
+                batch = []
+                for _ in range(min(self.window, left)):
+                    (l,) = struct.unpack("!H", read_exactly(conn, 2))
+                    batch.append(dns.message.from_wire(read_exactly(conn, l)))
+                left -= len(batch)
+                for q in reversed(batch):
+                    r = dns.message.make_response(q)
+                    r.answer.append(
+                        dns.rrset.from_text(
+                            q.question[0].name, 300, "IN", "A", "1.2.3.4"
+                        )
+                    )
+                    conn.sendall(r.to_wire(prepend_length=True))
+
+
+class CountingTCPServer:
+    """A TCP server which answers any number of queries on each connection
+    with an A record, counting the connections it accepts.  If *close_after*
+    is not ``None``, each connection is closed after that many queries.
+    """
+
+    def __init__(self, close_after=None):
+        self.close_after = close_after
+        self.connections = 0
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(8)
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.listener.close()
+
+    def serve(self):
+        while True:
+            try:
+                (conn, _) = self.listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.answer, args=(conn,), daemon=True).start()
+
+    def answer(self, conn):
+        with conn:
+            answered = 0
+            while self.close_after is None or answered < self.close_after:
+                try:
+                    (l,) = struct.unpack("!H", read_exactly(conn, 2))
+                    q = dns.message.from_wire(read_exactly(conn, l))
+                except (EOFError, OSError):
+                    return
+                r = dns.message.make_response(q)
+                r.answer.append(
+                    dns.rrset.from_text(q.question[0].name, 300, "IN", "A", "1.2.3.4")
+                )
+                conn.sendall(r.to_wire(prepend_length=True))
+                answered += 1
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+# Micro-benchmark for dns.name.Name hashing.
+#
+# Names are the keys of zone node dictionaries, message indices, and
+# compression tables.  This measures dictionary lookups in a large zone and
+# parsing, indexing, and rendering a large message, both with the cached
+# hash and with the hash recomputed on every call (the previous behavior).
+
+import contextlib
+import sys
+import timeit
+
+import dns.message
+import dns.name
+import dns.rrset
+import dns.zone
+
+
+def uncached_hash(self):
+    h = 0
+    for label in self.labels:
+        for c in label.lower():
+            h += (h << 3) + c
+    return h
+
+
+@contextlib.contextmanager
+def hash_not_cached():
+    cached_hash = dns.name.Name.__hash__
+    dns.name.Name.__hash__ = uncached_hash
+    try:
+        yield
+    finally:
+        dns.name.Name.__hash__ = cached_hash
+
+
+def compare(what, function, repeat=5):
+    with hash_not_cached():
+        before = min(timeit.repeat(function, number=1, repeat=repeat))
+    after = min(timeit.repeat(function, number=1, repeat=repeat))
+    print(f"{what}: before {before:.3f}s after {after:.3f}s ({before / after:.1f}x)")
+
+
+def bench_zone(count):
+    zone = dns.zone.Zone("example.")
+    for i in range(count):
+        name = dns.name.from_text(f"host-{i}.sub-{i % 100}", zone.origin)
+        zone.find_rdataset(name, "A", create=True)
+    names = list(zone.nodes.keys())
+
+    def lookups():
+        nodes = zone.nodes
+        for name in names:
+            nodes[name]
+
+    compare(f"zone lookups ({count} names)", lookups)
+
+
+def bench_message(count):
+    q = dns.message.make_query("www.example.", "A")
+    r = dns.message.make_response(q)
+    for i in range(count):
+        rrset = dns.rrset.from_text(f"www{i}.example.", 300, "IN", "A", "10.0.0.1")
+        r.answer.append(rrset)
+    wire = r.to_wire()
+
+    def parse_index_render():
+        m = dns.message.from_wire(wire)
+        for rrset in m.answer:
+            m.find_rrset(m.answer, rrset.name, rrset.rdclass, rrset.rdtype)
+        m.to_wire()
+
+    compare(f"message parse/index/render ({count} rrsets)", parse_index_render)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    bench_zone(count)
+    bench_message(min(count, 1000))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# Copyright (C) Dnspython Contributors, see LICENSE for text of ISC license
+
+# Micro-benchmark for dns.rdata.from_wire_parser().
+#
+# Rdata are made in great numbers when messages and zones are read, so the
+# cost of constructing them matters.  This measures reading the common rdata
+# types from wire format, and constructing them directly, both with their
+# unguarded constructors and with the immutable guard put back around them
+# (the previous behavior).  Types read via Rdata._from_trusted() do not call
+# their constructors when read from wire format, so only their constructor
+# times change.
+
+import contextlib
+import inspect
+import sys
+import timeit
+import types
+
+import dns._immutable_ctx
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+import dns.wire
+
+RDATA = [
+    ("A", "10.0.0.1"),
+    ("AAAA", "2001:db8::1"),
+    ("CNAME", "www.example."),
+    ("NS", "ns1.example."),
+    ("MX", "10 mail.example."),
+    ("TXT", '"v=spf1 -all"'),
+    ("SOA", "ns1.example. hostmaster.example. 1 7200 900 1209600 86400"),
+    ("SRV", "0 5 5060 sip.example."),
+    ("DS", "12345 13 2 " + "ab" * 32),
+    ("DNSKEY", "257 3 13 " + "A" * 88),
+    (
+        "RRSIG",
+        "A 13 2 300 20300101000000 20200101000000 12345 example. " + "A" * 88,
+    ),
+]
+
+
+class _GuardedObject:
+    # Stands in for object in unguarded constructors, so that their
+    # object.__setattr__() calls go through the immutable guard's check.
+    @staticmethod
+    def __setattr__(obj, name, value):
+        obj.__setattr__(name, value)
+
+
+@contextlib.contextmanager
+def guarded(classes):
+    # Put the immutable guard back around the unguarded constructors of
+    # classes and their ancestors.
+    patched = {}
+    for cls in classes:
+        for ancestor in cls.__mro__:
+            init = ancestor.__dict__.get("__init__")
+            if getattr(init, "_immutable_unguarded", False):
+                patched[ancestor] = init
+    try:
+        for cls, init in patched.items():
+            # A copy of the constructor which sees _GuardedObject as object.
+            guarded_init = types.FunctionType(
+                init.__code__,
+                dict(init.__globals__, object=_GuardedObject),
+                init.__name__,
+                init.__defaults__,
+                init.__closure__,
+            )
+            cls.__init__ = dns._immutable_ctx._immutable_init(guarded_init)
+        yield
+    finally:
+        for cls, init in patched.items():
+            cls.__init__ = init
+
+
+def timed(function, number):
+    elapsed = min(timeit.repeat(function, number=number, repeat=5))
+    return elapsed / number * 1e6
+
+
+def bench(number):
+    print(
+        f"{'type':8} {'from_wire_parser before/after':>32} "
+        f"{'constructor before/after':>32}"
+    )
+    for rdtype, text in RDATA:
+        rdata = dns.rdata.from_text(dns.rdataclass.IN, rdtype, text)
+        wire = rdata.to_wire()
+        rdclass = rdata.rdclass
+        rdtype = rdata.rdtype
+
+        def from_wire():
+            parser = dns.wire.Parser(wire)
+            with parser.restrict_to(len(wire)):
+                dns.rdata.from_wire_parser(rdclass, rdtype, parser)
+
+        cls = type(rdata)
+        parameters = inspect.signature(cls.__init__).parameters
+        args = [getattr(rdata, key) for key in parameters if key != "self"]
+
+        def construct():
+            cls(*args)
+
+        results = []
+        for function in (from_wire, construct):
+            with guarded([cls]):
+                before = timed(function, number)
+            after = timed(function, number)
+            results.append(f"{before:9.2f}us {after:9.2f}us ({before / after:.1f}x)")
+        name = dns.rdatatype.to_text(rdtype)
+        print(f"{name:8} {results[0]:>32} {results[1]:>32}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)